@@ -273,7 +273,7 @@
             console.log(`Symbol changed to: ${symbolValue}, normalized: ${normalizedSymbol}`);
 
             // Update TP and SL based on the symbol's default values
-            const rootSymbol = symbolValue.replace(/[A-Z]\d+$/, '');
+            const rootSymbol = rootSymbolOf(symbolValue);
             const symbolDefaults = futuresTickData[rootSymbol];
 
             if (symbolDefaults) {
@@ -549,7 +549,7 @@
         const isLong = positionData.quantity > 0;
         
         // Get tick size for the symbol
-        const rootSymbol = symbol.replace(/[A-Z]\d+$/, '');
+        const rootSymbol = rootSymbolOf(symbol);
         const symbolData = futuresTickData[rootSymbol];
         const tickSize = symbolData?.tickSize || 0.25;
         
@@ -685,6 +685,8 @@
 
     async function updateSymbol(selector, value) {
             console.log(`updateSymbol called with selector: "${selector}", value: "${value}"`);
+            // Readiness marker for callers waiting on the symbol change; set once Enter is sent
+            window.tradovateSymbolUpdate = null;
             let inputs = document.querySelectorAll(selector);
             console.log(`Found ${inputs.length} matching inputs with selector: ${selector}`);
             
@@ -748,6 +750,7 @@
             /* simulate Enter */
             ['keydown', 'keypress', 'keyup'].forEach(fireKey);
             input.dispatchEvent(new Event('change', { bubbles: true }));  // fallback
+            window.tradovateSymbolUpdate = value;
             console.log('Symbol update complete');
     }
 
@@ -1031,8 +1034,11 @@
     }
 
 
-    // Futures tick data dictionary with default SL/TP settings for each instrument
-    const futuresTickData = {
+    // Futures tick data dictionary with default SL/TP settings for each instrument.
+    // When injected by the controller this comes from config symbol_defaults (instrument registry);
+    // the literal table below is the fallback for the standalone userscript.
+    // var, not const: the controller evaluates this file again in the same page when the bundle changes.
+    var futuresTickData = window.__tradovateInstruments || {
       // Symbol: { tickSize, tickValue, defaultSL (ticks), defaultTP (ticks), precision (decimal places) }
       MNQ: { tickSize: 0.25, tickValue: 0.5,  defaultSL: 15,  defaultTP: 53, precision: 2 },  // Micro E-mini Nasdaq-100
       NQ:  { tickSize: 0.25, tickValue: 5.0,  defaultSL: 15,  defaultTP: 53, precision: 2 },  // E-mini Nasdaq-100
@@ -1044,6 +1050,14 @@
       MGC: { tickSize: 0.1,  tickValue: 1.0,  defaultSL: 15,  defaultTP: 30,  precision: 1 }   // Micro Gold
     };
 
+    // Root symbol (e.g., 'NQH5' -> 'NQ', 'NQ1!' -> 'NQ'), shared with the Python instrument registry
+    function rootSymbolOf(symbol) {
+        if (typeof window.__tradovateRootSymbol === 'function') {
+            return window.__tradovateRootSymbol(symbol);
+        }
+        return symbol.replace(/[A-Z]\d+$/, '');
+    }
+
 function autoTrade(inputSymbol, quantity = 1, action = 'Buy', takeProfitTicks = null, stopLossTicks = null, _tickSize = 0.25, explicitOrderType = null) {
         console.log(`autoTrade called with: symbol=${inputSymbol}, qty=${quantity}, action=${action}, TP=${takeProfitTicks}, SL=${stopLossTicks}, tickSize=${_tickSize}, orderType=${explicitOrderType}`);
 
@@ -1051,7 +1065,7 @@ function autoTrade(inputSymbol, quantity = 1, action = 'Buy', takeProfitTicks =
         console.log(`Using symbol: ${symbolInput}`);
 
         // Get root symbol (e.g., 'NQH5' -> 'NQ')
-        const rootSymbol = symbolInput.replace(/[A-Z]\d+$/, '');
+        const rootSymbol = rootSymbolOf(symbolInput);
         console.log(`Root symbol: ${rootSymbol}`);
 
         // Get tick size and default values from dictionary or fallback
@@ -1380,7 +1394,7 @@ function autoTrade(inputSymbol, quantity = 1, action = 'Buy', takeProfitTicks =
         return { symbol, bidPrice, offerPrice };
     }
     // --- FUTURES MONTH LETTERS (Jan-Dec) ---
-    const MONTH_CODES = ['F','G','H','J','K','M','N','Q','U','V','X','Z'];
+    var MONTH_CODES = ['F','G','H','J','K','M','N','Q','U','V','X','Z'];
 
     /**
  * Returns { letter, yearDigit } for the given date.
@@ -1439,8 +1453,8 @@ function autoTrade(inputSymbol, quantity = 1, action = 'Buy', takeProfitTicks =
 
     // --- EXAMPLE: build an NQ front-quarter symbol ---
     console.log('Creating example front-quarter symbol');
-    const { letter, yearDigit } = getQuarterlyCode();
-    const nqFront = `NQ${letter}${yearDigit}`;
+    var { letter, yearDigit } = getQuarterlyCode();
+    var nqFront = `NQ${letter}${yearDigit}`;
     console.log(`Example front-quarter symbol created: ${nqFront}`);
 
 })();
\ No newline at end of file
@@ -672,6 +672,11 @@ function addActionButton() {
 
 
     addActionButton();
+
+    // Expose the sequence so the controller can run it again later
+    window.getTableData = getTableData;
+    window.updateUserColumnPhaseStatus = updateUserColumnPhaseStatus;
+    window.performAccountActions = performAccountActions;
     
     // Run auto risk management immediately when the script loads
     console.log("Auto Risk Management: Running initial risk assessment...");
@@ -0,0 +1,237 @@
+// Hot-path operations called from Python with Runtime.callFunctionOn.
+// Each op takes one plain object of arguments, so nothing is pasted into
+// JavaScript source and V8 compiles these functions once per page.
+// Loaded after autoOrder.user.js and changeAccount.user.js in the script bundle.
+
+window.__tradovateOps = (function() {
+    'use strict';
+
+    function setInput(id, value, events = ['input', 'change']) {
+        const input = document.getElementById(id);
+        if (!input) return false;
+        if (typeof value === 'boolean') {
+            input.checked = value;
+        } else {
+            input.value = value;
+        }
+        events.forEach(type => input.dispatchEvent(new Event(type, { bubbles: true })));
+        return true;
+    }
+
+    return {
+        autoTrade(a) {
+            return autoTrade(a.symbol, a.quantity, a.action, a.tp_ticks, a.sl_ticks, a.tick_size);
+        },
+
+        autoTradeScale(a) {
+            return auto_trade_scale(a.symbol, a.scale_orders, a.action, a.tp_ticks, a.sl_ticks, a.tick_size);
+        },
+
+        exitPositions(a) {
+            return clickExitForSymbol(normalizeSymbol(a.symbol), a.option);
+        },
+
+        updateSymbol(a) {
+            return updateSymbol(a.selector, normalizeSymbol(a.symbol));
+        },
+
+        setBracketSymbol(a) {
+            // Update the symbolInput in the Bracket UI and keep it for the next page load
+            if (!setInput('symbolInput', a.symbol)) {
+                return "symbolInput element not found";
+            }
+            console.log(`Updated UI symbol to ${a.symbol}`);
+            localStorage.setItem('bracketTrade_symbol', a.symbol);
+            return "Symbol updated in UI";
+        },
+
+        setEntryPrice(a) {
+            // A null price clears the field so the order goes in at market
+            try {
+                if (!setInput('entryPriceInput', a.price === null ? '' : a.price)) {
+                    return { success: false, error: 'Entry price input not found' };
+                }
+                return {
+                    success: true,
+                    message: a.price === null ? 'Entry price cleared' : `Entry price set to ${a.price}`
+                };
+            } catch (err) {
+                return { success: false, error: err.toString() };
+            }
+        },
+
+        setQuantity(a) {
+            try {
+                if (!setInput('quantityInput', a.quantity)) {
+                    console.error("Quantity input field not found");
+                    return "Quantity input field not found";
+                }
+                console.log(`Quantity updated to ${a.quantity} in Tradovate UI`);
+                return "Quantity updated in UI";
+            } catch (err) {
+                console.error("Error updating quantity:", err);
+                return "Error: " + err.toString();
+            }
+        },
+
+        moveToBreakeven(a) {
+            try {
+                if (typeof moveStopLossToBreakeven !== 'function') {
+                    console.error('moveStopLossToBreakeven function not found');
+                    return 'Error: moveStopLossToBreakeven function not found';
+                }
+                console.log(`Calling moveStopLossToBreakeven for symbol: ${a.symbol}`);
+                moveStopLossToBreakeven(a.symbol);
+                return 'Breakeven function executed successfully';
+            } catch (err) {
+                console.error('Error executing breakeven:', err);
+                return 'Error: ' + err.toString();
+            }
+        },
+
+        updateTradeControls(a) {
+            // Field name in the request -> input id in the autoOrder.user.js UI
+            const fields = {
+                symbol: 'symbolInput',
+                quantity: 'qtyInput',
+                tp_ticks: 'tpInput',
+                sl_ticks: 'slInput',
+                tick_size: 'tickInput',
+                enable_tp: 'tpCheckbox',
+                enable_sl: 'slCheckbox',
+                tp_price: 'tpPriceInput',
+                sl_price: 'slPriceInput',
+                entry_price: 'entryPriceInput'
+            };
+            const updates = { success: true, updates: {} };
+            try {
+                Object.entries(a.controls).forEach(([field, value]) => {
+                    if (!(field in fields)) return;
+                    try {
+                        const events = typeof value === 'boolean' ? ['change'] : ['input', 'change'];
+                        if (setInput(fields[field], value, events)) {
+                            updates.updates[field] = value;
+                        }
+                    } catch (err) {
+                        updates.updates[field] = "error: " + err.toString();
+                    }
+                });
+                console.log("Trade control updates complete:", updates);
+                return JSON.stringify(updates);
+            } catch (err) {
+                console.error("Error updating trade controls:", err);
+                return JSON.stringify({ success: false, error: err.toString() });
+            }
+        },
+
+        riskManagement() {
+            // Same sequence as TradovateConnection.run_risk_management
+            try {
+                ['getTableData', 'updateUserColumnPhaseStatus', 'performAccountActions'].forEach(name => {
+                    if (typeof window[name] !== 'function') {
+                        throw new Error(`${name} function not available`);
+                    }
+                    window[name]();
+                });
+                return { status: "success", message: "Risk management sequence completed" };
+            } catch (err) {
+                return { status: "error", message: err.toString() };
+            }
+        },
+
+        async batch(a) {
+            // Run several ops in order in one round trip. A step that throws ends the
+            // batch unless it is marked optional; "await" waits for an async op to settle.
+            const started = performance.now();
+            const steps = [];
+            for (const step of a.steps) {
+                const stepStarted = performance.now();
+                try {
+                    let value = this[step.op](step.args || {});
+                    if (step.await) {
+                        value = await value;
+                    } else if (value && typeof value.then === 'function') {
+                        value = 'started';
+                    }
+                    steps.push({ op: step.op, ok: true, value: value, ms: performance.now() - stepStarted });
+                } catch (err) {
+                    steps.push({ op: step.op, ok: false, error: err.toString(), ms: performance.now() - stepStarted });
+                    if (!step.optional) break;
+                }
+            }
+            return { steps: steps, total_ms: performance.now() - started };
+        },
+
+        async switchAccount(a) {
+            try {
+                // First check which function is available
+                if (typeof changeAccount === 'function') {
+                    console.log(`Using changeAccount function to switch to ${a.account}`);
+                    const result = await changeAccount(a.account);
+                    return { success: !result.includes("not found"), message: result };
+                } else if (typeof clickAccountItemByName === 'function') {
+                    console.log(`Using clickAccountItemByName function to switch to ${a.account}`);
+                    const result = await clickAccountItemByName(a.account);
+                    return { success: result, message: `Called clickAccountItemByName for account ${a.account}` };
+                }
+                return { success: false, message: "No account switching function available" };
+            } catch (error) {
+                console.error("Error switching account:", error);
+                return { success: false, message: "Error switching account: " + error.toString() };
+            }
+        },
+
+        checkAndSwitchAccount(a) {
+            const account = a.account;
+            try {
+                // First check if the account exists in the dropdown
+                const accountSelector = document.querySelector('.pane.account-selector.dropdown [data-toggle="dropdown"]');
+                if (!accountSelector) {
+                    return { success: false, message: "Account selector not found" };
+                }
+
+                // Check if we're already on the account
+                const currentAccountElement = accountSelector.querySelector('.name div');
+                if (currentAccountElement) {
+                    const currentAccount = currentAccountElement.textContent.trim();
+                    if (currentAccount === account) {
+                        console.log(`Already on the exact account: ${currentAccount}`);
+                        return {
+                            success: true,
+                            message: `Already on account: ${currentAccount}`,
+                            availableAccounts: [currentAccount]
+                        };
+                    }
+                }
+
+                // Open the dropdown and collect the available accounts
+                accountSelector.click();
+                const availableAccounts = [];
+                document.querySelectorAll('.dropdown-menu li a.account').forEach(item => {
+                    const mainDiv = item.querySelector('.name .main');
+                    availableAccounts.push((mainDiv || item).textContent.trim());
+                });
+                console.log(`Available accounts: ${JSON.stringify(availableAccounts)}`);
+
+                // Close the dropdown by clicking elsewhere
+                document.body.click();
+
+                if (!availableAccounts.includes(account)) {
+                    console.error(`Account ${account} not found in available accounts.`);
+                    return { success: false, message: `Account not found: ${account}`, availableAccounts };
+                }
+
+                // Don't wait for the switch; Python waits for the selector to show the account
+                if (typeof changeAccount === 'function') {
+                    changeAccount(account);
+                } else if (typeof clickAccountItemByName === 'function') {
+                    clickAccountItemByName(account);
+                }
+                return { success: true, message: `Account exists and switch initiated: ${account}`, availableAccounts };
+            } catch (error) {
+                console.error("Error checking/switching account:", error);
+                return { success: false, message: `Error: ${error.toString()}` };
+            }
+        }
+    };
+})();
@@ -1,7 +1,7 @@
 // ==UserScript==
 // @name         Tradovate Market Data Scraper
 // @namespace    http://tampermonkey.net/
-// @version      1.0
+// @version      1.1
 // @description  Scrapes real-time trading data from Tradovate interface
 // @author       Trading System
 // @match        https://trader.tradovate.com/*
@@ -22,6 +22,8 @@
         enabled: localStorage.getItem('scraper_enabled') === 'true' || false,
         interval: parseInt(localStorage.getItem('scraper_interval') || '1000'),
         volumeFilter: parseInt(localStorage.getItem('scraper_volume_filter') || '0'),
+        // Delta mode (opt-in): emit only trades newer than the last emission, contract info only when it changes
+        deltaMode: localStorage.getItem('scraper_deltaMode') === 'true' || false,
         debug: localStorage.getItem('scraper_debug') === 'true' || false
     };
     
@@ -34,11 +36,40 @@
         warn: (msg, data) => console.warn(`[Tradovate Scraper] ${msg}`, data || ''),
         error: (msg, data) => console.error(`[Tradovate Scraper] ${msg}`, data || ''),
         data: (data) => {
+            // Compact payload over the CDP binding added by the Python ChromeLogger
+            const binding = window[SCRAPER_BINDING];
+            if (typeof binding === 'function') {
+                binding(JSON.stringify(compactPayload(data)));
+                return;
+            }
             // Special format for Python backend to parse
             console.log(`[SCRAPER_DATA] ${JSON.stringify(data)}`);
         }
     };
     
+    // Binding name and trade row layout must match ChromeLogger.SCRAPER_BINDING and
+    // COMPACT_TRADE_FIELDS in src/services/scraper_service.py
+    const SCRAPER_BINDING = 'tradovateScraperData';
+    
+    function compactPayload(data) {
+        const payload = {
+            ts: data.timestamp,
+            a: data.account,
+            t: (data.trades || []).map(trade => [
+                trade.timestamp,
+                trade.price,
+                trade.size,
+                trade.accumulatedVolume,
+                trade.tickDirection === undefined ? null : trade.tickDirection,
+                trade.isHighlighted
+            ])
+        };
+        if (data.delta) payload.d = 1;
+        if (data.contractInfo) payload.c = data.contractInfo;
+        if (data.tabs) payload.tb = data.tabs;
+        return payload;
+    }
+    
     class TradovateScraper {
         constructor() {
             this.data = {
@@ -50,6 +81,16 @@
             };
             this.observer = null;
             this.scrapeTimer = null;
+            
+            // Delta mode state: newest trade already emitted, last emitted contract/tabs,
+            // and trades waiting for the next batched emission
+            this.highWaterMark = null;
+            this.lastContractKey = null;
+            this.lastTabsKey = null;
+            this.pendingTrades = [];
+            this.pendingContractInfo = null;
+            this.pendingTabs = null;
+            this.flushScheduled = false;
         }
         
         getCurrentAccount() {
@@ -92,9 +133,22 @@
                 this.observer.disconnect();
                 this.observer = null;
             }
+            
+            if (this.observerTimeout) {
+                clearTimeout(this.observerTimeout);
+                this.observerTimeout = null;
+            }
+            
+            // Don't lose trades already collected for the next batch
+            this.flush();
         }
         
         scrapeData() {
+            if (config.deltaMode) {
+                this.scrapeDelta();
+                return;
+            }
+            
             try {
                 this.data.timestamp = new Date().toISOString();
                 this.data.account = this.getCurrentAccount();
@@ -116,6 +170,124 @@
             }
         }
         
+        scrapeDelta() {
+            try {
+                this.data.timestamp = new Date().toISOString();
+                this.data.account = this.getCurrentAccount();
+                
+                this.scrapeTabs();
+                this.scrapeContractInfo();
+                
+                const tabsKey = JSON.stringify(this.data.tabs);
+                if (tabsKey !== this.lastTabsKey) {
+                    this.lastTabsKey = tabsKey;
+                    this.pendingTabs = this.data.tabs;
+                }
+                
+                const contractKey = JSON.stringify(this.data.contractInfo);
+                if (contractKey !== this.lastContractKey) {
+                    // A different contract has its own volume count
+                    const previous = this.lastContractKey ? JSON.parse(this.lastContractKey) : {};
+                    if (previous.name !== this.data.contractInfo.name) {
+                        this.highWaterMark = null;
+                    }
+                    this.lastContractKey = contractKey;
+                    this.pendingContractInfo = this.data.contractInfo;
+                }
+                
+                const newTrades = this.scrapeNewTrades();
+                this.data.trades = newTrades;
+                this.pendingTrades.push(...newTrades);
+                
+                if (this.pendingTrades.length || this.pendingContractInfo || this.pendingTabs) {
+                    this.scheduleFlush();
+                }
+                
+                logger.log('Delta scraped', { trades: newTrades.length });
+                
+            } catch (error) {
+                logger.error('Error during scraping:', error);
+            }
+        }
+        
+        scrapeNewTrades() {
+            // Accumulated volume only grows within a session, so a row is new when its
+            // volume is past the high-water mark. Old rows are skipped before building objects.
+            const hwm = this.highWaterMark;
+            const tradeRows = document.querySelectorAll('.fixedDataTableRowLayout_main.public_fixedDataTable_bodyRow');
+            const rows = [];
+            let maxVolume = -1;
+            
+            for (const row of tradeRows) {
+                const cells = row.querySelectorAll('.public_fixedDataTableCell_cellContent');
+                if (cells.length < 4) continue;
+                
+                const volume = parseInt(cells[3].textContent.replace(/,/g, ''));
+                if (isNaN(volume)) continue;
+                if (volume > maxVolume) maxVolume = volume;
+                
+                if (hwm && volume <= hwm.accumulatedVolume) continue;
+                rows.push({ row, cells, volume });
+            }
+            
+            // Volume went backwards (session rollover): everything on screen is new
+            if (hwm && maxVolume >= 0 && maxVolume < hwm.accumulatedVolume) {
+                this.highWaterMark = null;
+                return this.scrapeNewTrades();
+            }
+            
+            const trades = rows
+                .map(({ row, cells }) => this.parseTradeRow(row, cells))
+                .filter(trade => trade !== null)
+                .sort((a, b) => a.accumulatedVolume - b.accumulatedVolume);
+            
+            // Only rows actually emitted move the mark; a row hidden now is picked up once it shows
+            if (trades.length) {
+                const newest = trades[trades.length - 1];
+                this.highWaterMark = {
+                    accumulatedVolume: newest.accumulatedVolume,
+                    timestamp: newest.timestamp
+                };
+            }
+            
+            return trades;
+        }
+        
+        scheduleFlush() {
+            if (this.flushScheduled) return;
+            this.flushScheduled = true;
+            
+            // One emission per frame; background tabs don't get animation frames
+            const flush = () => this.flush();
+            if (document.visibilityState === 'visible' && window.requestAnimationFrame) {
+                window.requestAnimationFrame(flush);
+            } else {
+                setTimeout(flush, Math.max(config.interval, 50));
+            }
+        }
+        
+        flush() {
+            this.flushScheduled = false;
+            if (!this.pendingTrades.length && !this.pendingContractInfo && !this.pendingTabs) {
+                return;
+            }
+            
+            const message = {
+                delta: true,
+                timestamp: new Date().toISOString(),
+                account: this.data.account,
+                trades: this.pendingTrades
+            };
+            if (this.pendingContractInfo) message.contractInfo = this.pendingContractInfo;
+            if (this.pendingTabs) message.tabs = this.pendingTabs;
+            
+            this.pendingTrades = [];
+            this.pendingContractInfo = null;
+            this.pendingTabs = null;
+            
+            logger.data(message);
+        }
+        
         scrapeTabs() {
             const tabs = document.querySelectorAll('.lm_tab:not(.tab_add) .lm_title span');
             this.data.tabs = Array.from(tabs).map(tab => ({
@@ -170,48 +342,51 @@
         scrapeTrades() {
             const tradeRows = document.querySelectorAll('.fixedDataTableRowLayout_main.public_fixedDataTable_bodyRow');
             
-            this.data.trades = Array.from(tradeRows).map(row => {
-                const trade = {};
-                
-                // Check visibility
-                const rowWrapper = row.closest('.fixedDataTableRowLayout_rowWrapper');
-                if (rowWrapper && rowWrapper.style.visibility === 'hidden') {
-                    return null;
-                }
-                
-                // Extract cell data
-                const cells = row.querySelectorAll('.public_fixedDataTableCell_cellContent');
-                if (cells.length >= 4) {
-                    trade.timestamp = cells[0].textContent.trim();
-                    trade.price = parseFloat(cells[1].textContent.replace(/,/g, ''));
-                    trade.size = parseInt(cells[2].textContent);
-                    trade.accumulatedVolume = parseInt(cells[3].textContent);
-                }
-                
-                // Get tick direction
-                const priceWrapper = row.querySelector('.fixedDataTableCellLayout_main:nth-child(2) .fixedDataTableCellLayout_wrap1');
-                if (priceWrapper) {
-                    const classes = priceWrapper.className;
-                    if (classes.includes('tick-flip-up')) trade.tickDirection = 'up';
-                    else if (classes.includes('tick-flip-down')) trade.tickDirection = 'down';
-                    else if (classes.includes('tick-cont-up')) trade.tickDirection = 'cont-up';
-                    else if (classes.includes('tick-cont-down')) trade.tickDirection = 'cont-down';
-                }
-                
-                // Check if highlighted
-                trade.isHighlighted = row.classList.contains('public_fixedDataTableRow_highlighted');
-                
-                // Apply volume filter
-                if (config.volumeFilter > 0 && trade.size < config.volumeFilter) {
-                    return null;
-                }
-                
-                return trade;
-            }).filter(trade => trade !== null);
+            this.data.trades = Array.from(tradeRows)
+                .map(row => this.parseTradeRow(row, row.querySelectorAll('.public_fixedDataTableCell_cellContent')))
+                .filter(trade => trade !== null);
             
             logger.log(`Found ${this.data.trades.length} trades (filter: ${config.volumeFilter})`);
         }
         
+        parseTradeRow(row, cells) {
+            const trade = {};
+            
+            // Check visibility
+            const rowWrapper = row.closest('.fixedDataTableRowLayout_rowWrapper');
+            if (rowWrapper && rowWrapper.style.visibility === 'hidden') {
+                return null;
+            }
+            
+            // Extract cell data
+            if (cells.length >= 4) {
+                trade.timestamp = cells[0].textContent.trim();
+                trade.price = parseFloat(cells[1].textContent.replace(/,/g, ''));
+                trade.size = parseInt(cells[2].textContent);
+                trade.accumulatedVolume = parseInt(cells[3].textContent.replace(/,/g, ''));
+            }
+            
+            // Get tick direction
+            const priceWrapper = row.querySelector('.fixedDataTableCellLayout_main:nth-child(2) .fixedDataTableCellLayout_wrap1');
+            if (priceWrapper) {
+                const classes = priceWrapper.className;
+                if (classes.includes('tick-flip-up')) trade.tickDirection = 'up';
+                else if (classes.includes('tick-flip-down')) trade.tickDirection = 'down';
+                else if (classes.includes('tick-cont-up')) trade.tickDirection = 'cont-up';
+                else if (classes.includes('tick-cont-down')) trade.tickDirection = 'cont-down';
+            }
+            
+            // Check if highlighted
+            trade.isHighlighted = row.classList.contains('public_fixedDataTableRow_highlighted');
+            
+            // Apply volume filter
+            if (config.volumeFilter > 0 && trade.size < config.volumeFilter) {
+                return null;
+            }
+            
+            return trade;
+        }
+        
         setupObserver() {
             const targetNode = document.querySelector('.fixedDataTableLayout_rowsContainer');
             
@@ -1,50 +1,150 @@
 import pychrome
+import requests
 import os
 import sys
 import json
 import argparse
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from .utils.core import (
     get_project_root,
     find_chrome_executable,
     load_json_config,
     setup_logging
 )
+from .services.script_bundle import OPS_GLOBAL, extract_core_functions, get_script_bundle, on_dom_ready
+from .services.tab_lock import TabLock
 
-# Load the Tampermonkey script
-project_root = get_project_root()
-tampermonkey_path = project_root / 'scripts' / 'tampermonkey' / 'autoOrder.user.js'
-with open(tampermonkey_path, 'r') as file:
-    tampermonkey_code = file.read()
-    
-# Extract the core functions from Tampermonkey script
-def extract_core_functions(code):
-    # This is a simple extraction that removes the IIFE wrapper
-    lines = code.split('\n')
-    core_lines = []
-    
-    for line in lines:
-        # Skip the IIFE start and end
-        if '(function ()' in line or line.strip() == '})();':
-            continue
-        else:
-            # Remove any leading indentation that was inside the IIFE
-            if line.startswith('    '):
-                line = line[4:]
-            core_lines.append(line)
+
+# Resolves as soon as a condition holds in the page instead of sleeping a fixed time.
+# A MutationObserver catches DOM changes; the short poll covers things that change
+# without mutating the DOM (input values, globals defined by injected scripts).
+READINESS_WAIT_TEMPLATE = """
+new Promise((resolve) => {
+    const check = () => { try { return !!(%(condition)s); } catch (e) { return false; } };
+    const started = performance.now();
+    if (check()) { resolve({ready: true, waited: 0}); return; }
+    let done = false, observer = null, poller = null, timer = null;
+    const finish = (ready) => {
+        if (done) return;
+        done = true;
+        if (observer) observer.disconnect();
+        clearInterval(poller);
+        clearTimeout(timer);
+        resolve({ready: ready, waited: performance.now() - started});
+    };
+    const tick = () => { if (check()) finish(true); };
+    observer = new MutationObserver(tick);
+    observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+    poller = setInterval(tick, %(poll_ms)d);
+    timer = setTimeout(() => finish(check()), %(timeout_ms)d);
+})
+"""
+
+def probe_port(port, timeout=0.5):
+    """
+    List the page targets of a Chrome debugging port over plain HTTP
+    
+    No websocket is opened, so a dead port or a browser without Tradovate costs one
+    short request.
     
-    return '\n'.join(core_lines)
+    Returns:
+        list: Target dicts from /json/list (id, url, webSocketDebuggerUrl, ...), or None
+              if nothing answers on the port
+    """
+    try:
+        response = requests.get(f"http://127.0.0.1:{port}/json/list", timeout=timeout)
+        response.raise_for_status()
+        return [target for target in response.json() if target.get("type", "page") == "page"]
+    except (requests.RequestException, ValueError):
+        return None
 
-tampermonkey_functions = extract_core_functions(tampermonkey_code)
+def find_tradovate_target(targets):
+    """First target whose URL is a Tradovate page and that can still be attached to"""
+    for target in targets or []:
+        if "tradovate" in target.get("url", "") and target.get("webSocketDebuggerUrl"):
+            return target
+    return None
 
 class TradovateConnection:
-    def __init__(self, port, account_name=None):
+    # Health states: healthy -> degraded after a failed probe -> reconnecting while this
+    # port is repaired -> healthy again, or dead once repairs keep failing
+    HEALTHY = 'healthy'
+    DEGRADED = 'degraded'
+    RECONNECTING = 'reconnecting'
+    DEAD = 'dead'
+    
+    # Consecutive failed probes before a degraded connection is repaired
+    FAILURES_BEFORE_REPAIR = 2
+    # Failed repairs before the connection is considered dead
+    MAX_REPAIR_ATTEMPTS = 3
+    # Seconds between repair attempts on a dead connection
+    DEAD_RETRY_INTERVAL = 60
+    
+    # Runs one op from tradovateOps.js with `this` bound to the ops table; the source
+    # never changes, so V8 reuses its compiled code across calls
+    CALL_OP = "function(name, args) { return this[name](args); }"
+    
+    def __init__(self, port, account_name=None, target=None):
+        """
+        Args:
+            port: Chrome remote debugging port
+            account_name: Display name for this connection
+            target: Tradovate target from probe_port(); attaches to it directly instead of
+                    opening every tab to find it
+        """
         self.port = port
         self.account_name = account_name or f"Account on port {port}"
         self.browser = pychrome.Browser(url=f"http://127.0.0.1:{port}")
         self.tab = None
-        self.find_tradovate_tab()
+        # Serializes commands on this tab; pychrome tabs are not safe to drive
+        # from several threads, and multi-step flows (switch -> symbol -> order)
+        # must not interleave. Reentrant so a flow can call helpers that lock too;
+        # exits acquire it with PRIORITY_EXIT to go ahead of flows still waiting.
+        self.lock = TabLock()
+        self.health = self.HEALTHY
+        self.health_failures = 0
+        self.repair_attempts = 0
+        self.health_changed_at = time.time()
+        self.last_error = None
+        # Script bundle version registered for new documents, and its CDP identifiers
+        self.bundle_version = None
+        self.bundle_script_ids = []
+        # "<part>: <error>" while the last bundle injection failed
+        self.bundle_error = None
+        # Remote object id of the page's ops table, resolved on first use
+        self.ops_object_id = None
+        if target:
+            self.attach_target(target)
+        else:
+            self.find_tradovate_tab()
+    
+    def attach_target(self, target):
+        """Open the websocket of a single known target"""
+        tab = pychrome.Tab(**target)
+        try:
+            tab.start()
+            tab.Page.enable()
+        except Exception as e:
+            print(f"Error attaching to Tradovate tab for {self.account_name}: {e}")
+            try:
+                tab.stop()
+            except Exception:
+                pass
+            return
+        self.tab = tab
+        self.bundle_version = None
+        self.bundle_script_ids = []
+        self.bundle_error = None
+        self.ops_object_id = None
+        print(f"Found Tradovate tab for {self.account_name}")
+    
+    def discover_tab(self, timeout=0.5):
+        """Find this port's Tradovate tab over HTTP and attach to it"""
+        target = find_tradovate_target(probe_port(self.port, timeout))
+        if target:
+            self.attach_target(target)
         
     def find_tradovate_tab(self):
         """Find a Tradovate tab in the browser"""
@@ -71,76 +171,267 @@ class TradovateConnection:
                     
         print(f"No Tradovate tab found for {self.account_name}")
         
+    def set_health(self, state, error=None):
+        if state != self.health:
+            print(f"{self.account_name} (port {self.port}): {self.health} -> {state}")
+            self.health = state
+            self.health_changed_at = time.time()
+        if error is not None:
+            self.last_error = error
+    
+    def is_available(self):
+        """Whether orders can be sent to this connection right now"""
+        return self.tab is not None and self.health in (self.HEALTHY, self.DEGRADED)
+    
+    def check_health(self, timeout=2.0):
+        """
+        Probe the tab with a trivial evaluate and update the health state
+        
+        A connection busy with a command is not probed; it is evidently alive.
+        
+        Returns:
+            str: The health state after the probe
+        """
+        if self.health == self.RECONNECTING:
+            return self.health
+        if not self.lock.acquire(blocking=False):
+            return self.health
+        try:
+            if not self.tab:
+                raise RuntimeError("No tab attached")
+            result = self.tab.Runtime.evaluate(expression="1+1", _timeout=timeout)
+            if result.get("result", {}).get("value") != 2:
+                raise RuntimeError(f"Unexpected probe result: {result}")
+            if self.bundle_error:
+                raise RuntimeError(f"Script bundle failed: {self.bundle_error}")
+            self.health_failures = 0
+            self.repair_attempts = 0
+            self.set_health(self.HEALTHY)
+        except Exception as e:
+            self.health_failures += 1
+            if self.health != self.DEAD:
+                self.set_health(self.DEGRADED, str(e))
+            else:
+                self.last_error = str(e)
+        finally:
+            self.lock.release()
+        return self.health
+    
+    def needs_repair(self):
+        if self.health == self.DEGRADED:
+            return self.health_failures >= self.FAILURES_BEFORE_REPAIR
+        if self.health == self.DEAD:
+            return time.time() - self.health_changed_at >= self.DEAD_RETRY_INTERVAL
+        return False
+    
+    def reconnect(self):
+        """
+        Re-attach to this port's Tradovate tab and re-inject the scripts
+        
+        Only this connection is touched; the rest of the controller keeps trading.
+        
+        Returns:
+            bool: True if the connection is healthy again
+        """
+        with self.lock:
+            self.set_health(self.RECONNECTING)
+            old_tab, self.tab = self.tab, None
+            if old_tab:
+                try:
+                    old_tab.stop()
+                except Exception:
+                    pass
+            
+            try:
+                self.browser = pychrome.Browser(url=f"http://127.0.0.1:{self.port}")
+                self.discover_tab()
+                if not self.tab:
+                    raise RuntimeError("No Tradovate tab found")
+                self.inject_tampermonkey()
+            except Exception as e:
+                self.repair_attempts += 1
+                # Dead also restarts the retry interval
+                state = self.DEAD if self.repair_attempts >= self.MAX_REPAIR_ATTEMPTS else self.DEGRADED
+                self.set_health(state, str(e))
+                return False
+            
+            self.health_failures = 0
+            self.repair_attempts = 0
+            self.set_health(self.HEALTHY)
+            return True
+    
+    def get_health(self):
+        return {
+            "account": self.account_name,
+            "port": self.port,
+            "state": self.health,
+            "failures": self.health_failures,
+            "repair_attempts": self.repair_attempts,
+            "since": self.health_changed_at,
+            "last_error": self.last_error,
+            "bundle_error": self.bundle_error,
+            "lock": self.lock.get_stats()
+        }
+    
+    def wait_for(self, condition, timeout=5.0, poll_interval=0.05):
+        """
+        Wait until a JavaScript condition is true in the page
+
+        Args:
+            condition: JavaScript expression, evaluated repeatedly in the page
+            timeout: Seconds to wait before giving up
+            poll_interval: Seconds between checks for changes that don't touch the DOM
+
+        Returns:
+            dict: {"ready": bool, "waited": seconds spent waiting in the page}
+        """
+        if not self.tab:
+            return {"ready": False, "waited": 0.0, "error": "No tab available"}
+
+        js_code = READINESS_WAIT_TEMPLATE % {
+            "condition": condition,
+            "poll_ms": int(poll_interval * 1000),
+            "timeout_ms": int(timeout * 1000),
+        }
+        started = time.monotonic()
+        try:
+            result = self.tab.Runtime.evaluate(expression=js_code, awaitPromise=True,
+                                               returnByValue=True, _timeout=timeout + 2)
+        except Exception as e:
+            return {"ready": False, "waited": round(time.monotonic() - started, 3), "error": str(e)}
+
+        value = result.get('result', {}).get('value') if isinstance(result, dict) else None
+        if not isinstance(value, dict):
+            return {"ready": False, "waited": round(time.monotonic() - started, 3),
+                    "error": "Unexpected readiness result"}
+        return {"ready": bool(value.get("ready")), "waited": round(value.get("waited", 0) / 1000, 3)}
+
+    def wait_for_account(self, account_name, timeout=5.0):
+        """Wait until the account selector shows account_name"""
+        condition = (
+            "(document.querySelector('.pane.account-selector.dropdown [data-toggle=\"dropdown\"] .name div')"
+            f"?.textContent.trim() === {json.dumps(account_name)})"
+        )
+        return self.wait_for(condition, timeout)
+
+    def wait_for_symbol(self, symbol, timeout=5.0):
+        """Wait until updateSymbol has finished and the trading ticket shows the new contract"""
+        condition = (
+            f"(window.tradovateSymbolUpdate === normalizeSymbol({json.dumps(symbol)}) && "
+            "(document.querySelector('.trading-ticket .search-box--input')?.value || '').toUpperCase()"
+            f".startsWith({json.dumps(symbol.upper())}))"
+        )
+        return self.wait_for(condition, timeout)
+
+    def wait_for_functions(self, names, timeout=5.0):
+        """Wait until every named function is defined in the page"""
+        condition = " && ".join(f"typeof {name} === 'function'" for name in names) or "true"
+        return self.wait_for(condition, timeout)
+
+    def ensure_bundle(self):
+        """
+        Make sure the tab runs the current script bundle
+        
+        One evaluate compares the in-page version marker; only a missing or stale
+        bundle is evaluated again. The bundle is also registered for new documents,
+        so it survives page reloads without another injection. The marker is set only
+        after every part evaluated cleanly, so a broken bundle is injected again on
+        the next call instead of being reported current.
+        
+        Returns:
+            str: 'current' if nothing had to be injected, 'loaded' after a clean
+                 injection, 'error' if a part threw (see bundle_error)
+        """
+        bundle = get_script_bundle()
+        version, parts = bundle.get()
+        with self.lock:
+            result = self.tab.Runtime.evaluate(expression=bundle.check_expression(version))
+            if result.get("result", {}).get("value") is True:
+                self.bundle_error = None
+                return 'current'
+            
+            for name, source in parts:
+                result = self.tab.Runtime.evaluate(expression=source)
+                if isinstance(result, dict) and result.get("exceptionDetails"):
+                    details = result["exceptionDetails"]
+                    error = details.get("exception", {}).get("description") or details.get("text")
+                    self.bundle_error = f"{name}: {error}"
+                    print(f"Error in {name} for {self.account_name}: {error}")
+                    return 'error'
+            self.bundle_error = None
+            
+            if self.bundle_version != version:
+                self.register_bundle(version, parts)
+            return 'loaded'
+    
+    def register_bundle(self, version, parts):
+        """Evaluate the bundle on every new document in this tab, replacing an older version"""
+        try:
+            # The wrappers add each part as an inline script once the DOM is ready
+            self.tab.Page.setBypassCSP(enabled=True)
+        except Exception as e:
+            print(f"Error disabling CSP for {self.account_name}: {e}")
+        for identifier in self.bundle_script_ids:
+            try:
+                self.tab.Page.removeScriptToEvaluateOnNewDocument(identifier=identifier)
+            except Exception as e:
+                print(f"Error removing old script bundle for {self.account_name}: {e}")
+        self.bundle_script_ids = []
+        try:
+            for name, source in parts:
+                result = self.tab.Page.addScriptToEvaluateOnNewDocument(source=on_dom_ready(name, source))
+                self.bundle_script_ids.append(result.get("identifier"))
+            self.bundle_version = version
+        except Exception as e:
+            print(f"Error registering script bundle for {self.account_name}: {e}")
+    
     def inject_tampermonkey(self):
-        """Inject the Tampermonkey functions into the tab"""
+        """Inject the Tampermonkey functions into the tab (a no-op while the bundle is current)"""
         if not self.tab:
             print(f"No tab available for {self.account_name}")
             return False
             
         try:
-            print(f"Injecting Tampermonkey functions for {self.account_name}...")
-            self.tab.Runtime.evaluate(expression=tampermonkey_functions)
-            
-            # Also inject the getAllAccountTableData function
-            project_root = get_project_root()
-            account_data_path = os.path.join(project_root, 
-                                         'scripts/tampermonkey/getAllAccountTableData.user.js')
-            if os.path.exists(account_data_path):
-                with open(account_data_path, 'r') as file:
-                    account_data_js = file.read()
-                self.tab.Runtime.evaluate(expression=account_data_js)
-                print(f"Account data function injected for {self.account_name}")
+            status = self.ensure_bundle()
+            if status == 'current':
+                print(f"Tampermonkey functions already current for {self.account_name}")
+                return True
+            if status == 'error':
+                print(f"Error injecting Tampermonkey functions for {self.account_name}: {self.bundle_error}")
+                return False
+            print(f"Tampermonkey functions injected for {self.account_name}")
             
-            # Inject the autoriskManagement.js script
-            risk_management_path = os.path.join(project_root, 
-                                         'scripts/tampermonkey/autoriskManagement.js')
-            if os.path.exists(risk_management_path):
-                with open(risk_management_path, 'r') as file:
-                    risk_management_js = file.read()
-                # First evaluate the script to define the functions
-                self.tab.Runtime.evaluate(expression=risk_management_js)
-                print(f"Auto risk management script injected for {self.account_name}")
+            # Wait for the risk management functions to be defined
+            ready = self.wait_for_functions(
+                ["getTableData", "updateUserColumnPhaseStatus", "performAccountActions"], timeout=3.0)
+            print(f"Scripts ready for {self.account_name} after {ready['waited']}s (ready: {ready['ready']})")
             
-            # Inject the tradovate scraper script
-            scraper_path = os.path.join(project_root, 
-                                         'scripts/tampermonkey/tradovateScraper.user.js')
-            if os.path.exists(scraper_path):
-                with open(scraper_path, 'r') as file:
-                    scraper_js = file.read()
-                # Extract core functions (remove UserScript header and IIFE)
-                scraper_functions = extract_core_functions(scraper_js)
-                self.tab.Runtime.evaluate(expression=scraper_functions)
-                print(f"Tradovate scraper injected for {self.account_name}")
+            # Then explicitly run the risk management functions
+            self.tab.Runtime.evaluate(expression="""
+                console.log("Executing initial risk management assessment...");
+                if (typeof getTableData === 'function') {
+                    getTableData();
+                    console.log("getTableData executed");
+                } else {
+                    console.error("getTableData function not found");
+                }
                 
-                # Wait a moment for the script to fully initialize
-                time.sleep(1)
+                if (typeof updateUserColumnPhaseStatus === 'function') {
+                    updateUserColumnPhaseStatus();
+                    console.log("updateUserColumnPhaseStatus executed");
+                } else {
+                    console.error("updateUserColumnPhaseStatus function not found");
+                }
                 
-                # Then explicitly run the risk management functions
-                self.tab.Runtime.evaluate(expression="""
-                    console.log("Executing initial risk management assessment...");
-                    if (typeof getTableData === 'function') {
-                        getTableData();
-                        console.log("getTableData executed");
-                    } else {
-                        console.error("getTableData function not found");
-                    }
-                    
-                    if (typeof updateUserColumnPhaseStatus === 'function') {
-                        updateUserColumnPhaseStatus();
-                        console.log("updateUserColumnPhaseStatus executed");
-                    } else {
-                        console.error("updateUserColumnPhaseStatus function not found");
-                    }
-                    
-                    if (typeof performAccountActions === 'function') {
-                        performAccountActions();
-                        console.log("performAccountActions executed");
-                    } else {
-                        console.error("performAccountActions function not found");
-                    }
-                    console.log("Risk management assessment completed");
-                """)
-                print(f"Auto risk management executed for {self.account_name}")
+                if (typeof performAccountActions === 'function') {
+                    performAccountActions();
+                    console.log("performAccountActions executed");
+                } else {
+                    console.error("performAccountActions function not found");
+                }
+                console.log("Risk management assessment completed");
+            """)
+            print(f"Auto risk management executed for {self.account_name}")
             
             print(f"Tampermonkey functions injected successfully for {self.account_name}")
             return True
@@ -159,15 +450,97 @@ class TradovateConnection:
         except Exception as e:
             return {"error": str(e)}
             
+    def call_op(self, name, args=None, await_promise=False, return_by_value=False):
+        """
+        Invoke a pre-compiled operation from tradovateOps.js
+        
+        Arguments travel as structured JSON through Runtime.callFunctionOn, so no
+        JavaScript source is built or parsed per call.
+        
+        Args:
+            name: Operation name in the page's ops table
+            args: JSON-serializable dictionary passed to the operation
+            await_promise: Wait for an async operation to settle
+            return_by_value: Return objects as JSON values instead of remote references
+        
+        Returns:
+            dict: The CDP result, shaped like a Runtime.evaluate result
+        """
+        call_args = [{"value": name}, {"value": args or {}}]
+        with self.lock:
+            for attempt in range(2):
+                object_id = self.resolve_ops()
+                try:
+                    return self.tab.Runtime.callFunctionOn(
+                        functionDeclaration=self.CALL_OP, objectId=object_id, arguments=call_args,
+                        awaitPromise=await_promise, returnByValue=return_by_value)
+                except pychrome.CallMethodException:
+                    # The page navigated and the ops table went with it; look it up again
+                    self.ops_object_id = None
+                    if attempt:
+                        raise
+    
+    def resolve_ops(self):
+        """Remote object id of the page's ops table, loading the bundle if the page lacks it"""
+        if self.ops_object_id:
+            return self.ops_object_id
+        result = self.tab.Runtime.evaluate(expression=f"window.{OPS_GLOBAL}")
+        object_id = result.get("result", {}).get("objectId")
+        if not object_id:
+            self.ensure_bundle()
+            result = self.tab.Runtime.evaluate(expression=f"window.{OPS_GLOBAL}")
+            object_id = result.get("result", {}).get("objectId")
+        if not object_id:
+            raise RuntimeError(f"Page operations not available for {self.account_name}")
+        self.ops_object_id = object_id
+        return object_id
+    
+    def run_batch(self, steps):
+        """
+        Run an ordered list of operations in one round trip
+
+        Args:
+            steps: [{"op": name, "args": {...}, "await": bool, "optional": bool}, ...];
+                   a failing step ends the batch unless it is optional
+
+        Returns:
+            dict: {"steps": [{"op", "ok", "value" or "error", "ms"}], "total_ms", "round_trip_ms"},
+                  plus "error" naming the first failed required step and "warnings"
+                  listing failed optional steps
+        """
+        if not self.tab:
+            return {"error": "No tab available"}
+
+        started = time.monotonic()
+        try:
+            result = self.call_op('batch', {"steps": steps}, await_promise=True, return_by_value=True)
+        except Exception as e:
+            return {"error": str(e)}
+
+        if result.get("exceptionDetails"):
+            return {"error": result["exceptionDetails"].get("text", "Batch failed")}
+        batch = result.get("result", {}).get("value") or {"steps": []}
+        batch["round_trip_ms"] = round((time.monotonic() - started) * 1000, 1)
+        # The page reports the steps it ran in order, so they line up with the requested ones
+        failed = [(step, done) for step, done in zip(steps, batch.get("steps", [])) if not done.get("ok")]
+        warnings = [f"{done['op']}: {done.get('error')}" for step, done in failed if step.get("optional")]
+        errors = [f"{done['op']}: {done.get('error')}" for step, done in failed if not step.get("optional")]
+        if warnings:
+            batch["warnings"] = warnings
+        if errors:
+            batch["error"] = errors[0]
+        return batch
+
     def auto_trade(self, symbol, quantity=1, action='Buy', tp_ticks=100, sl_ticks=40, tick_size=0.25):
         """Execute an auto trade using the Tampermonkey script"""
         if not self.tab:
             return {"error": "No tab available"}
             
         try:
-            js_code = f"autoTrade('{symbol}', {quantity}, '{action}', {tp_ticks}, {sl_ticks}, {tick_size});"
-            result = self.tab.Runtime.evaluate(expression=js_code)
-            return result
+            return self.call_op('autoTrade', {
+                "symbol": symbol, "quantity": quantity, "action": action,
+                "tp_ticks": tp_ticks, "sl_ticks": sl_ticks, "tick_size": tick_size
+            })
         except Exception as e:
             return {"error": str(e)}
     
@@ -177,12 +550,10 @@ class TradovateConnection:
             return {"error": "No tab available"}
             
         try:
-            # Convert scale_orders list to JavaScript array string
-            import json
-            orders_json = json.dumps(scale_orders)
-            js_code = f"auto_trade_scale('{symbol}', {orders_json}, '{action}', {tp_ticks}, {sl_ticks}, {tick_size});"
-            result = self.tab.Runtime.evaluate(expression=js_code)
-            return result
+            return self.call_op('autoTradeScale', {
+                "symbol": symbol, "scale_orders": scale_orders, "action": action,
+                "tp_ticks": tp_ticks, "sl_ticks": sl_ticks, "tick_size": tick_size
+            })
         except Exception as e:
             return {"error": str(e)}
             
@@ -192,9 +563,7 @@ class TradovateConnection:
             return {"error": "No tab available"}
             
         try:
-            js_code = f"clickExitForSymbol(normalizeSymbol('{symbol}'), '{option}');"
-            result = self.tab.Runtime.evaluate(expression=js_code)
-            return result
+            return self.call_op('exitPositions', {"symbol": symbol, "option": option})
         except Exception as e:
             return {"error": str(e)}
             
@@ -204,9 +573,9 @@ class TradovateConnection:
             return {"error": "No tab available"}
             
         try:
-            js_code = f"updateSymbol('.trading-ticket .search-box--input', normalizeSymbol('{symbol}'));"
-            result = self.tab.Runtime.evaluate(expression=js_code)
-            return result
+            return self.call_op('updateSymbol', {
+                "selector": ".trading-ticket .search-box--input", "symbol": symbol
+            })
         except Exception as e:
             return {"error": str(e)}
             
@@ -237,8 +606,9 @@ class TradovateConnection:
                     with open(risk_management_path, 'r') as file:
                         risk_management_js = file.read()
                     self.tab.Runtime.evaluate(expression=risk_management_js)
-                    # Give it a moment to initialize
-                    time.sleep(0.5)
+                    # Wait until the functions are defined
+                    self.wait_for_functions(
+                        ["getTableData", "updateUserColumnPhaseStatus", "performAccountActions"], timeout=2.0)
             
             # Run the main auto risk management sequence
             js_code = """
@@ -286,47 +656,219 @@ class TradovateConnection:
             return {"error": str(e)}
 
 class TradovateController:
-    def __init__(self, base_port=9223):  # Changed from 9222 to protect that port
+    # Upper bound on how long a single account may take inside execute_on_all
+    DEFAULT_ACCOUNT_TIMEOUT = 30
+    # Upper bound on worker threads used for one fan-out
+    MAX_PARALLEL_ACCOUNTS = 16
+
+    # Global deadline for probing all debugging ports during discovery
+    DISCOVERY_DEADLINE = 1.0
+    # Per-request timeout of a single /json/list probe
+    PROBE_TIMEOUT = 0.5
+
+    def __init__(self, base_port=9223, account_timeout=DEFAULT_ACCOUNT_TIMEOUT):  # Changed from 9222 to protect that port
         self.base_port = base_port
+        self.account_timeout = account_timeout
         self.connections = []
         self.initialize_connections()
         
     def initialize_connections(self, max_instances=10):
-        """Find and connect to all available Tradovate instances"""
-        for i in range(max_instances):
-            port = self.base_port + i
+        """
+        Find and connect to all available Tradovate instances
+        
+        All ports are probed over HTTP at once, under DISCOVERY_DEADLINE. Only ports with a
+        Tradovate target are attached to (one websocket, to that tab) and injected, also in
+        parallel. Connections keep port order.
+        """
+        started = time.monotonic()
+        ports = [self.base_port + i for i in range(max_instances)]
+        
+        executor = ThreadPoolExecutor(max_workers=min(len(ports), self.MAX_PARALLEL_ACCOUNTS) or 1,
+                                      thread_name_prefix="tradovate-discovery")
+        probes = [(i, port, executor.submit(probe_port, port, self.PROBE_TIMEOUT)) for i, port in enumerate(ports)]
+        deadline = started + self.DISCOVERY_DEADLINE
+        matches = []
+        for i, port, future in probes:
             try:
-                connection = TradovateConnection(port, f"Account {i+1}")
-                if connection.tab:
-                    # Only add connections with a valid tab
-                    connection.inject_tampermonkey()
-                    self.connections.append(connection)
-                    print(f"Added connection on port {port}")
+                target = find_tradovate_target(future.result(timeout=max(0, deadline - time.monotonic())))
+            except FuturesTimeoutError:
+                continue
+            if target:
+                matches.append((i, port, target))
+        
+        def attach(i, port, target):
+            connection = TradovateConnection(port, f"Account {i+1}", target=target)
+            if not connection.tab:
+                return None
+            connection.inject_tampermonkey()
+            return connection
+        
+        attaches = [(port, executor.submit(attach, i, port, target)) for i, port, target in matches]
+        executor.shutdown(wait=False)
+        deadline = time.monotonic() + self.account_timeout
+        for port, future in attaches:
+            try:
+                connection = future.result(timeout=max(0, deadline - time.monotonic()))
             except Exception as e:
-                # This port might not have a running Chrome instance
-                pass
+                print(f"Could not attach to Tradovate on port {port}: {e}")
+                continue
+            if connection:
+                # Only add connections with a valid tab
+                self.connections.append(connection)
+                print(f"Added connection on port {port}")
                 
-        print(f"Found {len(self.connections)} active Tradovate connections")
+        print(f"Found {len(self.connections)} active Tradovate connections "
+              f"in {time.monotonic() - started:.2f}s")
         
-    def execute_on_all(self, method_name, *args, **kwargs):
-        """Execute a method on all connections"""
+    def execute_concurrently(self, indices, task, timeout=None):
+        """
+        Run task(index, conn) for several connections at the same time
+
+        Every account is started immediately on its own worker thread, so the
+        total wall time is bounded by the slowest account rather than the sum
+        of all of them.
+
+        Args:
+            indices: Connection indices to run on (invalid indices are reported as errors)
+            task: Callable taking (index, conn) and returning the per-account result
+            timeout: Per-account deadline in seconds (defaults to self.account_timeout)
+
+        Returns:
+            list: One {"account", "port", "result"} dict per index, in the order given.
+                  Accounts that raise or miss the deadline get {"error": ...} as result.
+        """
+        timeout = self.account_timeout if timeout is None else timeout
+        indices = list(indices)
+        if not indices:
+            return []
+
+        # A fresh pool per fan-out: a tab that never answers keeps its thread busy,
+        # and that must not starve the next order
+        executor = ThreadPoolExecutor(max_workers=min(len(indices), self.MAX_PARALLEL_ACCOUNTS),
+                                      thread_name_prefix="tradovate-fanout")
+        futures = []
+        for index in indices:
+            if 0 <= index < len(self.connections):
+                conn = self.connections[index]
+                if conn.health in (TradovateConnection.RECONNECTING, TradovateConnection.DEAD):
+                    # Don't queue behind a repair; report it and let the other accounts trade
+                    futures.append((index, conn, conn.health))
+                else:
+                    futures.append((index, conn, executor.submit(task, index, conn)))
+            else:
+                futures.append((index, None, None))
+        executor.shutdown(wait=False)
+
+        deadline = time.monotonic() + timeout
         results = []
-        for conn in self.connections:
-            method = getattr(conn, method_name)
-            result = method(*args, **kwargs)
+        for index, conn, future in futures:
+            if future is None:
+                results.append({
+                    "account": None,
+                    "port": None,
+                    "result": {"error": f"Invalid connection index: {index}"}
+                })
+                continue
+
+            if isinstance(future, str):
+                results.append({
+                    "account": conn.account_name,
+                    "port": conn.port,
+                    "result": {"error": f"Connection {future}"}
+                })
+                continue
+
+            try:
+                result = future.result(timeout=max(0, deadline - time.monotonic()))
+            except FuturesTimeoutError:
+                future.cancel()
+                result = {"error": f"Timed out after {timeout}s"}
+            except Exception as e:
+                result = {"error": str(e)}
+
             results.append({
                 "account": conn.account_name,
                 "port": conn.port,
                 "result": result
             })
+
+        failed = sum(1 for r in results if isinstance(r["result"], dict) and "error" in r["result"])
+        if failed:
+            print(f"Fan-out finished with {failed} of {len(results)} accounts failing")
         return results
+
+    def execute_on_all(self, method_name, *args, _timeout=None, _priority=None, **kwargs):
+        """
+        Execute a method on all connections concurrently
+
+        Results are returned in connection order. A failing or slow account does
+        not block the others; its result is {"error": ...} instead. Use _timeout
+        to override the per-account deadline, and _priority=PRIORITY_EXIT to go
+        ahead of commands waiting for the same tab.
+        """
+        def run(index, conn):
+            with conn.lock.prioritized(_priority):
+                return getattr(conn, method_name)(*args, **kwargs)
+
+        return self.execute_concurrently(range(len(self.connections)), run, timeout=_timeout)
+        
+    def check_health(self, repair=True):
+        """
+        Probe every connection and repair only the broken ones
+        
+        The connection list is never rebuilt, so healthy accounts stay tradeable
+        while a broken port is being repaired.
+        
+        Returns:
+            list: get_health() of each connection after the check
+        """
+        connections = list(self.connections)
+        self._run_in_parallel([conn.check_health for conn in connections], timeout=5)
         
-    def execute_on_one(self, index, method_name, *args, **kwargs):
-        """Execute a method on a specific connection by index"""
+        if repair:
+            broken = [i for i, conn in enumerate(connections) if conn.needs_repair()]
+            self._run_in_parallel([lambda i=i: self.repair_connection(i) for i in broken],
+                                  timeout=self.account_timeout)
+        
+        return [conn.get_health() for conn in connections]
+    
+    def _run_in_parallel(self, calls, timeout):
+        """Run maintenance calls side by side, waiting at most timeout; unlike
+        execute_concurrently this also reaches reconnecting and dead connections"""
+        if not calls:
+            return
+        executor = ThreadPoolExecutor(max_workers=min(len(calls), self.MAX_PARALLEL_ACCOUNTS),
+                                      thread_name_prefix="tradovate-health")
+        futures = [executor.submit(call) for call in calls]
+        executor.shutdown(wait=False)
+        deadline = time.monotonic() + timeout
+        for future in futures:
+            try:
+                future.result(timeout=max(0, deadline - time.monotonic()))
+            except Exception as e:
+                print(f"Health task failed: {e}")
+    
+    def repair_connection(self, index):
+        """Reconnect a single connection in place"""
+        conn = self.connections[index]
+        print(f"Repairing {conn.account_name} on port {conn.port}...")
+        repaired = conn.reconnect()
+        print(f"Repair of {conn.account_name} {'succeeded' if repaired else 'failed'} ({conn.health})")
+        return repaired
+    
+    def execute_on_one(self, index, method_name, *args, _priority=None, **kwargs):
+        """Execute a method on a specific connection by index (_priority as in execute_on_all)"""
         if 0 <= index < len(self.connections):
             conn = self.connections[index]
+            if conn.health in (TradovateConnection.RECONNECTING, TradovateConnection.DEAD):
+                return {
+                    "account": conn.account_name,
+                    "port": conn.port,
+                    "result": {"error": f"Connection {conn.health}"}
+                }
             method = getattr(conn, method_name)
-            result = method(*args, **kwargs)
+            with conn.lock.prioritized(_priority):
+                result = method(*args, **kwargs)
             return {
                 "account": conn.account_name,
                 "port": conn.port,
@@ -6,10 +6,18 @@ import pychrome
 from threading import Thread
 from pathlib import Path
 from src.utils.core import get_project_root, setup_logging
-from src.services.scraper_service import get_scraper_service
+from src.services.scraper_service import get_scraper_service, decode_scraper_payload
+from src.services.log_buffer import LogRingBuffer
+from src.services.log_writer import get_log_writer
+from src.services.log_dispatcher import CallbackDispatcher
+from src.services.dom_snapshot_store import DomSnapshotStore, DomSnapshotScheduler
 
 class ChromeLogger:
-    def __init__(self, tab, log_file=None, account_name=None):
+    # Page binding the scraper calls with market data (see tradovateScraper.user.js)
+    SCRAPER_BINDING = 'tradovateScraperData'
+    
+    def __init__(self, tab, log_file=None, account_name=None, max_log_entries=5000,
+                 max_log_bytes=5 * 1024 * 1024, spill_file=None, snapshot_interval=5.0):
         """
         Initialize a logger for Chrome DevTools Protocol
         
@@ -17,15 +25,25 @@ class ChromeLogger:
             tab: The Chrome tab to log from (pychrome tab object)
             log_file: Path to log file (if None, will only use callbacks)
             account_name: Name of the account associated with this tab
+            max_log_entries: Entries kept in memory for get_combined_debug_data
+            max_log_bytes: Approximate size budget of the entries kept in memory
+            spill_file: Optional NDJSON file receiving entries evicted from memory
+            snapshot_interval: Minimum seconds between automatic DOM snapshots of this tab
         """
         self.tab = tab
         self.log_file = log_file
         self.account_name = account_name or 'Unknown'
         self.callbacks = []
+        # Callbacks and scraper ingestion run on dispatcher workers once the logger is started,
+        # so a slow consumer never holds up CDP event handling for this tab
+        self.dispatcher = CallbackDispatcher()
+        self._scraper_consumer = self._ingest_scraper_payload
+        self.dispatcher.configure(self._scraper_consumer, max_queue=10000)
         self.is_running = False
         self.log_thread = None
         self.dom_snapshot_enabled = False
-        self.combined_log_entries = []  # Store combined log + DOM data for Claude Code analysis
+        # Recent log + DOM data for Claude Code analysis, bounded so long sessions don't grow without limit
+        self.combined_log_entries = LogRingBuffer(max_log_entries, max_log_bytes, spill_file)
         
         # Create log file directory if needed
         if log_file:
@@ -36,6 +54,15 @@ class ChromeLogger:
             self.log_file = str(log_path)
         else:
             self.log_file = None
+        
+        # Automatic snapshots are captured in the background; log entries only reference them
+        snapshot_dir = (Path(self.log_file).parent if self.log_file else get_project_root() / 'logs') / 'dom_snapshots'
+        self.snapshot_scheduler = DomSnapshotScheduler(
+            self._capture_raw_snapshot,
+            DomSnapshotStore(snapshot_dir),
+            min_interval=snapshot_interval,
+            url_provider=self._get_current_url
+        )
     
     def start(self):
         """Start capturing logs from the browser"""
@@ -43,6 +70,8 @@ class ChromeLogger:
             return
             
         try:
+            self.dispatcher.start()
+            
             # Enable various logging domains
             self.tab.Log.enable()
             self.tab.Runtime.enable()
@@ -56,6 +85,14 @@ class ChromeLogger:
             self.tab.Runtime.exceptionThrown = self._on_exception
             self.tab.Console.messageAdded = self._on_console_message
             
+            # Dedicated channel for scraper market data; it skips the console and log pipeline.
+            # Without it the scraper falls back to [SCRAPER_DATA] console messages.
+            try:
+                self.tab.Runtime.bindingCalled = self._on_binding_called
+                self.tab.Runtime.addBinding(name=self.SCRAPER_BINDING)
+            except Exception as e:
+                print(f"[Chrome Logger] Scraper binding unavailable, using console transport: {e}")
+            
             # Start background thread for processing logs
             self.is_running = True
             self.log_thread = Thread(target=self._process_logs)
@@ -92,9 +129,19 @@ class ChromeLogger:
             # Ignore WebSocket errors during cleanup - tab may already be closed
             pass
         
+        # Drop snapshot requests that were not captured yet; the tab is going away
+        self.snapshot_scheduler.stop(timeout=0.5)
+        
         # Clear the tab reference to prevent further operations
         self.tab = None
         
+        # Deliver what consumers still have queued
+        self.dispatcher.stop(timeout=0.5)
+        
+        # Get this logger's queued lines onto disk
+        if self.log_file:
+            get_log_writer().flush(timeout=1.0)
+        
         # Wait for background thread with shorter timeout to avoid blocking
         if self.log_thread:
             self.log_thread.join(timeout=0.5)
@@ -115,7 +162,7 @@ class ChromeLogger:
     def remove_callback(self, callback_id):
         """Remove a callback by its ID"""
         if 0 <= callback_id < len(self.callbacks):
-            self.callbacks.pop(callback_id)
+            self.dispatcher.remove(self.callbacks.pop(callback_id))
             return True
         return False
     
@@ -232,6 +279,9 @@ class ChromeLogger:
         - Console errors
         - JavaScript exceptions  
         - Critical console.log events (configurable)
+        
+        Captures run in the background at most once per snapshot_interval; the log entry
+        gets a 'dom_snapshot' reference that is filled in once the snapshot is on disk.
         """
         self.dom_snapshot_enabled = True
         print("🔍 DOM Snapshot capture enabled for comprehensive debugging")
@@ -259,12 +309,7 @@ class ChromeLogger:
             print(f"🔍 Capturing DOM snapshot{f' (trigger: {trigger_event})' if trigger_event else ''}")
             
             # Capture DOM snapshot with comprehensive data
-            snapshot_result = self.tab.DOMSnapshot.captureSnapshot(
-                computedStyles=[],  # Include computed styles for elements
-                includePaintOrder=True,  # Include paint order information
-                includeDOMRects=True,   # Include element positioning rectangles  
-                includeBlendedBackgroundColors=True  # Include background color info
-            )
+            snapshot_result = self._capture_raw_snapshot()
             
             if snapshot_result:
                 # Add metadata
@@ -285,6 +330,34 @@ class ChromeLogger:
             print(f"🔴 ERROR: DOM snapshot capture failed: {e}")
             return None
     
+    def _capture_raw_snapshot(self):
+        """Raw DOMSnapshot.captureSnapshot result for the current page"""
+        tab = self.tab
+        if not tab:
+            return None
+        return tab.DOMSnapshot.captureSnapshot(
+            computedStyles=[],  # Include computed styles for elements
+            includePaintOrder=True,  # Include paint order information
+            includeDOMRects=True,   # Include element positioning rectangles  
+            includeBlendedBackgroundColors=True  # Include background color info
+        )
+    
+    def request_dom_snapshot(self, trigger_event):
+        """
+        Ask for a background DOM snapshot without blocking the caller
+        
+        Args:
+            trigger_event (str): Description of what triggered the snapshot
+            
+        Returns:
+            dict: Reference that gains 'id' and 'path' of the stored snapshot once captured
+        """
+        return self.snapshot_scheduler.request(trigger_event)
+    
+    def load_dom_snapshot(self, snapshot_id):
+        """Read a stored snapshot back by the 'id' in its reference"""
+        return self.snapshot_scheduler.store.load(snapshot_id)
+    
     def _get_current_url(self):
         """Get the current page URL"""
         try:
@@ -297,18 +370,23 @@ class ChromeLogger:
         """
         Get comprehensive debugging data for Claude Code analysis
         
+        Covers the entries still retained in memory; see session_info['log_buffer'] for evictions.
+        
         Args:
-            include_snapshots (bool): Whether to include DOM snapshots in output
+            include_snapshots (bool): Whether to include DOM snapshot references in output
             
         Returns:
-            dict: Combined log entries and DOM snapshots formatted for analysis
+            dict: Combined log entries and DOM snapshot references formatted for analysis
         """
         debug_data = {
             'session_info': {
                 'timestamp': datetime.datetime.now().isoformat(),
                 'url': self._get_current_url(),
                 'dom_snapshots_enabled': self.dom_snapshot_enabled,
-                'total_log_entries': len(self.combined_log_entries)
+                'total_log_entries': len(self.combined_log_entries),
+                'log_buffer': self.combined_log_entries.get_stats(),
+                'dom_snapshots': self.snapshot_scheduler.get_stats(),
+                'callbacks': self.get_callback_stats()
             },
             'log_entries': self.combined_log_entries.copy()
         }
@@ -316,7 +394,7 @@ class ChromeLogger:
         if include_snapshots:
             # Filter entries that have DOM snapshots
             entries_with_snapshots = [
-                entry for entry in self.combined_log_entries 
+                entry for entry in debug_data['log_entries']
                 if entry.get('dom_snapshot') is not None
             ]
             debug_data['entries_with_dom_snapshots'] = len(entries_with_snapshots)
@@ -371,26 +449,26 @@ class ChromeLogger:
             return None
     
     def _write_to_file(self, entry):
-        """Write log entry to file if configured"""
+        """Queue log entry for the background log writer if a file is configured"""
         if not self.log_file:
             return
             
-        try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-                f.write(f"[{timestamp}] {entry['level']} - {entry['text']}\n")
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
+        # The file I/O happens on the writer thread, not on the CDP event thread
+        timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+        get_log_writer().write(self.log_file, f"[{timestamp}] {entry['level']} - {entry['text']}\n")
     
     def _process_callbacks(self, entry):
-        """Process all registered callbacks"""
-        for callback in self.callbacks:
-            try:
-                callback(entry)
-            except Exception as e:
-                print(f"Error in callback: {e}")
-                import traceback
-                traceback.print_exc()
+        """Hand the entry to every registered callback through the dispatcher"""
+        for callback in list(self.callbacks):
+            self.dispatcher.dispatch(callback, entry)
+    
+    def flush_callbacks(self, timeout=1.0):
+        """Wait until every callback has received the entries queued so far"""
+        return self.dispatcher.flush(timeout)
+    
+    def get_callback_stats(self):
+        """Per-consumer delivered, dropped, coalesced and lagging counters"""
+        return self.dispatcher.get_stats()
     
     def _on_log_entry(self, **kwargs):
         """Handle Log.entryAdded event"""
@@ -406,18 +484,42 @@ class ChromeLogger:
         
         # Capture DOM snapshot for errors if enabled
         if self.dom_snapshot_enabled and entry.get('level') in ['error', 'ERROR']:
-            dom_snapshot = self.capture_dom_snapshot(f"Browser error: {entry.get('text', '')[:100]}")
-            log_entry['dom_snapshot'] = dom_snapshot
+            log_entry['dom_snapshot'] = self.request_dom_snapshot(f"Browser error: {entry.get('text', '')[:100]}")
             
         # Add to combined log entries for Claude Code analysis
-        self.combined_log_entries.append(log_entry.copy())
+        self.combined_log_entries.append(log_entry)
         
         self._write_to_file(log_entry)
         self._process_callbacks(log_entry)
     
+    def _on_binding_called(self, **kwargs):
+        """Handle Runtime.bindingCalled event: compact scraper payloads go straight to the scraper service"""
+        if kwargs.get('name') != self.SCRAPER_BINDING:
+            return
+        
+        self.dispatcher.dispatch(self._scraper_consumer, kwargs.get('payload', '{}'))
+    
+    def _ingest_scraper_payload(self, payload):
+        """Decode a binding payload or [SCRAPER_DATA] console JSON and add it to the scraper service"""
+        try:
+            scraper_data = json.loads(payload)
+            if 'trades' not in scraper_data:
+                # Compact binding payload
+                scraper_data = decode_scraper_payload(scraper_data)
+            get_scraper_service().add_scraped_data(self.account_name, scraper_data)
+        except Exception as e:
+            print(f"[Chrome Logger] Error handling scraper payload: {e}")
+    
     def _on_console_api(self, **kwargs):
         """Handle Runtime.consoleAPICalled event"""
         args = kwargs.get('args', [])
+        
+        # Scraper data over the console fallback: check the prefix before building the message
+        first_value = args[0].get('value') if args else None
+        if isinstance(first_value, str) and first_value.startswith('[SCRAPER_DATA] '):
+            self.dispatcher.dispatch(self._scraper_consumer, first_value[15:])
+            return
+        
         # Fix: Ensure all values are properly converted to strings before joining
         message_parts = []
         for arg in args:
@@ -428,25 +530,6 @@ class ChromeLogger:
         message = ' '.join(message_parts)
         console_type = kwargs.get('type', 'log').upper()
         
-        # Check if this is scraper data
-        if message.startswith('[SCRAPER_DATA] '):
-            try:
-                # Extract JSON data after the marker
-                json_str = message[15:]  # Remove '[SCRAPER_DATA] ' prefix
-                scraper_data = json.loads(json_str)
-                
-                # Use the account name from logger instance
-                account = self.account_name
-                
-                # Send to scraper service
-                scraper_service = get_scraper_service()
-                scraper_service.add_scraped_data(account, scraper_data)
-                
-                # Log successful capture
-                print(f"[Chrome Logger] Captured scraper data from {account}: {len(scraper_data.get('trades', []))} trades")
-            except Exception as e:
-                print(f"[Chrome Logger] Error parsing scraper data: {e}")
-        
         log_entry = {
             'source': 'console',
             'level': console_type,
@@ -466,11 +549,10 @@ class ChromeLogger:
                 should_capture_snapshot = True
                 
         if should_capture_snapshot:
-            dom_snapshot = self.capture_dom_snapshot(f"Console {console_type}: {message[:100]}")
-            log_entry['dom_snapshot'] = dom_snapshot
+            log_entry['dom_snapshot'] = self.request_dom_snapshot(f"Console {console_type}: {message[:100]}")
             
         # Add to combined log entries for Claude Code analysis
-        self.combined_log_entries.append(log_entry.copy())
+        self.combined_log_entries.append(log_entry)
         
         self._write_to_file(log_entry)
         self._process_callbacks(log_entry)
@@ -492,11 +574,10 @@ class ChromeLogger:
         
         # Always capture DOM snapshot for exceptions if enabled
         if self.dom_snapshot_enabled:
-            dom_snapshot = self.capture_dom_snapshot(f"JavaScript Exception: {exception_text[:100]}")
-            log_entry['dom_snapshot'] = dom_snapshot
+            log_entry['dom_snapshot'] = self.request_dom_snapshot(f"JavaScript Exception: {exception_text[:100]}")
             
         # Add to combined log entries for Claude Code analysis
-        self.combined_log_entries.append(log_entry.copy())
+        self.combined_log_entries.append(log_entry)
         
         self._write_to_file(log_entry)
         self._process_callbacks(log_entry)
@@ -518,11 +599,10 @@ class ChromeLogger:
         
         # Capture DOM snapshot for console messages with errors if enabled
         if self.dom_snapshot_enabled and message_level in ['ERROR', 'WARNING']:
-            dom_snapshot = self.capture_dom_snapshot(f"Console {message_level}: {message_text[:100]}")
-            log_entry['dom_snapshot'] = dom_snapshot
+            log_entry['dom_snapshot'] = self.request_dom_snapshot(f"Console {message_level}: {message_text[:100]}")
             
         # Add to combined log entries for Claude Code analysis
-        self.combined_log_entries.append(log_entry.copy())
+        self.combined_log_entries.append(log_entry)
         
         self._write_to_file(log_entry)
         self._process_callbacks(log_entry)
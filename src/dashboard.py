@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 import threading
 import time
-from flask import Flask, render_template, jsonify, send_file
+from flask import Flask, render_template, jsonify, send_file, Response
 import sys
 import os
 import json
@@ -17,6 +17,11 @@ from .utils.core import (
     setup_logging
 )
 from .services.scraper_service import get_scraper_service
+from .services.account_snapshot_service import AccountSnapshotService
+from .services.account_summary_service import AccountSummaryService
+from .services.account_stream_service import AccountStreamService
+from .services.instrument_registry import get_instrument_registry
+from .services.tab_lock import PRIORITY_EXIT
 
 # Create Flask app
 project_root = get_project_root()
@@ -27,6 +32,7 @@ try:
     TRADING_DEFAULTS = trading_config.get('trading_defaults', {})
     SYMBOL_DEFAULTS = trading_config.get('symbol_defaults', {})
     SCRAPER_CONFIG = trading_config.get('scraper_config', {})
+    DASHBOARD_CONFIG = trading_config.get('dashboard_config', {})
 except (FileNotFoundError, json.JSONDecodeError, Exception) as e:
     print(f"Warning: Could not load trading defaults config: {e}")
     print("Using fallback defaults")
@@ -46,6 +52,7 @@ except (FileNotFoundError, json.JSONDecodeError, Exception) as e:
         "volume_filter": 0,
         "debug": False
     }
+    DASHBOARD_CONFIG = {}
 app = Flask(__name__, 
             static_folder=os.path.join(project_root, 'web/static'),
             template_folder=os.path.join(project_root, 'web/templates'))
@@ -53,6 +60,21 @@ app = Flask(__name__,
 # Initialize controller
 controller = TradovateController()
 
+# Account tables are polled in the background; /api/accounts serves the last snapshot
+account_snapshots = AccountSnapshotService(
+    controller,
+    refresh_interval=DASHBOARD_CONFIG.get('account_refresh_interval', 2.0),
+    account_timeout=DASHBOARD_CONFIG.get('account_timeout', 10.0)
+)
+
+# Summary totals are updated from the snapshot, only for accounts whose rows changed
+account_summary = AccountSummaryService()
+account_snapshots.add_listener(account_summary.update_account)
+
+# Row-level deltas are pushed to open dashboards over Server-Sent Events
+account_stream = AccountStreamService()
+account_snapshots.add_listener(account_stream.update_account)
+
 def inject_account_data_function():
     """Inject the getAllAccountTableData function into all tabs"""
     for conn in controller.connections:
@@ -79,110 +101,32 @@ def dashboard():
 # API endpoint to get all account data
 @app.route('/api/accounts', methods=['GET'])
 def get_accounts():
-    account_data = []
-    
-    # Fetch data from all tabs
-    for i, conn in enumerate(controller.connections):
-        if conn.tab:
-            try:
-                # First make sure the getAllAccountTableData function is available
-                try:
-                    # Re-inject the function to ensure it's available
-                    project_root = get_project_root()
-                    account_data_path = os.path.join(project_root, 
-                                           'scripts/tampermonkey/getAllAccountTableData.user.js')
-                    with open(account_data_path, 'r') as file:
-                        get_account_data_js = file.read()
-                    conn.tab.Runtime.evaluate(expression=get_account_data_js)
-                except Exception as inject_err:
-                    print(f"Error re-injecting function: {inject_err}")
-                
-                # Execute the getAllAccountTableData() function in each tab
-                result = conn.tab.Runtime.evaluate(
-                    expression="getAllAccountTableData()")
-                
-                if result and 'result' in result and 'value' in result['result']:
-                    try:
-                        # Parse the JSON result
-                        tab_data = json.loads(result['result']['value'])
-                        
-                        if not tab_data:
-                            continue
-                            
-                        # Add account identifier to each item
-                        for item in tab_data:
-                            item['account_name'] = conn.account_name
-                            item['account_index'] = i
-                            
-                            # Ensure we have both User and Phase fields (Phase is the renamed User field)
-                            if 'User' in item and 'Phase' not in item:
-                                item['Phase'] = item['User']
-                                
-                            # Standardize Account field - ensure there's only one Account field
-                            # and remove any with arrows
-                            if 'Account ▲' in item:
-                                account_value = item['Account ▲']
-                                # Remove the old key and add standardized one
-                                item.pop('Account ▲', None)
-                                # Make sure we don't create duplicate Account fields
-                                if 'Account' not in item:
-                                    item['Account'] = account_value
-                        
-                        account_data.extend(tab_data)
-                    except json.JSONDecodeError as e:
-                        print(f"Error parsing JSON from {conn.account_name}: {e}")
-                else:
-                    print(f"No valid result structure for {conn.account_name}")
-            except Exception as e:
-                print(f"Error getting account data from {conn.account_name}: {e}")
-    
-    return jsonify(account_data)
+    response = jsonify(account_snapshots.get_rows())
+    age = account_snapshots.get_age()
+    if age is not None:
+        response.headers['X-Snapshot-Age'] = str(age)
+    return response
+
+# API endpoint to get the age and health of each account snapshot
+@app.route('/api/accounts/status', methods=['GET'])
+def get_accounts_status():
+    return jsonify(account_snapshots.get_status())
+
+# Server-Sent Events stream: the full table once, then row deltas as accounts change
+@app.route('/api/accounts/stream', methods=['GET'])
+def stream_accounts():
+    subscription = account_stream.subscribe()
+    rows = account_snapshots.get_rows()
+    return Response(account_stream.stream(subscription, rows),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 # API endpoint to get summary data
 @app.route('/api/summary', methods=['GET'])
 def get_summary():
-    # We'll forward this to the accounts endpoint since we're now focusing on account data
-    accounts_response = get_accounts()
-    accounts_data = json.loads(accounts_response.get_data(as_text=True))
-    
-    # Calculate summary stats
-    total_pnl = 0
-    total_margin = 0
-    
-    for account in accounts_data:
-        # Try to extract P&L (check both original and standardized names)
-        pnl_fields = ['Total P&L', 'Dollar Total P L']
-        for field in pnl_fields:
-            if field in account:
-                val = account[field]
-                if isinstance(val, (int, float)):
-                    total_pnl += val
-                elif isinstance(val, str):
-                    try:
-                        total_pnl += float(val.replace('$', '').replace(',', ''))
-                    except (ValueError, TypeError):
-                        pass
-                break
-                    
-        # Try to extract margin (check both original and standardized names)
-        margin_fields = ['Available Margin', 'Total Available Margin']
-        for field in margin_fields:
-            if field in account:
-                val = account[field]
-                if isinstance(val, (int, float)):
-                    total_margin += val
-                elif isinstance(val, str):
-                    try:
-                        total_margin += float(val.replace('$', '').replace(',', ''))
-                    except (ValueError, TypeError):
-                        pass
-                break
-    
-    return jsonify({
-        'total_pnl': total_pnl,
-        'total_margin': total_margin,
-        'account_count': len(accounts_data)
-    })
+    # Totals are maintained incrementally from the account snapshot
+    account_snapshots.ensure_loaded()
+    return jsonify(account_summary.get_summary())
 
 # Helper function to calculate scale in/out orders
 def calculate_scale_orders(symbol, quantity, action, entry_price, scale_levels, scale_ticks, tick_size):
@@ -263,6 +207,13 @@ def calculate_scale_orders(symbol, quantity, action, entry_price, scale_levels,
     
     return orders
 
+def batch_step_value(batch, op):
+    """Value returned by one step of a run_batch() result, or an error dict if it didn't run"""
+    for step in batch.get('steps', []):
+        if step.get('op') == op:
+            return step.get('value') if step.get('ok') else {'error': step.get('error')}
+    return {'error': batch.get('error', f'{op} did not run')}
+
 # API endpoint to execute trades
 @app.route('/api/trade', methods=['POST'])
 def execute_trade():
@@ -286,7 +237,7 @@ def execute_trade():
         scale_in_enabled = data.get('scale_in_enabled', TRADING_DEFAULTS.get('scale_in_enabled', False))
         scale_in_levels = data.get('scale_in_levels', TRADING_DEFAULTS.get('scale_in_levels', 4))
         # Get symbol-specific scale ticks if available
-        symbol_config = symbol_defaults.get(symbol, {})
+        symbol_config = get_instrument_registry().get(symbol) or {}
         scale_in_ticks = data.get('scale_in_ticks', symbol_config.get('scale_in_ticks', 20))
         
         # Only get TP/SL values if they are enabled with config defaults
@@ -299,87 +250,25 @@ def execute_trade():
         
         print(f"Trade request: {symbol} {action} {quantity} TP:{tp_ticks if enable_tp else 'disabled'} SL:{sl_ticks if enable_sl else 'disabled'} Entry:{entry_price if entry_price else 'market'}")
         
-        # Always update the Tampermonkey entry price field - either set it or clear it
-        if entry_price is not None:
-            # JavaScript to set the entry price in Tampermonkey UI
-            set_entry_js = f"""
-            (function() {{
-                try {{
-                    const entryPriceInput = document.getElementById('entryPriceInput');
-                    if (entryPriceInput) {{
-                        entryPriceInput.value = {entry_price};
-                        entryPriceInput.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                        entryPriceInput.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        return {{ success: true, message: 'Entry price set to {entry_price}' }};
-                    }} else {{
-                        return {{ success: false, error: 'Entry price input not found' }};
-                    }}
-                }} catch (err) {{
-                    return {{ success: false, error: err.toString() }};
-                }}
-            }})();
-            """
-            
-            # Set entry price on all relevant accounts
-            if account_index == 'all':
-                for conn in controller.connections:
-                    if conn.tab:
-                        try:
-                            conn.tab.Runtime.evaluate(expression=set_entry_js)
-                        except Exception as e:
-                            print(f"Warning: Failed to set entry price on account: {e}")
-            else:
-                # Set entry price on specific account
-                account_index_int = int(account_index)
-                if account_index_int < len(controller.connections) and controller.connections[account_index_int].tab:
-                    try:
-                        controller.connections[account_index_int].tab.Runtime.evaluate(expression=set_entry_js)
-                    except Exception as e:
-                        print(f"Warning: Failed to set entry price on account {account_index}: {e}")
-        else:
-            # Entry price is None - need to clear the Tampermonkey entry price field
-            clear_entry_js = """
-            (function() {
-                try {
-                    const entryPriceInput = document.getElementById('entryPriceInput');
-                    if (entryPriceInput) {
-                        entryPriceInput.value = '';
-                        entryPriceInput.dispatchEvent(new Event('input', { bubbles: true }));
-                        entryPriceInput.dispatchEvent(new Event('change', { bubbles: true }));
-                        return { success: true, message: 'Entry price cleared' };
-                    } else {
-                        return { success: false, error: 'Entry price input not found' };
-                    }
-                } catch (err) {
-                    return { success: false, error: err.toString() };
-                }
-            })();
-            """
-            
-            # Clear entry price on all relevant accounts
-            if account_index == 'all':
-                for conn in controller.connections:
-                    if conn.tab:
-                        try:
-                            conn.tab.Runtime.evaluate(expression=clear_entry_js)
-                        except Exception as e:
-                            print(f"Warning: Failed to clear entry price on account: {e}")
-            else:
-                # Clear entry price on specific account
-                account_index_int = int(account_index)
-                if account_index_int < len(controller.connections) and controller.connections[account_index_int].tab:
-                    try:
-                        controller.connections[account_index_int].tab.Runtime.evaluate(expression=clear_entry_js)
-                    except Exception as e:
-                        print(f"Warning: Failed to clear entry price on account {account_index}: {e}")
+        # One batch per tab: always set or clear the Tampermonkey entry price field, then
+        # place the order(s). A failed entry price update doesn't stop the order.
+        steps = [{"op": "setEntryPrice", "args": {"price": entry_price}, "optional": True}]
+        order_args = {
+            "symbol": symbol,
+            "action": action,
+            "tp_ticks": tp_ticks if enable_tp else 0,  # Pass 0 to disable TP
+            "sl_ticks": sl_ticks if enable_sl else 0,  # Pass 0 to disable SL
+            "tick_size": tick_size
+        }
         
         # Check if we should use scale in/out
         print(f"\n=== SCALE IN/OUT CHECK ===")
         print(f"Scale enabled: {scale_in_enabled}")
         print(f"Scale levels: {scale_in_levels}")
         print(f"Condition met: {scale_in_enabled and scale_in_levels > 1}")
+        use_scale = scale_in_enabled and scale_in_levels > 1
         
-        if scale_in_enabled and scale_in_levels > 1:
+        if use_scale:
             print(f"=== EXECUTING SCALE IN/OUT ===")
             
             # Validate scale levels don't exceed quantity
@@ -401,132 +290,65 @@ def execute_trade():
                     symbol, quantity, action, entry_price,
                     scale_in_levels, scale_in_ticks, tick_size
                 )
-                
-                print(f"Scale orders calculated: {scale_orders}")
-                
-                # Validate scale orders were calculated successfully
-                if not scale_orders or len(scale_orders) == 0:
-                    print(f"ERROR: No scale orders returned from calculate_scale_orders")
-                    return jsonify({
-                        'status': 'error',
-                        'message': 'Failed to calculate scale orders'
-                    }), 500
-                
-                print(f"Scale in enabled: {len(scale_orders)} orders calculated")
-                
-                # For scale orders, we need to execute multiple trades
-                # Pass the scale orders as a special parameter
-                print(f"Executing scale orders on accounts...")
-                
-                if account_index == 'all':
-                    print(f"Executing on ALL accounts ({len(controller.connections)} connections)")
-                    result = controller.execute_on_all(
-                        'auto_trade_scale',  # New method for scale orders
-                        symbol, 
-                        scale_orders,  # Pass array of orders instead of single quantity
-                        action, 
-                        tp_ticks if enable_tp else 0,
-                        sl_ticks if enable_sl else 0,
-                        tick_size
-                    )
-                    print(f"Scale order execution result: {result}")
-                    
-                    # Check if any scale orders failed
-                    failed_accounts = [r for r in result if 'error' in r.get('result', {})]
-                    if failed_accounts:
-                        print(f"Warning: Scale orders failed on {len(failed_accounts)} accounts: {failed_accounts}")
-                else:
-                    # Execute on specific account
-                    account_index = int(account_index)
-                    print(f"Executing on account {account_index}")
-                    result = controller.execute_on_one(
-                        account_index,
-                        'auto_trade_scale',  # New method for scale orders
-                        symbol, 
-                        scale_orders,  # Pass array of orders instead of single quantity
-                        action, 
-                        tp_ticks if enable_tp else 0,
-                        sl_ticks if enable_sl else 0,
-                        tick_size
-                    )
-                    print(f"Scale order execution result: {result}")
-                    
-                    # Check if scale order failed
-                    if 'error' in result.get('result', {}):
-                        print(f"ERROR: Scale order failed: {result['result'].get('error', 'Unknown error')}")
-                        return jsonify({
-                            'status': 'error',
-                            'message': f"Scale order failed: {result['result'].get('error', 'Unknown error')}"
-                        }), 500
             except Exception as e:
-                print(f"Error calculating/executing scale orders: {str(e)}")
+                print(f"Error calculating scale orders: {str(e)}")
                 return jsonify({
                     'status': 'error',
                     'message': f'Failed to execute scale orders: {str(e)}'
                 }), 500
-        else:
-            # Regular single order execution
-            if account_index == 'all':
-                # We need to update auto_trade.js to respect tp_ticks=0 and sl_ticks=0 as disabled
-                result = controller.execute_on_all(
-                    'auto_trade', 
-                    symbol, 
-                    quantity, 
-                    action, 
-                    tp_ticks if enable_tp else 0,  # Pass 0 to disable TP
-                    sl_ticks if enable_sl else 0,  # Pass 0 to disable SL
-                    tick_size
-                )
-                
-                # Count successful trades
-                accounts_affected = sum(1 for r in result if 'error' not in r['result'])
-                
-                return jsonify({
-                    'status': 'success',
-                    'message': f'{action} trade executed on {accounts_affected} accounts',
-                    'accounts_affected': accounts_affected,
-                    'details': result
-                })
             
-            else:
-                # Execute on specific account
-                account_index = int(account_index)
-                result = controller.execute_on_one(
-                    account_index,
-                    'auto_trade', 
-                    symbol, 
-                    quantity, 
-                    action, 
-                    tp_ticks if enable_tp else 0,  # Pass 0 to disable TP
-                    sl_ticks if enable_sl else 0,  # Pass 0 to disable SL
-                    tick_size
-                )
-                
+            print(f"Scale orders calculated: {scale_orders}")
+            
+            # Validate scale orders were calculated successfully
+            if not scale_orders or len(scale_orders) == 0:
+                print(f"ERROR: No scale orders returned from calculate_scale_orders")
                 return jsonify({
-                    'status': 'success',
-                    'message': f'{action} trade executed on account {account_index}',
-                    'accounts_affected': 1,
-                    'details': result
-                })
+                    'status': 'error',
+                    'message': 'Failed to calculate scale orders'
+                }), 500
+            
+            print(f"Scale in enabled: {len(scale_orders)} orders calculated")
+            steps.append({"op": "autoTradeScale", "args": dict(order_args, scale_orders=scale_orders)})
+        else:
+            # Regular single order execution
+            steps.append({"op": "autoTrade", "args": dict(order_args, quantity=quantity)})
         
-        # Process results and return response for scale orders only
         if account_index == 'all':
+            print(f"Executing on ALL accounts ({len(controller.connections)} connections)")
+            result = controller.execute_on_all('run_batch', steps)
+            
             # Count successful trades
-            accounts_affected = sum(1 for r in result if 'error' not in r['result'])
+            failed_accounts = [r for r in result if 'error' in r['result']]
+            if failed_accounts:
+                print(f"Warning: Orders failed on {len(failed_accounts)} accounts: {failed_accounts}")
+            accounts_affected = len(result) - len(failed_accounts)
             message = f'{action} trade executed on {accounts_affected} accounts'
-            if scale_in_enabled:
-                message += f' with {scale_in_levels} scale levels'
         else:
+            # Execute on specific account
+            account_index = int(account_index)
+            print(f"Executing on account {account_index}")
+            result = controller.execute_on_one(account_index, 'run_batch', steps)
+            
+            # Check if the scale order failed (an invalid index has no per-account result)
+            order_result = result.get('result', result)
+            if use_scale and 'error' in order_result:
+                print(f"ERROR: Scale order failed: {order_result['error']}")
+                return jsonify({
+                    'status': 'error',
+                    'message': f"Scale order failed: {order_result['error']}"
+                }), 500
             accounts_affected = 1
             message = f'{action} trade executed on account {account_index}'
-            if scale_in_enabled:
-                message += f' with {scale_in_levels} scale levels'
+        
+        print(f"Order execution result: {result}")
+        if use_scale:
+            message += f' with {scale_in_levels} scale levels'
         
         return jsonify({
             'status': 'success',
             'message': message,
             'accounts_affected': accounts_affected,
-            'scale_orders': scale_in_enabled,
+            'scale_orders': use_scale,
             'details': result
         })
     except Exception as e:
@@ -546,17 +368,22 @@ def exit_positions():
         option = data.get('option', 'cancel-option-Exit-at-Mkt-Cxl')
         account_index = data.get('account', 'all')
         
+        # Exit, then run risk management on the settled positions, in one round trip per tab.
+        # Exits take each tab ahead of trades still waiting for it. Risk management runs
+        # even if the exit fails, as it did when these were separate calls.
+        steps = [
+            {"op": "exitPositions", "args": {"symbol": symbol, "option": option}, "await": True, "optional": True},
+            {"op": "riskManagement"}
+        ]
+        
         # Check if we should execute on all accounts or just one
         if account_index == 'all':
-            result = controller.execute_on_all('exit_positions', symbol, option)
+            result = controller.execute_on_all('run_batch', steps, _priority=PRIORITY_EXIT)
             
             # Count successful operations
             accounts_affected = sum(1 for r in result if 'error' not in r['result'])
-            
-            # After exit positions, run risk management on all accounts
-            print(f"Running auto risk management after exit positions on all accounts")
-            risk_results = controller.execute_on_all('run_risk_management')
-            risk_accounts_affected = sum(1 for r in risk_results if r.get('result', {}).get('status') == 'success')
+            risk_results = [dict(r, result=batch_step_value(r['result'], 'riskManagement')) for r in result]
+            risk_accounts_affected = sum(1 for r in risk_results if r['result'].get('status') == 'success')
             print(f"Auto risk management completed on {risk_accounts_affected} accounts")
             
             return jsonify({
@@ -572,19 +399,8 @@ def exit_positions():
         else:
             # Execute on specific account
             account_index = int(account_index)
-            result = controller.execute_on_one(
-                account_index,
-                'exit_positions', 
-                symbol, 
-                option
-            )
-            
-            # After exit positions, run risk management
-            print(f"Running auto risk management after exit positions on account {account_index}")
-            risk_result = controller.execute_on_one(
-                account_index,
-                'run_risk_management'
-            )
+            result = controller.execute_on_one(account_index, 'run_batch', steps, _priority=PRIORITY_EXIT)
+            risk_result = batch_step_value(result.get('result', result), 'riskManagement')
             print(f"Auto risk management completed: {risk_result}")
             
             return jsonify({
@@ -655,27 +471,7 @@ def update_quantity():
         account_index = data.get('account', 'all')
         
         # Update quantity in Chrome UI
-        js_code = f"""
-        (function() {{
-            try {{
-                // Update quantity input field
-                const qtyInput = document.getElementById('quantityInput');
-                if (qtyInput) {{
-                    qtyInput.value = {quantity};
-                    qtyInput.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                    qtyInput.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                    console.log("Quantity updated to {quantity} in Tradovate UI");
-                    return "Quantity updated in UI";
-                }} else {{
-                    console.error("Quantity input field not found");
-                    return "Quantity input field not found";
-                }}
-            }} catch (err) {{
-                console.error("Error updating quantity:", err);
-                return "Error: " + err.toString();
-            }}
-        }})();
-        """
+        op_args = {"quantity": quantity}
         
         # Check if we should execute on all accounts or just one
         if account_index == 'all':
@@ -683,7 +479,7 @@ def update_quantity():
             for i, conn in enumerate(controller.connections):
                 if conn.tab:
                     try:
-                        ui_result = conn.tab.Runtime.evaluate(expression=js_code)
+                        ui_result = conn.call_op('setQuantity', op_args)
                         result_value = ui_result.get('result', {}).get('value', 'Unknown')
                         results.append({"account": i, "result": result_value})
                     except Exception as e:
@@ -703,7 +499,7 @@ def update_quantity():
             account_index = int(account_index)
             if account_index < len(controller.connections) and controller.connections[account_index].tab:
                 try:
-                    ui_result = controller.connections[account_index].tab.Runtime.evaluate(expression=js_code)
+                    ui_result = controller.connections[account_index].call_op('setQuantity', op_args)
                     result_value = ui_result.get('result', {}).get('value', 'Unknown')
                     
                     return jsonify({
@@ -738,25 +534,7 @@ def move_to_breakeven():
         symbol = data.get('symbol', 'NQ')
         account_index = data.get('account', 'all')
         
-        # JavaScript code to call the breakeven function
-        js_code = f"""
-        (function() {{
-            try {{
-                // Check if moveStopLossToBreakeven function exists
-                if (typeof moveStopLossToBreakeven === 'function') {{
-                    console.log('Calling moveStopLossToBreakeven for symbol: {symbol}');
-                    moveStopLossToBreakeven('{symbol}');
-                    return 'Breakeven function executed successfully';
-                }} else {{
-                    console.error('moveStopLossToBreakeven function not found');
-                    return 'Error: moveStopLossToBreakeven function not found';
-                }}
-            }} catch (err) {{
-                console.error('Error executing breakeven:', err);
-                return 'Error: ' + err.toString();
-            }}
-        }})();
-        """
+        op_args = {"symbol": symbol}
         
         # Check if we should execute on all accounts or just one
         if account_index == 'all':
@@ -764,7 +542,7 @@ def move_to_breakeven():
             for i, conn in enumerate(controller.connections):
                 if conn.tab:
                     try:
-                        result = conn.tab.Runtime.evaluate(expression=js_code)
+                        result = conn.call_op('moveToBreakeven', op_args)
                         result_value = result.get('result', {}).get('value', 'Unknown')
                         results.append({"account": i, "result": result_value})
                     except Exception as e:
@@ -784,7 +562,7 @@ def move_to_breakeven():
             account_index = int(account_index)
             if account_index < len(controller.connections) and controller.connections[account_index].tab:
                 try:
-                    result = controller.connections[account_index].tab.Runtime.evaluate(expression=js_code)
+                    result = controller.connections[account_index].call_op('moveToBreakeven', op_args)
                     result_value = result.get('result', {}).get('value', 'Unknown')
                     
                     return jsonify({
@@ -877,6 +655,7 @@ def reload_trading_defaults():
             SYMBOL_DEFAULTS.update(trading_config.get('symbol_defaults', {}))
             SCRAPER_CONFIG.clear()
             SCRAPER_CONFIG.update(trading_config.get('scraper_config', {}))
+        get_instrument_registry().reload()
         return jsonify({"status": "success", "message": "Trading defaults reloaded"}), 200
     except Exception as e:
         print(f"Error reloading trading defaults: {e}")
@@ -944,188 +723,21 @@ def update_trade_controls():
         source_field = data.get('source_field', None)  # Which field triggered the update
         account_index = data.get('account', 'all')
         
-        # Create JavaScript to update all the trade controls in the UI
-        js_code = """
-        (function() {
-            try {
-                const updates = {
-                    success: true,
-                    updates: {}
-                };
-        """
-        
-        # Only update symbol if it was explicitly changed in the dashboard (not when other fields change)
+        # Only the fields that were given; symbol only if it was explicitly changed in
+        # the dashboard (not when other fields change)
+        controls = {}
         if symbol and source_field == 'symbolInput':
-            js_code += f"""
-                // Update symbol in Tradovate UI
-                try {{
-                    const symbolInput = document.getElementById('symbolInput');
-                    if (symbolInput) {{
-                        symbolInput.value = "{symbol}";
-                        symbolInput.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                        symbolInput.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        updates.updates.symbol = "{symbol}";
-                        console.log("Updated symbol to {symbol} in Tradovate UI");
-                    }}
-                }} catch (err) {{
-                    updates.updates.symbol = "error: " + err.toString();
-                    console.error("Error updating symbol:", err);
-                }}
-            """
-            
-        if quantity:
-            js_code += f"""
-                // Update quantity - matching ID 'qtyInput' from autoOrder.user.js
-                try {{
-                    const qtyInput = document.getElementById('qtyInput');
-                    if (qtyInput) {{
-                        qtyInput.value = {quantity};
-                        qtyInput.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                        qtyInput.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        updates.updates.quantity = {quantity};
-                    }}
-                }} catch (err) {{
-                    updates.updates.quantity = "error: " + err.toString();
-                }}
-            """
-            
-        if tp_ticks:
-            js_code += f"""
-                // Update TP ticks - matching ID 'tpInput' from autoOrder.user.js
-                try {{
-                    const tpInput = document.getElementById('tpInput');
-                    if (tpInput) {{
-                        tpInput.value = {tp_ticks};
-                        tpInput.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                        tpInput.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        updates.updates.tp_ticks = {tp_ticks};
-                    }}
-                }} catch (err) {{
-                    updates.updates.tp_ticks = "error: " + err.toString();
-                }}
-            """
-            
-        if sl_ticks:
-            js_code += f"""
-                // Update SL ticks - matching ID 'slInput' from autoOrder.user.js
-                try {{
-                    const slInput = document.getElementById('slInput');
-                    if (slInput) {{
-                        slInput.value = {sl_ticks};
-                        slInput.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                        slInput.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        updates.updates.sl_ticks = {sl_ticks};
-                    }}
-                }} catch (err) {{
-                    updates.updates.sl_ticks = "error: " + err.toString();
-                }}
-            """
-            
-        if tick_size:
-            js_code += f"""
-                // Update tick size - matching ID 'tickInput' from autoOrder.user.js
-                try {{
-                    const tickInput = document.getElementById('tickInput');
-                    if (tickInput) {{
-                        tickInput.value = {tick_size};
-                        tickInput.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                        tickInput.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        updates.updates.tick_size = {tick_size};
-                    }}
-                }} catch (err) {{
-                    updates.updates.tick_size = "error: " + err.toString();
-                }}
-            """
-        
-        # Add additional fields
+            controls['symbol'] = symbol
+        for field, value in (('quantity', quantity), ('tp_ticks', tp_ticks), ('sl_ticks', sl_ticks),
+                             ('tick_size', tick_size), ('tp_price', tp_price), ('sl_price', sl_price),
+                             ('entry_price', entry_price)):
+            if value:
+                controls[field] = value
         if enable_tp is not None:
-            js_code += f"""
-                // Update TP checkbox - matching ID 'tpCheckbox' from autoOrder.user.js
-                try {{
-                    const tpCheckbox = document.getElementById('tpCheckbox');
-                    if (tpCheckbox) {{
-                        tpCheckbox.checked = {'true' if enable_tp else 'false'};
-                        tpCheckbox.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        updates.updates.enable_tp = {'true' if enable_tp else 'false'};
-                    }}
-                }} catch (err) {{
-                    updates.updates.enable_tp = "error: " + err.toString();
-                }}
-            """
-            
+            controls['enable_tp'] = bool(enable_tp)
         if enable_sl is not None:
-            js_code += f"""
-                // Update SL checkbox - matching ID 'slCheckbox' from autoOrder.user.js
-                try {{
-                    const slCheckbox = document.getElementById('slCheckbox');
-                    if (slCheckbox) {{
-                        slCheckbox.checked = {'true' if enable_sl else 'false'};
-                        slCheckbox.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        updates.updates.enable_sl = {'true' if enable_sl else 'false'};
-                    }}
-                }} catch (err) {{
-                    updates.updates.enable_sl = "error: " + err.toString();
-                }}
-            """
-            
-        if tp_price:
-            js_code += f"""
-                // Update TP price input - matching ID 'tpPriceInput' from autoOrder.user.js
-                try {{
-                    const tpPriceInput = document.getElementById('tpPriceInput');
-                    if (tpPriceInput) {{
-                        tpPriceInput.value = {tp_price};
-                        tpPriceInput.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                        tpPriceInput.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        updates.updates.tp_price = {tp_price};
-                    }}
-                }} catch (err) {{
-                    updates.updates.tp_price = "error: " + err.toString();
-                }}
-            """
-            
-        if sl_price:
-            js_code += f"""
-                // Update SL price input - matching ID 'slPriceInput' from autoOrder.user.js
-                try {{
-                    const slPriceInput = document.getElementById('slPriceInput');
-                    if (slPriceInput) {{
-                        slPriceInput.value = {sl_price};
-                        slPriceInput.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                        slPriceInput.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        updates.updates.sl_price = {sl_price};
-                    }}
-                }} catch (err) {{
-                    updates.updates.sl_price = "error: " + err.toString();
-                }}
-            """
-            
-        if entry_price:
-            js_code += f"""
-                // Update entry price input - matching ID 'entryPriceInput' from autoOrder.user.js
-                try {{
-                    const entryPriceInput = document.getElementById('entryPriceInput');
-                    if (entryPriceInput) {{
-                        entryPriceInput.value = {entry_price};
-                        entryPriceInput.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                        entryPriceInput.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        updates.updates.entry_price = {entry_price};
-                    }}
-                }} catch (err) {{
-                    updates.updates.entry_price = "error: " + err.toString();
-                }}
-            """
-        
-        # Close the JavaScript function
-        js_code += """
-                console.log("Trade control updates complete:", updates);
-                return JSON.stringify(updates);
-            } catch (err) {
-                console.error("Error updating trade controls:", err);
-                return JSON.stringify({success: false, error: err.toString()});
-            }
-        })();
-        """
+            controls['enable_sl'] = bool(enable_sl)
+        op_args = {"controls": controls}
         
         # Check if we should execute on all accounts or just one
         if account_index == 'all':
@@ -1133,7 +745,7 @@ def update_trade_controls():
             for i, conn in enumerate(controller.connections):
                 if conn.tab:
                     try:
-                        ui_result = conn.tab.Runtime.evaluate(expression=js_code)
+                        ui_result = conn.call_op('updateTradeControls', op_args)
                         result_value = ui_result.get('result', {}).get('value', '{}')
                         # Parse the JSON result
                         try:
@@ -1158,7 +770,7 @@ def update_trade_controls():
             account_index = int(account_index)
             if account_index < len(controller.connections) and controller.connections[account_index].tab:
                 try:
-                    ui_result = controller.connections[account_index].tab.Runtime.evaluate(expression=js_code)
+                    ui_result = controller.connections[account_index].call_op('updateTradeControls', op_args)
                     result_value = ui_result.get('result', {}).get('value', '{}')
                     # Parse the JSON result
                     try:
@@ -1338,10 +950,12 @@ def persist_scraper_data():
 # Run the app
 def run_flask_dashboard():
     inject_account_data_function()
+    account_snapshots.start()
     app.run(host='0.0.0.0', port=6001)
 
 if __name__ == '__main__':
     # Start the Flask server
     inject_account_data_function()
+    account_snapshots.start()
     app.run(host='0.0.0.0', port=6001, debug=True)
     print("Dashboard running at http://localhost:6001")
\ No newline at end of file
@@ -45,6 +45,12 @@ try:
 except NameError:
     sys.path.append(os.getcwd())
 from src.app import TradovateController
+from src.services.signal_queue import SignalQueue, QueueFullError
+from src.services.signal_dedup import SignalDeduplicator
+from src.services.signal_journal import SignalJournal, PRE_ORDER_STATES
+from src.services.tab_lock import PRIORITY_EXIT
+from src.services.strategy_router import get_strategy_router
+from src.services.instrument_registry import get_instrument_registry
 
 app = Flask(__name__)
 PORT = 6000
@@ -58,6 +64,30 @@ reconnect_lock = threading.Lock()
 is_shutting_down = False
 last_request_time = time.time()
 health_check_interval = 30  # seconds
+ACCOUNT_SWITCH_TIMEOUT = 3.0  # seconds to wait for the account selector to show the new account
+SYMBOL_UPDATE_TIMEOUT = 5.0  # seconds to wait for the trading ticket to show the new symbol
+
+# Asynchronous intake: /webhook queues the signal and answers 202 right away.
+# Set WEBHOOK_ASYNC=0 (or POST to /webhook?sync=1) to execute inside the request instead.
+ASYNC_INTAKE = os.environ.get('WEBHOOK_ASYNC', '1') != '0'
+SIGNAL_QUEUE_SIZE = 100  # signals waiting before /webhook answers 503
+SIGNAL_WORKERS = 4  # signals executed at the same time
+SIGNAL_EXPRESS_WORKERS = 1  # extra workers reserved for Close signals
+signal_queue = None
+signal_queue_lock = threading.RLock()
+
+# TradingView resends an alert when /webhook times out; retries within the TTL are
+# answered from the first delivery. Set WEBHOOK_DEDUP_JOURNAL=0 to keep keys in memory only.
+DEDUP_TTL = 600  # seconds a client ID or a payload with a bar time is remembered
+DEDUP_CONTENT_TTL = 30  # seconds a payload without a bar time is remembered
+DEDUP_JOURNAL = os.environ.get('WEBHOOK_DEDUP_JOURNAL', '1') != '0'
+signal_dedup = None
+
+# Every accepted signal and its per-account progress is journaled to disk. On start,
+# interrupted signals that never reached an order step are replayed if this recent;
+# the rest are marked interrupted for review via /signals?status=interrupted.
+SIGNAL_REPLAY_MAX_AGE = 60  # seconds
+signal_journal = None
 
 def initialize_controller():
     """Initialize or reinitialize the TradovateController"""
@@ -65,6 +95,8 @@ def initialize_controller():
     try:
         logger.info("Initializing TradovateController...")
         controller = TradovateController()
+        # Tab indices may have changed; relearn where each account lives
+        get_strategy_router().reset_locations()
         if len(controller.connections) == 0:
             logger.warning("No Tradovate connections found. Make sure auto_login.py is running.")
             return False
@@ -75,6 +107,97 @@ def initialize_controller():
         logger.debug(traceback.format_exc())
         return False
 
+def get_signal_queue():
+    """Get the signal queue, starting its workers on first use"""
+    global signal_queue
+    with signal_queue_lock:
+        if signal_queue is None:
+            signal_queue = SignalQueue(process_trading_signal, max_size=SIGNAL_QUEUE_SIZE, workers=SIGNAL_WORKERS,
+                                       on_finish=record_signal_outcome, pass_signal_id=True,
+                                       express_workers=SIGNAL_EXPRESS_WORKERS)
+            signal_queue.start()
+            logger.info(f"Signal queue started with {SIGNAL_WORKERS} workers + {SIGNAL_EXPRESS_WORKERS} for Close signals "
+                        f"(capacity {SIGNAL_QUEUE_SIZE} per lane)")
+            recover_signals(signal_queue)
+        return signal_queue
+
+def get_signal_journal():
+    """Get the signal journal, reading the existing journal file on first use"""
+    global signal_journal
+    with signal_queue_lock:
+        if signal_journal is None:
+            signal_journal = SignalJournal(project_root / 'data' / 'webhook' / 'signal_journal.jsonl')
+        return signal_journal
+
+def journal_account(signal_id, account_index, state, account=None, detail=None):
+    """Record a signal's progress on one tab; signals without an ID are not journaled"""
+    if signal_id is None:
+        return
+    try:
+        get_signal_journal().account_state(signal_id, account_index, state, account, detail)
+    except Exception as e:
+        logger.error(f"Error journaling signal {signal_id} on account index {account_index}: {e}")
+
+def recover_signals(queue):
+    """
+    Deal with signals the previous run accepted but never finished.
+
+    A signal is replayed only if it is recent and no account got past switching, so no
+    order can have been sent for it. Anything else is marked interrupted and logged,
+    since replaying it could double a fill.
+    """
+    journal = get_signal_journal()
+    now = datetime.datetime.now()
+    for record in journal.incomplete():
+        signal_id = record['id']
+        age = (now - datetime.datetime.fromisoformat(record['received_at'])).total_seconds()
+        states = {index: a['state'] for index, a in record['accounts'].items()}
+        if age <= SIGNAL_REPLAY_MAX_AGE and all(state in PRE_ORDER_STATES for state in states.values()):
+            try:
+                queue.submit(record['signal'], signal_id=signal_id)
+                logger.warning(f"Replaying signal {signal_id} interrupted {age:.0f}s ago before any order was sent")
+                continue
+            except QueueFullError as e:
+                logger.error(f"Could not replay signal {signal_id}: {e}")
+        journal.finished(signal_id, 'interrupted', {
+            "status": "error",
+            "message": "Server stopped while the signal was executing; check these accounts",
+            "accounts": states
+        })
+        logger.warning(f"⚠️ Signal {signal_id} was interrupted by a restart ({age:.0f}s ago), account states: {states}")
+
+def get_signal_dedup():
+    """Get the signal de-duplicator, restoring recent keys from its journal on first use"""
+    global signal_dedup
+    with signal_queue_lock:
+        if signal_dedup is None:
+            journal = project_root / 'data' / 'webhook' / 'signal_dedup.jsonl' if DEDUP_JOURNAL else None
+            signal_dedup = SignalDeduplicator(ttl=DEDUP_TTL, content_ttl=DEDUP_CONTENT_TTL, journal_path=journal)
+        return signal_dedup
+
+def record_signal_outcome(record):
+    """Store a queued signal's outcome so retries of it are answered with the result"""
+    get_signal_dedup().complete_signal(record['id'], record['result'], record['status'])
+    get_signal_journal().finished(record['id'], record['status'], record['result'] if record['result'] is not None
+                                  else {"status": "error", "message": record['error']})
+
+def duplicate_response(entry):
+    """Answer a retried signal from the first delivery instead of executing it again"""
+    body = {
+        "status": "duplicate",
+        "message": "Signal already received; not executed again",
+        "original_status": entry['status'],
+        "result": entry['result']
+    }
+    if entry['signal_id']:
+        body["signal_id"] = entry['signal_id']
+        body["status_url"] = f"/signals/{entry['signal_id']}"
+        record = signal_queue.get(entry['signal_id']) if signal_queue else None
+        if record:
+            body["original_status"] = record['status']
+            body["result"] = record['result']
+    return jsonify(body), 200
+
 def start_ngrok(port: int) -> str | None:
     """
     Launch ngrok using a fixed domain: stonkz92224.ngrok.app
@@ -153,35 +276,23 @@ def restart_ngrok():
             return False
 
 def check_chrome_connections():
-    """Check if Chrome connections are still active and reconnect if needed"""
+    """Check Chrome connections and repair the broken ones in place"""
     global controller
     
     with reconnect_lock:
         if not controller or len(controller.connections) == 0:
             logger.warning("No active Chrome connections, attempting to reinitialize controller...")
             return initialize_controller()
-            
-        # Check each connection
-        reconnection_needed = False
-        for conn in controller.connections:
-            try:
-                if not conn.tab:
-                    logger.warning(f"Tab not available for {conn.account_name}, reconnection needed")
-                    reconnection_needed = True
-                    continue
-                    
-                # Test the connection by evaluating a simple expression
-                conn.tab.Runtime.evaluate(expression="1+1")
-            except Exception as e:
-                logger.warning(f"Connection test failed for {conn.account_name}: {e}")
-                reconnection_needed = True
-                
-        if reconnection_needed:
-            logger.info("Reinitializing all Chrome connections...")
-            return initialize_controller()
-        
+    
+    # Per-connection health: only a broken port is reconnected, the other accounts keep trading
+    health = controller.check_health()
+    unhealthy = [h for h in health if h["state"] != "healthy"]
+    for h in unhealthy:
+        logger.warning(f"{h['account']} on port {h['port']} is {h['state']}: {h['last_error']}")
+    
+    if not unhealthy:
         logger.debug("All Chrome connections are active")
-        return True
+    return not unhealthy
 
 def is_ngrok_tunnel_active():
     """Check if the ngrok tunnel is still active"""
@@ -246,46 +357,28 @@ def watchdog_routine():
 
 def get_target_accounts_for_strategy(strategy_name):
     """Get account indices and account names mapped to a specific strategy"""
+    tab_count = 0
     try:
-        # Use get_project_root from utils.core
-        project_root = get_project_root()
-        strategy_file = project_root / 'config' / 'strategy_mappings.json'
-        if not strategy_file.exists():
-            logger.warning(f"Strategy mappings file not found. Using all accounts.")
-            return list(range(len(controller.connections))), []
-            
-        # Use load_json_config from utils.core
-        mappings = load_json_config(str(strategy_file))
-            
-        # Get the exact account names from strategy_mappings.json
-        strategy_accounts = mappings.get("strategy_mappings", {}).get(strategy_name, [])
-        logger.info(f"Found strategy accounts for {strategy_name}: {strategy_accounts}")
-        
-        # If no mappings for this strategy, try DEFAULT strategy
-        if not strategy_accounts and strategy_name != "DEFAULT":
-            logger.info(f"No accounts mapped for strategy {strategy_name}, using DEFAULT")
-            strategy_accounts = mappings.get("strategy_mappings", {}).get("DEFAULT", [])
-            logger.info(f"DEFAULT strategy accounts: {strategy_accounts}")
+        # No tabs until the controller is initialized; the caller reinitializes and asks again
+        tab_count = len(controller.connections) if controller else 0
+        # In-memory lookup; strategy_mappings.json is re-read only after it changes
+        account_indices, strategy_accounts = get_strategy_router().route(strategy_name, tab_count)
         
-        # If still no accounts, use all accounts
         if not strategy_accounts:
-            logger.info(f"No DEFAULT mapping or empty, using all accounts")
-            return list(range(len(controller.connections))), []
-        
-        # Include all connections but provide the target account names from strategy_mappings.json
-        # This way we'll try to execute on all tabs but switch to the correct accounts before executing
-        account_indices = list(range(len(controller.connections)))
-        
-        logger.info(f"Using all {len(account_indices)} connections but will switch to accounts: {strategy_accounts}")
+            logger.info(f"No accounts mapped for strategy {strategy_name} and no DEFAULT mapping, using all accounts")
+        elif len(account_indices) < tab_count:
+            logger.info(f"Strategy {strategy_name} accounts {strategy_accounts} are on connections {account_indices}")
+        else:
+            # Where the accounts live isn't known yet: try every tab and switch to the strategy accounts there
+            logger.info(f"Using all {len(account_indices)} connections but will switch to accounts: {strategy_accounts}")
         
-        # Return all indices but with the specific account names to switch to
         return account_indices, strategy_accounts
             
     except Exception as e:
         logger.error(f"Error loading strategy mappings: {e}")
         logger.debug(traceback.format_exc())
         # Fallback to all accounts
-        return list(range(len(controller.connections))), []
+        return list(range(tab_count)), []
 
 def update_ui_symbol(account_index, symbol):
     """
@@ -299,26 +392,7 @@ def update_ui_symbol(account_index, symbol):
         controller.execute_on_one(account_index, 'update_symbol', symbol)
         
         # Then update the symbolInput element in the Bracket UI
-        update_ui_script = f"""
-        (function() {{
-            // Update the symbolInput in the Bracket UI
-            const symbolInput = document.getElementById('symbolInput');
-            if (symbolInput) {{
-                symbolInput.value = "{symbol}";
-                // Dispatch events to ensure value change is registered
-                symbolInput.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                symbolInput.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                console.log("Updated UI symbol to {symbol}");
-                
-                // Also store in localStorage for persistence
-                localStorage.setItem('bracketTrade_symbol', "{symbol}");
-                return "Symbol updated in UI";
-            }} else {{
-                return "symbolInput element not found";
-            }}
-        }})();
-        """
-        ui_result = controller.connections[account_index].tab.Runtime.evaluate(expression=update_ui_script)
+        ui_result = controller.connections[account_index].call_op('setBracketSymbol', {"symbol": symbol})
         result_value = ui_result.get('result', {}).get('value', 'Unknown')
         logger.info(f"UI symbol update on account {account_index}: {result_value}")
         return {"status": "success", "message": result_value}
@@ -327,22 +401,271 @@ def update_ui_symbol(account_index, symbol):
         logger.debug(traceback.format_exc())
         return {"status": "error", "message": str(e)}
 
-def process_trading_signal(data):
+def load_account_switcher_script():
+    """changeAccount.user.js from the first known location (kept in memory), or None if missing"""
+    script = get_strategy_router().get_switcher_script()
+    if script is None:
+        logger.warning(f"Warning: Account switcher script not found in {[str(p) for p in get_strategy_router().switcher_paths]}")
+    return script
+
+def switch_account_for_close(conn, account_index, account_names):
+    """
+    Switch the tab to the first strategy account that changeAccount can reach.
+    Returns the account name switched to, or None if none of them worked.
+    """
+    for account_name in account_names:
+        logger.info(f"🔄 Attempting to switch to account: {account_name} on connection {account_index}")
+        
+        # Call the account switching function in the browser context and wait for it
+        switch_result = conn.call_op('switchAccount', {"account": account_name},
+                                     await_promise=True, return_by_value=True)
+        switch_response = switch_result.get('result', {}).get('value', {})
+        
+        # Parse the success status from the response
+        success = False
+        message = "Unknown result"
+        
+        if isinstance(switch_response, str):
+            # Handle string responses for backward compatibility
+            message = switch_response
+            success = "not found" not in switch_response.lower()
+        elif isinstance(switch_response, dict):
+            # Handle structured responses
+            success = switch_response.get('success', False)
+            message = switch_response.get('message', "Unknown result")
+        
+        logger.info(f"Account switch result: {message} (Success: {success})")
+        
+        if success:
+            get_strategy_router().learn(account_index, [account_name])
+            # Wait for the account selector to show the new account
+            ready = conn.wait_for_account(account_name, timeout=ACCOUNT_SWITCH_TIMEOUT)
+            logger.info(f"Account {account_name} ready on connection {account_index} after {ready['waited']}s (ready: {ready['ready']})")
+            return account_name
+        logger.warning(f"Failed to switch to account {account_name}, trying next account if available")
+    
+    return None
+
+def switch_account_for_open(conn, account_index, account_names):
+    """
+    Check the account dropdown and switch the tab to the first strategy account found there.
+    Returns the account name switched to, or None if none of them worked.
+    """
+    for account_name in account_names:
+        logger.info(f"🔄 Attempting to switch to account: {account_name} on connection {account_index}")
+        
+        # Check if the account exists in the available accounts list, then start the switch
+        switch_result = conn.call_op('checkAndSwitchAccount', {"account": account_name}, return_by_value=True)
+        
+        # Log the raw response from JavaScript
+        logger.debug(f"DEBUG - Raw switch_result: {switch_result}")
+        
+        # Try to extract the value with more verbose logging
+        result_obj = switch_result.get('result', {})
+        logger.debug(f"DEBUG - Result object: {result_obj}")
+        
+        # Check if we got a Promise or an empty object reference
+        if result_obj.get('subtype') == 'promise' or (result_obj.get('type') == 'object' and 'objectId' in result_obj):
+            logger.debug(f"DEBUG - Detected non-serializable object, forcing success for {account_name}")
+            switch_response = {
+                'success': True,
+                'message': f"Object reference detected, assuming success for {account_name}",
+                'availableAccounts': [account_name]
+            }
+        else:
+            # Get the value property or empty dict if not present
+            switch_response = result_obj.get('value', {})
+            
+        logger.debug(f"DEBUG - Extracted switch_response: {switch_response}")
+        logger.debug(f"DEBUG - Response type: {type(switch_response)}")
+        
+        # Parse the success status from the response
+        success = False
+        message = "Unknown result"
+        available_accounts = []
+        
+        if isinstance(switch_response, str):
+            # Handle string responses for backward compatibility
+            message = switch_response
+            success = "already on account" in switch_response.lower() or "account exists" in switch_response.lower()
+        elif isinstance(switch_response, dict):
+            # Handle structured responses
+            success = switch_response.get('success', False)
+            message = switch_response.get('message', "Unknown result")
+            available_accounts = switch_response.get('availableAccounts', [])
+            
+            # Log the available accounts if present
+            if available_accounts:
+                logger.info(f"Available accounts in dropdown: {available_accounts}")
+                # "Account exists"/"Account not found" answers list the whole dropdown
+                get_strategy_router().learn(account_index, available_accounts,
+                                            complete=message.startswith(("Account exists", "Account not found")))
+                # If our target account is in the list, ensure success is true
+                if account_name in available_accounts:
+                    success = True
+        
+        logger.info(f"Account switch result: {message} (Success: {success})")
+        
+        if success:
+            get_strategy_router().learn(account_index, [account_name])
+            # Wait for the account selector to show the new account
+            ready = conn.wait_for_account(account_name, timeout=ACCOUNT_SWITCH_TIMEOUT)
+            logger.info(f"Account {account_name} ready on connection {account_index} after {ready['waited']}s (ready: {ready['ready']})")
+            return account_name
+        logger.warning(f"Failed to switch to account {account_name}, trying next account if available")
+    
+    return None
+
+def execute_signal_on_account(account_index, conn, trade_type, symbol, account_names,
+                              account_switcher_js=None, order_args=(), signal_id=None):
     """
-    Process incoming trading signal and execute it on specific accounts based on strategy
+    Run the full pipeline for one tab: ensure scripts -> switch account -> update symbol -> order.
+
+    The steps run in order while holding the connection lock, so two signals
+    never interleave on the same tab. Different tabs run this concurrently.
+    A Close takes the lock ahead of Open pipelines still waiting for the tab.
+    Each step is journaled under signal_id (received/switched/submitted/confirmed/failed).
+    """
+    journal_account(signal_id, account_index, 'received')
+    if not conn.tab:
+        logger.warning(f"⚠️ Tab not available for connection {account_index}, skipping")
+        journal_account(signal_id, account_index, 'failed', detail="Tab not available")
+        return {"error": "Tab not available", "account_index": account_index}
+    
+    account_name = None
+    try:
+        with conn.lock.prioritized(PRIORITY_EXIT if trade_type == "Close" else None):
+            # The script bundle carries changeAccount.user.js; this is one cheap version
+            # check unless the page lost the bundle. Fall back to injecting the switcher alone.
+            try:
+                bundle_status = conn.ensure_bundle()
+                if bundle_status == 'loaded':
+                    logger.info(f"Loaded script bundle into connection {account_index}")
+                elif bundle_status == 'error':
+                    logger.error(f"Script bundle failed in connection {account_index}: {conn.bundle_error}")
+            except Exception as e:
+                bundle_status = 'error'
+                logger.error(f"Error loading script bundle into connection {account_index}: {e}")
+            if bundle_status == 'error' and account_switcher_js:
+                try:
+                    conn.tab.Runtime.evaluate(expression=account_switcher_js)
+                    logger.info(f"Injected account switcher script into connection {account_index}")
+                except Exception as e:
+                    logger.error(f"Error injecting account switcher into connection {account_index}: {e}")
+            
+            # Try each of the target account names in this browser tab, the ones seen here first
+            account_names = get_strategy_router().order_for_tab(account_index, account_names)
+            if trade_type == "Close":
+                account_name = switch_account_for_close(conn, account_index, account_names)
+            else:
+                account_name = switch_account_for_open(conn, account_index, account_names)
+            
+            # Only proceed with the order if account switching was successful
+            if account_name is None:
+                step = "position closing" if trade_type == "Close" else "trade execution"
+                logger.warning(f"⚠️ Failed to switch to any account for connection {account_index}, skipping {step}")
+                journal_account(signal_id, account_index, 'failed', detail="Failed to switch to any account")
+                return {
+                    "error": "Failed to switch to any account",
+                    "account_index": account_index,
+                    "account_names_tried": account_names,
+                    "account_switch_success": False
+                }
+            
+            journal_account(signal_id, account_index, 'switched', account_name)
+            
+            # First, update the symbol and wait for UI to adjust
+            logger.info(f"Updating symbol to {symbol} on account index {account_index}")
+            symbol_update_result = update_ui_symbol(account_index, symbol)
+            logger.info(f"Symbol update result: {symbol_update_result}")
+            
+            # Wait for the trading ticket to show the new contract before ordering
+            logger.info(f"Waiting for symbol to update and market data to load...")
+            ready = conn.wait_for_symbol(symbol, timeout=SYMBOL_UPDATE_TIMEOUT)
+            if ready['ready']:
+                logger.info(f"Symbol {symbol} ready on account index {account_index} after {ready['waited']}s")
+            else:
+                logger.warning(f"Symbol {symbol} not confirmed on account index {account_index} after {ready['waited']}s, continuing")
+            
+            journal_account(signal_id, account_index, 'submitted', account_name)
+            if trade_type == "Close":
+                # Use exit_positions with the Exit-at-Mkt-Cxl option for Close trade type
+                logger.info(f"Closing positions on account index {account_index}")
+                result = controller.execute_on_one(account_index, 'exit_positions', symbol, 'cancel-option-Exit-at-Mkt-Cxl')
+            else:
+                # Now execute the trade on this account
+                logger.info(f"Executing trade on account index {account_index}")
+                result = controller.execute_on_one(account_index, 'auto_trade', symbol, *order_args)
+        
+        # execute_on_one wraps the order's outcome as {"account", "port", "result"}; an invalid
+        # index comes back as a bare {"error": ...}
+        order_result = result.get("result", result) if isinstance(result, dict) else result
+        if isinstance(order_result, dict) and (order_result.get("error") or order_result.get("exceptionDetails")):
+            journal_account(signal_id, account_index, 'failed', account_name, order_result)
+        else:
+            journal_account(signal_id, account_index, 'confirmed', account_name, order_result)
+        
+        # Add account info to the result
+        result_with_account = result.copy() if isinstance(result, dict) else {"result": result}
+        result_with_account["account_id"] = account_name  # Use the successful account name
+        result_with_account["account_index"] = account_index
+        result_with_account["account_switch_success"] = True
+        return result_with_account
+    
+    except Exception as e:
+        action = "closing positions" if trade_type == "Close" else "executing trade"
+        logger.error(f"⚠️ Error {action} on connection {account_index}: {e}")
+        logger.debug(traceback.format_exc())
+        journal_account(signal_id, account_index, 'failed', account_name, str(e))
+        return {
+            "error": str(e),
+            "account_index": account_index,
+            "account_names_tried": account_names
+        }
+
+def execute_signal_on_accounts(target_account_indices, trade_type, symbol, account_names, order_args=(),
+                               signal_id=None):
+    """
+    Drive every target tab through its signal pipeline at the same time.
+    Results come back in the order of target_account_indices.
+    """
+    # Only used if a tab cannot take the script bundle
+    account_switcher_js = load_account_switcher_script()
+    
+    def run(account_index, conn):
+        return execute_signal_on_account(
+            account_index, conn, trade_type, symbol, account_names,
+            account_switcher_js=account_switcher_js, order_args=order_args, signal_id=signal_id
+        )
+    
+    started = time.monotonic()
+    outcomes = controller.execute_concurrently(target_account_indices, run)
+    logger.info(f"{trade_type} signal pipeline finished on {len(outcomes)} accounts in {time.monotonic() - started:.2f}s")
+    
+    results = []
+    for account_index, outcome in zip(target_account_indices, outcomes):
+        result = outcome["result"]
+        if isinstance(result, dict) and "account_index" not in result:
+            # Timed out or invalid index - the pipeline never produced its own result
+            result = dict(result, account_index=account_index)
+        results.append(result)
+    return results
+
+def process_trading_signal(data, signal_id=None):
+    """
+    Process incoming trading signal and execute it on specific accounts based on strategy.
+    Progress on each account is journaled under signal_id when one is given.
     """
     logger.info(f"Processing trade signal: {json.dumps(data, indent=2)}")
     
     # Extract the data from the webhook payload
     symbol = data.get("symbol", "")
     
-    # Clean the symbol by removing numeric suffixes and exclamation points (e.g., "NQ1!" -> "NQ")
+    # Clean the symbol: continuous contracts become their root (e.g., "NQ1!" -> "NQ"),
+    # explicit contracts (e.g., "NQZ5") are kept
     if symbol:
         original_symbol = symbol
-        # First remove any trailing exclamation point
-        symbol = symbol.replace('!', '')
-        # Then remove any numeric suffixes (like NQ1, ES2, etc.)
-        symbol = re.sub(r'(\D+)\d+$', r'\1', symbol)
+        symbol = get_instrument_registry().trading_symbol(symbol)
         if original_symbol != symbol:
             logger.info(f"Symbol cleaning: Transformed '{original_symbol}' -> '{symbol}'")
     
@@ -361,46 +684,17 @@ def process_trading_signal(data):
     logger.info(f"Target accounts for strategy {strategy}: {target_account_indices}")
     logger.info(f"Account names for strategy {strategy}: {account_names}")
     
-    # Check if controller has connections
+    # Check if controller has connections (several workers may get here at once)
     if not controller or len(controller.connections) == 0:
-        logger.warning("No active Chrome connections. Attempting to reinitialize...")
-        if not initialize_controller():
-            logger.error("Failed to initialize controller. Cannot process trading signal.")
-            return {"status": "error", "message": "No Tradovate connections available"}
+        with reconnect_lock:
+            if not controller or len(controller.connections) == 0:
+                logger.warning("No active Chrome connections. Attempting to reinitialize...")
+                if not initialize_controller():
+                    logger.error("Failed to initialize controller. Cannot process trading signal.")
+                    return {"status": "error", "message": "No Tradovate connections available"}
         # Update target accounts after reinitialization
         target_account_indices, account_names = get_target_accounts_for_strategy(strategy)
     
-    # Inject the changeAccount.user.js script into each matching browser tab
-    # to enable account switching functionality
-    logger.info("Injecting account switching functionality...")
-    # Use get_project_root from utils.core
-    project_root = get_project_root()
-    
-    # Try multiple possible locations for the account switcher script
-    possible_paths = [
-        project_root / 'src' / 'tampermonkey' / 'changeAccount.user.js',
-        project_root / 'scripts' / 'tampermonkey' / 'changeAccount.user.js'
-    ]
-    
-    account_switcher_path = None
-    for path in possible_paths:
-        if path.exists():
-            account_switcher_path = path
-            break
-    
-    if account_switcher_path:
-        with open(account_switcher_path, 'r') as file:
-            account_switcher_js = file.read()
-            for i in target_account_indices:
-                try:
-                    if i < len(controller.connections) and controller.connections[i].tab:
-                        controller.connections[i].tab.Runtime.evaluate(expression=account_switcher_js)
-                        logger.info(f"Injected account switcher script into connection {i}")
-                except Exception as e:
-                    logger.error(f"Error injecting account switcher into connection {i}: {e}")
-    else:
-        logger.warning(f"Warning: Account switcher script not found at {account_switcher_path}")
-    
     # If this is a Close signal, use closeAll
     if trade_type == "Close":
         logger.info(f"🔴 Closing all positions for {symbol}")
@@ -408,110 +702,9 @@ def process_trading_signal(data):
         # We'll update the symbol for each account individually just before closing positions
         logger.info(f"🔄 Will update symbol to {symbol} before closing positions for each account")
         
-        results = []
-        # Execute on each targeted account
-        for i, account_index in enumerate(target_account_indices):
-            if account_index < len(controller.connections):
-                conn = controller.connections[account_index]
-                if not conn.tab:
-                    logger.warning(f"⚠️ Tab not available for connection {account_index}, skipping")
-                    results.append({"error": "Tab not available"})
-                    continue
-                    
-                try:
-                    # Try each of the target account names in this browser tab
-                    account_switch_success = False
-                    
-                    for account_name in account_names:
-                        logger.info(f"🔄 Attempting to switch to account: {account_name} on connection {account_index}")
-                        
-                        # Call the account switching function in the browser context
-                        switch_script = f"""
-                        (async function() {{
-                            try {{
-                                // First check which function is available
-                                if (typeof changeAccount === 'function') {{
-                                    console.log("Using changeAccount function to switch to {account_name}");
-                                    const result = await changeAccount('{account_name}');
-                                    return {{ success: !result.includes("not found"), message: result }};
-                                }} else if (typeof clickAccountItemByName === 'function') {{
-                                    console.log("Using clickAccountItemByName function to switch to {account_name}");
-                                    const result = clickAccountItemByName('{account_name}');
-                                    return {{ success: result, message: "Called clickAccountItemByName for account {account_name}" }};
-                                }} else {{
-                                    return {{ success: false, message: "No account switching function available" }};
-                                }}
-                            }} catch (error) {{
-                                console.error("Error switching account:", error);
-                                return {{ success: false, message: "Error switching account: " + error.toString() }};
-                            }}
-                        }})();
-                        """
-                        
-                        switch_result = conn.tab.Runtime.evaluate(expression=switch_script)
-                        switch_response = switch_result.get('result', {}).get('value', {})
-                        
-                        # Parse the success status from the response
-                        success = False
-                        message = "Unknown result"
-                        
-                        if isinstance(switch_response, str):
-                            # Handle string responses for backward compatibility
-                            message = switch_response
-                            success = "not found" not in switch_response.lower()
-                        elif isinstance(switch_response, dict):
-                            # Handle structured responses
-                            success = switch_response.get('success', False)
-                            message = switch_response.get('message', "Unknown result")
-                        
-                        logger.info(f"Account switch result: {message} (Success: {success})")
-                        
-                        if success:
-                            account_switch_success = True
-                            # Give the UI time to update after successful account switch
-                            time.sleep(0.5)
-                            break  # Exit the loop if we successfully switched to this account
-                        else:
-                            logger.warning(f"Failed to switch to account {account_name}, trying next account if available")
-                    
-                    # Only proceed with position closing if account switching was successful
-                    if account_switch_success:
-                        # First, update the symbol and wait for UI to adjust
-                        logger.info(f"Updating symbol to {symbol} on account index {account_index}")
-                        symbol_update_result = update_ui_symbol(account_index, symbol)
-                        logger.info(f"Symbol update result: {symbol_update_result}")
-                        
-                        # Add a longer delay after updating symbol to let the UI fully adjust
-                        logger.info(f"Waiting for symbol to update and market data to load...")
-                        time.sleep(2.0)  # Increased delay for UI to update
-                        
-                        # Use exit_positions with the Exit-at-Mkt-Cxl option for Close trade type
-                        logger.info(f"Closing positions on account index {account_index}")
-                        result = controller.execute_on_one(account_index, 'exit_positions', symbol, 'cancel-option-Exit-at-Mkt-Cxl')
-                        
-                        # Add account info to the result
-                        result_with_account = result.copy() if isinstance(result, dict) else {"result": result}
-                        result_with_account["account_id"] = account_name  # Use the successful account name
-                        result_with_account["account_index"] = account_index
-                        result_with_account["account_switch_success"] = True
-                        results.append(result_with_account)
-                    else:
-                        logger.warning(f"⚠️ Failed to switch to any account for connection {account_index}, skipping position closing")
-                        results.append({
-                            "error": "Failed to switch to any account",
-                            "account_index": account_index,
-                            "account_names_tried": account_names,
-                            "account_switch_success": False
-                        })
-                    
-                except Exception as e:
-                    logger.error(f"⚠️ Error closing positions on connection {account_index}: {e}")
-                    logger.debug(traceback.format_exc())
-                    results.append({
-                        "error": str(e),
-                        "account_index": account_index,
-                        "account_names_tried": account_names
-                    })
+        # Execute on all targeted accounts in parallel
+        results = execute_signal_on_accounts(target_account_indices, "Close", symbol, account_names,
+                                             signal_id=signal_id)
         
         logger.info(f"Close all positions results: {results}")
         return {
@@ -524,21 +717,8 @@ def process_trading_signal(data):
     
     # Otherwise, it's an open signal - calculate TP and SL in ticks
     # Get the tick size from the first connection (assuming consistent across all)
-    # Process symbol for lookup in futuresTickData
-    # Remove USD suffix if present and ensure any other suffixes are removed
-    lookup_symbol = symbol.replace('USD', '')
-    # Double-check that we have a clean base symbol (no suffixes)
-    lookup_symbol = re.sub(r'(\D+)\d+$', r'\1', lookup_symbol)
-    tick_size = 0.25  # Default tick size
-    
-    try:
-        if controller.connections:
-            js_code = f"futuresTickData['{lookup_symbol}']?.tickSize || 0.25;"
-            tick_size_result = controller.connections[0].tab.Runtime.evaluate(expression=js_code)
-            if tick_size_result and 'result' in tick_size_result and 'value' in tick_size_result['result']:
-                tick_size = float(tick_size_result['result']['value'])
-    except Exception as e:
-        logger.error(f"Error getting tick size: {e}")
+    # Tick size from the local instrument registry (config symbol_defaults)
+    tick_size = get_instrument_registry().tick_size(symbol)
     
     # Calculate TP ticks if TP price is provided
     tp_ticks = 100  # Default TP ticks
@@ -557,214 +737,12 @@ def process_trading_signal(data):
     # Execute the trade on targeted Tradovate instances
     logger.info(f"🟢 Executing {action} order for {order_qty} {symbol} with TP: {tp_ticks} ticks, SL: {sl_ticks} ticks")
     
-    results = []
-    # Execute on each targeted account
-    for account_index in target_account_indices:
-        if account_index < len(controller.connections):
-            conn = controller.connections[account_index]
-            if not conn.tab:
-                logger.warning(f"⚠️ Tab not available for connection {account_index}, skipping")
-                results.append({"error": "Tab not available"})
-                continue
-                
-            try:
-                # Try each of the target account names in this browser tab
-                account_switch_success = False
-                
-                for account_name in account_names:
-                    logger.info(f"🔄 Attempting to switch to account: {account_name} on connection {account_index}")
-                    
-                    # Check if the account exists in the available accounts list
-                    # This is a more reliable approach that avoids Promise handling issues
-                    switch_script = f"""
-                    (function() {{
-                        // Add console.debug for all return values to verify they're properly formatted
-                        function debugReturn(result) {{
-                            console.debug("Returning to Python:", JSON.stringify(result));
-                            return result;
-                        }}
-                        
-                        try {{
-                            // First check if the account exists in the dropdown
-                            // Do this by clicking the dropdown and checking the account items
-                            const accountSelector = document.querySelector('.pane.account-selector.dropdown [data-toggle="dropdown"]');
-                            if (!accountSelector) {{
-                                return debugReturn({{ 
-                                    success: false, 
-                                    message: "Account selector not found" 
-                                }});
-                            }}
-                            
-                            // Check if we're already on the account
-                            const currentAccountElement = accountSelector.querySelector('.name div');
-                            if (currentAccountElement) {{
-                                const currentAccount = currentAccountElement.textContent.trim();
-                                console.log(`Current account is: "${{currentAccount}}"`);
-                                
-                                if (currentAccount === "{account_name}") {{
-                                    console.log(`Already on the exact account: ${{currentAccount}}`);
-                                    return debugReturn({{ 
-                                        success: true, 
-                                        message: `Already on account: ${{currentAccount}}`,
-                                        availableAccounts: [currentAccount]
-                                    }});
-                                }}
-                            }}
-                            
-                            // Click to open the dropdown
-                            accountSelector.click();
-                            
-                            // Get all available accounts
-                            const availableAccounts = [];
-                            const accountItems = document.querySelectorAll('.dropdown-menu li a.account');
-                            accountItems.forEach(item => {{
-                                const mainDiv = item.querySelector('.name .main');
-                                if (mainDiv) {{
-                                    availableAccounts.push(mainDiv.textContent.trim());
-                                }} else {{
-                                    availableAccounts.push(item.textContent.trim());
-                                }}
-                            }});
-                            
-                            console.log(`Available accounts: ${{JSON.stringify(availableAccounts)}}`);
-                            
-                            // Check if the target account is in the list
-                            const accountExists = availableAccounts.includes("{account_name}");
-                            
-                            // Close the dropdown by clicking elsewhere
-                            document.body.click();
-                            
-                            if (accountExists) {{
-                                console.log(`Account {account_name} exists in available accounts. Proceeding with switch.`);
-                                
-                                // Don't wait for the Promise, just initiate the switch
-                                if (typeof changeAccount === 'function') {{
-                                    changeAccount('{account_name}');
-                                }} else if (typeof clickAccountItemByName === 'function') {{
-                                    clickAccountItemByName('{account_name}');
-                                }}
-                                
-                                return debugReturn({{ 
-                                    success: true, 
-                                    message: `Account exists and switch initiated: {account_name}`,
-                                    availableAccounts: availableAccounts
-                                }});
-                            }} else {{
-                                console.error(`Account {account_name} not found in available accounts.`);
-                                return debugReturn({{ 
-                                    success: false, 
-                                    message: `Account not found: {account_name}`,
-                                    availableAccounts: availableAccounts
-                                }});
-                            }}
-                        }} catch (error) {{
-                            console.error("Error checking/switching account:", error);
-                            return debugReturn({{ 
-                                success: false, 
-                                message: `Error: ${{error.toString()}}` 
-                            }});
-                        }}
-                    }})();
-                    """
-                    
-                    switch_result = conn.tab.Runtime.evaluate(expression=switch_script)
-                    
-                    # Log the raw response from JavaScript
-                    logger.debug(f"DEBUG - Raw switch_result: {switch_result}")
-                    
-                    # Try to extract the value with more verbose logging
-                    result_obj = switch_result.get('result', {})
-                    logger.debug(f"DEBUG - Result object: {result_obj}")
-                    
-                    # Check if we got a Promise or an empty object reference
-                    if result_obj.get('subtype') == 'promise' or (result_obj.get('type') == 'object' and 'objectId' in result_obj):
-                        logger.debug(f"DEBUG - Detected non-serializable object, forcing success for {account_name}")
-                        switch_response = {
-                            'success': True,
-                            'message': f"Object reference detected, assuming success for {account_name}",
-                            'availableAccounts': [account_name]
-                        }
-                    else:
-                        # Get the value property or empty dict if not present
-                        switch_response = result_obj.get('value', {})
-                        
-                    logger.debug(f"DEBUG - Extracted switch_response: {switch_response}")
-                    logger.debug(f"DEBUG - Response type: {type(switch_response)}")
-                    
-                    # Parse the success status from the response
-                    success = False
-                    message = "Unknown result"
-                    available_accounts = []
-                    
-                    if isinstance(switch_response, str):
-                        # Handle string responses for backward compatibility
-                        message = switch_response
-                        success = "already on account" in switch_response.lower() or "account exists" in switch_response.lower()
-                    elif isinstance(switch_response, dict):
-                        # Handle structured responses
-                        success = switch_response.get('success', False)
-                        message = switch_response.get('message', "Unknown result")
-                        available_accounts = switch_response.get('availableAccounts', [])
-                        
-                        # Log the available accounts if present
-                        if available_accounts:
-                            logger.info(f"Available accounts in dropdown: {available_accounts}")
-                            # If our target account is in the list, ensure success is true
-                            if account_name in available_accounts:
-                                success = True
-                    
-                    logger.info(f"Account switch result: {message} (Success: {success})")
-                    
-                    if success:
-                        account_switch_success = True
-                        # Give the UI time to update after successful account switch
-                        time.sleep(0.5)
-                        break  # Exit the loop if we successfully switched to this account
-                    else:
-                        logger.warning(f"Failed to switch to account {account_name}, trying next account if available")
-                
-                # Only proceed with trade execution if account switching was successful
-                if account_switch_success:
-                    # First, update the symbol and wait for UI to adjust
-                    logger.info(f"Updating symbol to {symbol} on account index {account_index}")
-                    symbol_update_result = update_ui_symbol(account_index, symbol)
-                    logger.info(f"Symbol update result: {symbol_update_result}")
-                    
-                    # Add a longer delay after updating symbol to let the UI fully adjust
-                    logger.info(f"Waiting for symbol to update and market data to load...")
-                    time.sleep(2.0)  # Increased delay for UI to update
-                    
-                    # Now execute the trade on this account
-                    logger.info(f"Executing trade on account index {account_index}")
-                    result = controller.execute_on_one(
-                        account_index, 'auto_trade', 
-                        symbol, order_qty, action, 
-                        tp_ticks, sl_ticks, tick_size
-                    )
-                    
-                    # Add account info to the result
-                    result_with_account = result.copy() if isinstance(result, dict) else {"result": result}
-                    result_with_account["account_id"] = account_name  # Use the correct account name
-                    result_with_account["account_index"] = account_index
-                    result_with_account["account_switch_success"] = True
-                    results.append(result_with_account)
-                else:
-                    logger.warning(f"⚠️ Failed to switch to any account for connection {account_index}, skipping trade execution")
-                    results.append({
-                        "error": "Failed to switch to any account",
-                        "account_index": account_index,
-                        "account_names_tried": account_names,
-                        "account_switch_success": False
-                    })
-                
-            except Exception as e:
-                logger.error(f"⚠️ Error executing trade on connection {account_index}: {e}")
-                logger.debug(traceback.format_exc())
-                results.append({
-                    "error": str(e),
-                    "account_index": account_index,
-                    "account_names_tried": account_names
-                })
+    # Execute on all targeted accounts in parallel
+    results = execute_signal_on_accounts(
+        target_account_indices, "Open", symbol, account_names,
+        order_args=(order_qty, action, tp_ticks, sl_ticks, tick_size),
+        signal_id=signal_id
+    )
     
     return {
         "status": "executed", 
@@ -807,16 +785,56 @@ def health_check():
         "ngrok_process_running": ngrok_process is not None and ngrok_process.poll() is None,
     }
     
-    # Check Chrome connections (lightweight check)
+    # Check Chrome connections (lightweight check, states come from the watchdog probes)
     if controller and controller.connections:
-        live_connections = 0
-        for conn in controller.connections:
-            if conn.tab:
-                live_connections += 1
-        status["live_connections"] = live_connections
+        status["live_connections"] = sum(1 for conn in controller.connections if conn.is_available())
+        status["connection_health"] = [conn.get_health() for conn in controller.connections]
+    
+    if signal_queue:
+        status["signal_queue"] = signal_queue.get_stats()
+    if signal_dedup:
+        status["dedup"] = signal_dedup.get_stats()
+    if signal_journal:
+        status["signal_journal"] = signal_journal.get_stats()
+    status["routing"] = get_strategy_router().get_status()
     
     return jsonify(status)
 
+@app.route('/signals', methods=['GET'])
+def list_signals():
+    """
+    Query the signal journal, newest first.
+
+    Query parameters: limit (default 50), status (running/completed/failed/interrupted/rejected),
+    strategy, symbol, since (ISO timestamp)
+    """
+    try:
+        limit = int(request.args.get('limit', 50))
+    except ValueError:
+        return jsonify({"status": "error", "message": "limit must be an integer"}), 400
+    signals = get_signal_journal().query(
+        limit=limit,
+        status=request.args.get('status'),
+        strategy=request.args.get('strategy'),
+        symbol=request.args.get('symbol'),
+        since=request.args.get('since')
+    )
+    return jsonify({"count": len(signals), "signals": signals}), 200
+
+@app.route('/signals/<signal_id>', methods=['GET'])
+def signal_status(signal_id):
+    """Report the state and outcome of a signal, with its per-account progress from the journal"""
+    record = get_signal_queue().get(signal_id)
+    journaled = get_signal_journal().get(signal_id)
+    if record is None and journaled is None:
+        return jsonify({"status": "error", "message": f"Unknown signal ID: {signal_id}"}), 404
+    if record is None:
+        # Finished before the last restart, or executed synchronously
+        return jsonify(journaled), 200
+    if journaled:
+        record["accounts"] = journaled["accounts"]
+    return jsonify(record), 200
+
 @app.route('/webhook', methods=['GET', 'POST'])
 def webhook():
     global last_request_time
@@ -901,6 +919,38 @@ def webhook():
             strategy = data.get("strategy", "DEFAULT")
             logger.info(f"\n🎯 Strategy specified in webhook: '{strategy}'")
             
+            # A retry of a signal already received is answered without executing it again
+            dedup = get_signal_dedup()
+            dedup_key, dedup_ttl = dedup.key_for(
+                data, request.headers.get('Idempotency-Key') or request.headers.get('X-Idempotency-Key'))
+            duplicate = dedup.claim(dedup_key, dedup_ttl)
+            if duplicate:
+                logger.info(f"\n♻️ Duplicate signal {dedup_key} (retry #{duplicate['duplicates']}), not executing again")
+                logger.info("=============================================\n")
+                return duplicate_response(duplicate)
+            
+            # Queue the signal and answer immediately; the worker pool executes it
+            if ASYNC_INTAKE and request.args.get('sync') != '1':
+                signal_id = SignalQueue.new_id()
+                dedup.attach(dedup_key, signal_id)
+                get_signal_journal().received(signal_id, data)
+                try:
+                    get_signal_queue().submit(data, signal_id=signal_id)
+                except QueueFullError as e:
+                    dedup.release(dedup_key)
+                    get_signal_journal().finished(signal_id, 'rejected', {"status": "error", "message": str(e)})
+                    logger.error(f"Rejecting signal: {e}")
+                    logger.info("=============================================\n")
+                    return jsonify({"status": "error", "message": str(e)}), 503
+                
+                logger.info(f"\n📬 Signal {signal_id} queued for execution")
+                logger.info("=============================================\n")
+                return jsonify({
+                    "status": "accepted",
+                    "signal_id": signal_id,
+                    "status_url": f"/signals/{signal_id}"
+                }), 202
+            
             # Check if controller is initialized and has connections
             if not controller or len(controller.connections) == 0:
                 logger.warning("No active controller or connections. Attempting to initialize...")
@@ -909,11 +959,24 @@ def webhook():
             # Process and execute the trading signal
             if controller and controller.connections:
                 logger.info(f"Found {len(controller.connections)} active Tradovate connections")
-                result = process_trading_signal(data)
+                signal_id = SignalQueue.new_id()
+                get_signal_journal().received(signal_id, data, source='webhook-sync')
+                try:
+                    result = process_trading_signal(data, signal_id)
+                except Exception as e:
+                    # Some accounts may have filled already; retries must not run it again
+                    dedup.complete(dedup_key, {"status": "error", "message": str(e)}, 'failed')
+                    get_signal_journal().finished(signal_id, 'failed', {"status": "error", "message": str(e)})
+                    raise
+                status = 'failed' if result.get('status') == 'error' else 'completed'
+                dedup.complete(dedup_key, result, status)
+                get_signal_journal().finished(signal_id, status, result)
+                result = dict(result, signal_id=signal_id)
                 logger.info("\n✅ Webhook processed successfully")
                 logger.info("=============================================\n")
                 return jsonify(result), 200
             else:
+                dedup.release(dedup_key)
                 error_msg = "No Tradovate connections available. Make sure auto_login.py is running."
                 logger.error(error_msg)
                 logger.info("=============================================\n")
@@ -941,6 +1004,12 @@ def cleanup():
     is_shutting_down = True
     logger.info("Shutting down webhook server...")
     
+    # Stop the signal workers; a signal already executing finishes first
+    if signal_queue:
+        signal_queue.stop()
+    if signal_journal:
+        signal_journal.close()
+    
     # Terminate ngrok process
     if ngrok_process and ngrok_process.poll() is None:
         try:
@@ -972,6 +1041,9 @@ def run_flask(debug=False):
         logger.info("Initializing TradovateController...")
         initialize_controller()
         
+        # Start the signal workers now so signals interrupted by the last shutdown are dealt with
+        get_signal_queue()
+        
         # Start the watchdog thread to monitor connections
         watchdog_thread = threading.Thread(target=watchdog_routine)
         watchdog_thread.daemon = True
@@ -0,0 +1,228 @@
+"""
+Account Snapshot Service for the dashboard
+Polls the account table of every Tradovate tab in the background and serves the last good copy
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utils.core import get_project_root
+
+
+class AccountSnapshotService:
+    """Keeps a per-account snapshot of the Tradovate account table, refreshed concurrently"""
+
+    # Cheap call when the function is already in the page; None tells us to inject it
+    FETCH_EXPRESSION = ("typeof getAllAccountTableData === 'function' "
+                        "? getAllAccountTableData() : null")
+
+    def __init__(self, controller, refresh_interval: float = 2.0, account_timeout: float = 10.0):
+        """
+        Initialize the snapshot service
+
+        Args:
+            controller: TradovateController whose connections are polled
+            refresh_interval: Seconds between background sweeps
+            account_timeout: Seconds one tab may take before the sweep moves on
+        """
+        self.controller = controller
+        self.refresh_interval = refresh_interval
+        self.account_timeout = account_timeout
+        self.script_path = os.path.join(get_project_root(),
+                                        'scripts/tampermonkey/getAllAccountTableData.user.js')
+
+        # account_index -> {'account_name', 'rows', 'updated_at', 'error', 'last_attempt'}
+        self.snapshots: Dict[int, Dict[str, Any]] = {}
+        self.version = 0
+        self.last_sweep = None
+        self.last_sweep_duration = None
+
+        # Called as listener(account_index, rows) whenever an account's rows change
+        self.listeners: List[Callable[[int, List[Dict[str, Any]]], None]] = []
+
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._script = None
+        self._script_mtime = None
+
+    def start(self) -> None:
+        """Start the background poller"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._poll_loop, name="account-snapshots", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background poller"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def add_listener(self, listener: Callable[[int, List[Dict[str, Any]]], None]) -> None:
+        """Register a callback receiving (account_index, rows) for every account whose rows change"""
+        self.listeners.append(listener)
+
+    def ensure_loaded(self) -> None:
+        """Run a sweep now if nothing has been polled yet"""
+        if self.last_sweep is None:
+            self.refresh()
+
+    def refresh(self) -> int:
+        """
+        Refresh every tab concurrently
+
+        Accounts that fail keep their last good rows; the failure is recorded next to them.
+
+        Returns:
+            The snapshot version after the sweep (bumped when any rows changed)
+        """
+        # One sweep at a time; a caller arriving mid-sweep gets that sweep's result
+        if not self.refresh_lock.acquire(blocking=False):
+            with self.refresh_lock:
+                return self.version
+
+        try:
+            started = time.monotonic()
+            indices = [i for i, conn in enumerate(self.controller.connections) if conn.tab]
+            outcomes = self.controller.execute_concurrently(indices, self._fetch_rows,
+                                                            timeout=self.account_timeout)
+            now = time.time()
+
+            changed = []
+            with self.lock:
+                for index, outcome in zip(indices, outcomes):
+                    snapshot = self.snapshots.setdefault(index, {
+                        'account_name': outcome['account'],
+                        'rows': [],
+                        'updated_at': None,
+                        'error': None,
+                        'last_attempt': None
+                    })
+                    snapshot['last_attempt'] = now
+                    result = outcome['result']
+
+                    if isinstance(result, dict) and 'error' in result:
+                        snapshot['error'] = result['error']
+                        continue
+
+                    if result != snapshot['rows']:
+                        changed.append((index, result))
+                    snapshot['rows'] = result
+                    snapshot['updated_at'] = now
+                    snapshot['error'] = None
+
+                if changed:
+                    self.version += 1
+                self.last_sweep = now
+                self.last_sweep_duration = round(time.monotonic() - started, 3)
+                version = self.version
+
+            # Outside the data lock so listeners may read the snapshot
+            for index, rows in changed:
+                for listener in self.listeners:
+                    try:
+                        listener(index, rows)
+                    except Exception as e:
+                        print(f"[Account Snapshots] Listener error for account {index}: {e}")
+            return version
+        finally:
+            self.refresh_lock.release()
+
+    def get_rows(self) -> List[Dict[str, Any]]:
+        """Get the rows of all accounts from the last good snapshots, in connection order"""
+        # Nothing polled yet (poller not started or still on its first sweep)
+        self.ensure_loaded()
+
+        with self.lock:
+            rows = []
+            for index in sorted(self.snapshots):
+                rows.extend(dict(row) for row in self.snapshots[index]['rows'])
+            return rows
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get per-account snapshot ages and errors"""
+        now = time.time()
+        with self.lock:
+            accounts = []
+            for index in sorted(self.snapshots):
+                snapshot = self.snapshots[index]
+                updated_at = snapshot['updated_at']
+                accounts.append({
+                    'account_index': index,
+                    'account_name': snapshot['account_name'],
+                    'rows': len(snapshot['rows']),
+                    'age': round(now - updated_at, 3) if updated_at else None,
+                    'error': snapshot['error']
+                })
+
+            return {
+                'version': self.version,
+                'refresh_interval': self.refresh_interval,
+                'running': bool(self._thread and self._thread.is_alive()),
+                'last_sweep_age': round(now - self.last_sweep, 3) if self.last_sweep else None,
+                'last_sweep_duration': self.last_sweep_duration,
+                'accounts': accounts
+            }
+
+    def get_age(self) -> Optional[float]:
+        """Age in seconds of the oldest account snapshot, or None before the first sweep"""
+        now = time.time()
+        with self.lock:
+            ages = [now - s['updated_at'] for s in self.snapshots.values() if s['updated_at']]
+            return round(max(ages), 3) if ages else None
+
+    def _poll_loop(self) -> None:
+        """Refresh on a fixed cadence until stopped"""
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[Account Snapshots] Error refreshing accounts: {e}")
+            self._stop_event.wait(self.refresh_interval)
+
+    def _get_script(self) -> str:
+        """The getAllAccountTableData script, re-read only when the file changes"""
+        mtime = os.path.getmtime(self.script_path)
+        if self._script is None or mtime != self._script_mtime:
+            with open(self.script_path, 'r') as file:
+                self._script = file.read()
+            self._script_mtime = mtime
+        return self._script
+
+    def _fetch_rows(self, index: int, conn) -> List[Dict[str, Any]]:
+        """Read the account table from one tab, injecting the function only when it is missing"""
+        with conn.lock:
+            result = conn.tab.Runtime.evaluate(expression=self.FETCH_EXPRESSION)
+            value = result.get('result', {}).get('value')
+            if value is None:
+                conn.tab.Runtime.evaluate(expression=self._get_script())
+                print(f"Injected getAllAccountTableData into {conn.account_name}")
+                result = conn.tab.Runtime.evaluate(expression="getAllAccountTableData()")
+                value = result.get('result', {}).get('value')
+
+        if value is None:
+            raise ValueError(f"No valid result structure for {conn.account_name}")
+
+        rows = json.loads(value) or []
+        for item in rows:
+            item['account_name'] = conn.account_name
+            item['account_index'] = index
+
+            # Ensure we have both User and Phase fields (Phase is the renamed User field)
+            if 'User' in item and 'Phase' not in item:
+                item['Phase'] = item['User']
+
+            # Standardize Account field - ensure there's only one Account field
+            # and remove any with arrows
+            if 'Account ▲' in item:
+                account_value = item.pop('Account ▲')
+                if 'Account' not in item:
+                    item['Account'] = account_value
+        return rows
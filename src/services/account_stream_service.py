@@ -0,0 +1,122 @@
+"""
+Account Stream Service for the dashboard
+Turns account snapshot changes into row-level deltas and pushes them to Server-Sent Events subscribers
+"""
+
+import json
+import queue
+import threading
+from typing import Any, Dict, Iterator, List
+
+
+class AccountStreamService:
+    """Fan-out of account row deltas to connected dashboards"""
+
+    def __init__(self, max_queue: int = 100, heartbeat_interval: float = 15.0):
+        """
+        Initialize the stream service
+
+        Args:
+            max_queue: Events buffered per subscriber before it is told to resync
+            heartbeat_interval: Seconds between keep-alive comments on an idle stream
+        """
+        self.max_queue = max_queue
+        self.heartbeat_interval = heartbeat_interval
+
+        # account_index -> {row key: row} as last published
+        self.rows: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        self.subscribers: List[queue.Queue] = []
+        self.version = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def row_key(index: int, position: int, row: Dict[str, Any]) -> str:
+        """Key the dashboard uses to find a row: the Account column"""
+        return str(row.get('Account') or f"Account {index}:{position}")
+
+    def update_account(self, index: int, rows: List[Dict[str, Any]]) -> None:
+        """Diff one tab's new rows against the last published ones and push the delta"""
+        with self.lock:
+            previous = self.rows.get(index, {})
+            current = {self.row_key(index, pos, row): row for pos, row in enumerate(rows)}
+
+            updated, added = [], []
+            for key, row in current.items():
+                old = previous.get(key)
+                if old is None:
+                    added.append(row)
+                    continue
+                changes = {field: value for field, value in row.items() if old.get(field) != value}
+                changes.update({field: None for field in old if field not in row})
+                if changes:
+                    updated.append({'account': key, 'changes': changes})
+            removed = [key for key in previous if key not in current]
+
+            self.rows[index] = current
+            if not (updated or added or removed):
+                return
+
+            self.version += 1
+            self._publish('delta', {
+                'version': self.version,
+                'account_index': index,
+                'updated': updated,
+                'added': added,
+                'removed': removed
+            })
+
+    def remove_account(self, index: int) -> None:
+        """Forget a tab and tell subscribers its rows are gone"""
+        self.update_account(index, [])
+        with self.lock:
+            self.rows.pop(index, None)
+
+    def subscribe(self) -> queue.Queue:
+        """Register a new subscriber; subscribe before reading the snapshot to not miss deltas"""
+        subscription = queue.Queue(maxsize=self.max_queue)
+        with self.lock:
+            self.subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: queue.Queue) -> None:
+        with self.lock:
+            if subscription in self.subscribers:
+                self.subscribers.remove(subscription)
+
+    def subscriber_count(self) -> int:
+        with self.lock:
+            return len(self.subscribers)
+
+    def stream(self, subscription: queue.Queue, snapshot_rows: List[Dict[str, Any]]) -> Iterator[str]:
+        """
+        Server-Sent Events body for one subscriber
+
+        Starts with the full snapshot, then yields deltas as they happen and a
+        keep-alive comment when idle. Unsubscribes when the client disconnects.
+        """
+        try:
+            yield self.format_event('snapshot', snapshot_rows)
+            while True:
+                try:
+                    event, data = subscription.get(timeout=self.heartbeat_interval)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield self.format_event(event, data)
+        finally:
+            self.unsubscribe(subscription)
+
+    @staticmethod
+    def format_event(event: str, data: Any) -> str:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    def _publish(self, event: str, data: Dict[str, Any]) -> None:
+        """Queue an event for every subscriber (caller holds the lock)"""
+        for subscription in self.subscribers:
+            try:
+                subscription.put_nowait((event, data))
+            except queue.Full:
+                # Slow client: drop its backlog and have it reload the full table
+                with subscription.mutex:
+                    subscription.queue.clear()
+                subscription.put_nowait(('resync', {'version': self.version}))
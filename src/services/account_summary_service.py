@@ -0,0 +1,194 @@
+"""
+Account Summary Service for the dashboard
+Keeps running P&L / margin totals with per-strategy and per-phase breakdowns,
+updated only for the accounts whose rows changed
+"""
+
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from ..utils.core import get_project_root, load_json_config
+
+# Column names used by getAllAccountTableData (standardized first, raw Tradovate header second)
+PNL_FIELDS = ['Total P&L', 'Dollar Total P L']
+MARGIN_FIELDS = ['Available Margin', 'Total Available Margin']
+
+UNASSIGNED_STRATEGY = 'Unassigned'
+UNKNOWN_PHASE = 'Unknown'
+
+
+def parse_amount(value: Any) -> float:
+    """Convert a table cell ($1,234.50, 1234.5, '') to a float, 0.0 when it isn't a number"""
+    if isinstance(value, bool):
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.replace('$', '').replace(',', ''))
+        except ValueError:
+            return 0.0
+    return 0.0
+
+
+def first_field(row: Dict[str, Any], fields: List[str]) -> float:
+    """Amount of the first of fields present in the row"""
+    for field in fields:
+        if field in row:
+            return parse_amount(row[field])
+    return 0.0
+
+
+class AccountSummaryService:
+    """Running totals over the dashboard account rows"""
+
+    def __init__(self, strategy_file: Optional[str] = None):
+        """
+        Initialize the summary service
+
+        Args:
+            strategy_file: Path to strategy_mappings.json (defaults to config/strategy_mappings.json)
+        """
+        self.strategy_file = strategy_file or str(get_project_root() / 'config' / 'strategy_mappings.json')
+        self._strategy_mtime = None
+        self._strategies_by_account: Dict[str, List[str]] = {}
+
+        # account_index -> list of (account, row_strategy, strategies, phase, pnl, margin), one per row
+        self.contributions: Dict[int, List[tuple]] = {}
+        self.totals = self._empty_bucket()
+        self.by_strategy: Dict[str, Dict[str, float]] = {}
+        self.by_phase: Dict[str, Dict[str, float]] = {}
+        self.version = 0
+
+        self.lock = threading.Lock()
+
+    def update_account(self, index: int, rows: List[Dict[str, Any]]) -> None:
+        """
+        Replace the rows contributed by one tab
+
+        Only that tab's previous contribution is subtracted and the new one added,
+        so the cost is proportional to the rows that changed.
+        """
+        with self.lock:
+            if self._reload_strategies():
+                # Mapping changed: every row may move to another strategy bucket
+                self._rebuild()
+
+            for entry in self.contributions.pop(index, []):
+                self._apply(entry, -1)
+
+            entries = [self._entry(row) for row in rows]
+            for entry in entries:
+                self._apply(entry, 1)
+            self.contributions[index] = entries
+            self.version += 1
+
+    def remove_account(self, index: int) -> None:
+        """Drop everything contributed by one tab"""
+        with self.lock:
+            for entry in self.contributions.pop(index, []):
+                self._apply(entry, -1)
+            self.version += 1
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Totals plus per-strategy and per-phase breakdowns"""
+        with self.lock:
+            if self._reload_strategies():
+                self._rebuild()
+
+            return {
+                'total_pnl': round(self.totals['pnl'], 2),
+                'total_margin': round(self.totals['margin'], 2),
+                'account_count': int(self.totals['count']),
+                'by_strategy': self._export(self.by_strategy),
+                'by_phase': self._export(self.by_phase),
+                'version': self.version
+            }
+
+    @staticmethod
+    def _empty_bucket() -> Dict[str, float]:
+        return {'pnl': 0.0, 'margin': 0.0, 'count': 0}
+
+    @staticmethod
+    def _export(buckets: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                'total_pnl': round(bucket['pnl'], 2),
+                'total_margin': round(bucket['margin'], 2),
+                'account_count': int(bucket['count'])
+            }
+            for name, bucket in sorted(buckets.items())
+        }
+
+    def _entry(self, row: Dict[str, Any]) -> tuple:
+        """Reduce a row to the values the totals depend on"""
+        account = str(row.get('Account', ''))
+        row_strategy = row.get('Strategy') or None
+        phase = str(row.get('Phase') or UNKNOWN_PHASE)
+        return (account, row_strategy, self._strategies_for(account, row_strategy), phase,
+                first_field(row, PNL_FIELDS), first_field(row, MARGIN_FIELDS))
+
+    def _strategies_for(self, account: str, row_strategy: Optional[str]) -> tuple:
+        """Strategies an account belongs to per strategy_mappings.json, else its own Strategy cell"""
+        return tuple(self._strategies_by_account.get(account, ())) or (row_strategy or UNASSIGNED_STRATEGY,)
+
+    def _apply(self, entry: tuple, sign: int) -> None:
+        """Add (sign=1) or subtract (sign=-1) one row's contribution"""
+        _, _, strategies, phase, pnl, margin = entry
+        self._add(self.totals, pnl, margin, sign)
+        self._add_to(self.by_phase, phase, pnl, margin, sign)
+        for strategy in strategies:
+            self._add_to(self.by_strategy, strategy, pnl, margin, sign)
+
+    def _add_to(self, breakdown: Dict[str, Dict[str, float]], name: str,
+                pnl: float, margin: float, sign: int) -> None:
+        bucket = breakdown.setdefault(name, self._empty_bucket())
+        self._add(bucket, pnl, margin, sign)
+        # Drop empty buckets so removed strategies/phases disappear
+        if bucket['count'] <= 0:
+            del breakdown[name]
+
+    @staticmethod
+    def _add(bucket: Dict[str, float], pnl: float, margin: float, sign: int) -> None:
+        bucket['pnl'] += sign * pnl
+        bucket['margin'] += sign * margin
+        bucket['count'] += sign
+
+    def _rebuild(self) -> None:
+        """Recompute every total from the stored contributions (after a mapping change)"""
+        self.totals = self._empty_bucket()
+        self.by_strategy = {}
+        self.by_phase = {}
+        for index, entries in self.contributions.items():
+            rebuilt = []
+            for account, row_strategy, _, phase, pnl, margin in entries:
+                entry = (account, row_strategy, self._strategies_for(account, row_strategy), phase, pnl, margin)
+                self._apply(entry, 1)
+                rebuilt.append(entry)
+            self.contributions[index] = rebuilt
+        self.version += 1
+
+    def _reload_strategies(self) -> bool:
+        """Re-read the strategy mappings if the file changed; True when it did"""
+        try:
+            mtime = os.path.getmtime(self.strategy_file)
+        except OSError:
+            mtime = None
+
+        if mtime == self._strategy_mtime:
+            return False
+        self._strategy_mtime = mtime
+
+        strategies_by_account: Dict[str, List[str]] = {}
+        if mtime is not None:
+            try:
+                mappings = load_json_config(self.strategy_file).get('strategy_mappings', {})
+                for strategy, accounts in mappings.items():
+                    for account in accounts:
+                        strategies_by_account.setdefault(account, []).append(strategy)
+            except Exception as e:
+                print(f"[Account Summary] Error loading strategy mappings: {e}")
+
+        self._strategies_by_account = strategies_by_account
+        return True
@@ -0,0 +1,193 @@
+"""
+DOM Snapshot Store for ChromeLogger
+Rate-limited, coalesced background captures stored gzip-compressed and deduplicated by content hash
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+class DomSnapshotStore:
+    """Content-addressed storage of DOM snapshots on disk"""
+
+    def __init__(self, snapshot_dir: Path):
+        """
+        Initialize the store
+
+        Args:
+            snapshot_dir: Directory holding <sha256>.json.gz files
+        """
+        self.snapshot_dir = Path(snapshot_dir)
+        self.lock = threading.Lock()
+        self.stats = {'stored': 0, 'deduplicated': 0, 'bytes_written': 0}
+
+    def save(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store a snapshot unless identical content is already on disk
+
+        Returns:
+            Reference with the content hash, file path, compressed size and whether it was a duplicate
+        """
+        payload = json.dumps(snapshot, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(payload).hexdigest()
+        path = self.snapshot_dir / f"{digest}.json.gz"
+
+        with self.lock:
+            duplicate = path.exists()
+            if duplicate:
+                self.stats['deduplicated'] += 1
+            else:
+                self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix('.tmp')
+                with gzip.open(tmp_path, 'wb') as f:
+                    f.write(payload)
+                tmp_path.replace(path)
+                self.stats['stored'] += 1
+                self.stats['bytes_written'] += path.stat().st_size
+
+        return {
+            'id': digest,
+            'path': str(path),
+            'bytes': path.stat().st_size,
+            'raw_bytes': len(payload),
+            'deduplicated': duplicate
+        }
+
+    def load(self, snapshot_id: str) -> Optional[Dict[str, Any]]:
+        """Read a stored snapshot back by its content hash"""
+        path = self.snapshot_dir / f"{snapshot_id}.json.gz"
+        if not path.exists():
+            return None
+        with gzip.open(path, 'rb') as f:
+            return json.loads(f.read().decode('utf-8'))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return dict(self.stats)
+
+
+class DomSnapshotScheduler:
+    """
+    Per-tab snapshot requests served by one background thread
+
+    Requests arriving while a capture is pending, or within min_interval of the last
+    capture, join a single upcoming capture. Each request gets a reference dictionary
+    that is filled in once the capture finishes.
+    """
+
+    def __init__(self, capture: Callable[[], Optional[Dict[str, Any]]], store: DomSnapshotStore,
+                 min_interval: float = 5.0, url_provider: Optional[Callable[[], str]] = None):
+        """
+        Initialize the scheduler
+
+        Args:
+            capture: Returns the raw CDP snapshot, or None on failure; called on the scheduler thread
+            store: Where captured snapshots are written
+            min_interval: Minimum seconds between two captures of this tab
+            url_provider: Optional callable giving the page URL recorded with each capture
+        """
+        self.capture = capture
+        self.store = store
+        self.min_interval = min_interval
+        self.url_provider = url_provider
+
+        self.condition = threading.Condition()
+        self.pending: List[Dict[str, Any]] = []
+        self.last_capture = 0.0
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self.stats = {'requested': 0, 'captured': 0, 'coalesced': 0, 'failed': 0}
+
+    def request(self, trigger_event: str) -> Dict[str, Any]:
+        """
+        Ask for a snapshot without waiting for it
+
+        Returns:
+            Reference dictionary; 'status' goes from 'pending' to 'captured' (with 'id' and 'path')
+            or 'failed'/'cancelled'
+        """
+        ref = {
+            'status': 'pending',
+            'trigger_event': trigger_event,
+            'requested_at': datetime.now().isoformat()
+        }
+        with self.condition:
+            self.stats['requested'] += 1
+            if self.pending:
+                self.stats['coalesced'] += 1
+            self.pending.append(ref)
+            if not self.running:
+                self.running = True
+                self.thread = threading.Thread(target=self._run, name='dom-snapshots', daemon=True)
+                self.thread.start()
+            self.condition.notify()
+        return ref
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop the thread; requests that have not been captured are marked cancelled"""
+        with self.condition:
+            self.running = False
+            for ref in self.pending:
+                ref['status'] = 'cancelled'
+            self.pending = []
+            self.condition.notify_all()
+            thread, self.thread = self.thread, None
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.condition:
+            return dict(self.stats, pending=len(self.pending), store=self.store.get_stats())
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait()
+                if not self.running:
+                    return
+
+                # Rate limit: wait out the interval, gathering more requests meanwhile
+                due = self.last_capture + self.min_interval
+                while self.running and time.time() < due:
+                    self.condition.wait(due - time.time())
+                if not self.running:
+                    return
+
+                batch, self.pending = self.pending, []
+                self.last_capture = time.time()
+
+            self._capture_batch(batch)
+
+    def _capture_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Take one snapshot and point every request in the batch at it"""
+        try:
+            snapshot = self.capture()
+            if not snapshot:
+                raise RuntimeError('empty snapshot result')
+            stored = self.store.save(snapshot)
+        except Exception as e:
+            with self.condition:
+                self.stats['failed'] += 1
+            for ref in batch:
+                ref.update({'status': 'failed', 'error': str(e)})
+            print(f"🔴 ERROR: DOM snapshot capture failed: {e}")
+            return
+
+        details = {
+            'status': 'captured',
+            'captured_at': datetime.now().isoformat(),
+            'url': self.url_provider() if self.url_provider else None,
+            'coalesced_requests': len(batch),
+            **stored
+        }
+        with self.condition:
+            self.stats['captured'] += 1
+        for ref in batch:
+            ref.update(details)
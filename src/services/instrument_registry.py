@@ -0,0 +1,155 @@
+"""
+Instrument Registry
+Contract metadata from config/trading_defaults.json symbol_defaults, shared by Python and the injected scripts
+"""
+
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Optional
+
+from ..utils.core import get_project_root
+
+
+MONTH_CODES = 'FGHJKMNQUVXZ'
+
+# Config field -> key used by futuresTickData in autoOrder.user.js
+JS_FIELDS = {
+    'tick_size': 'tickSize',
+    'tick_value': 'tickValue',
+    'default_sl': 'defaultSL',
+    'default_tp': 'defaultTP',
+    'precision': 'precision',
+}
+
+
+def clean_symbol(symbol: str) -> str:
+    """Upper-case, without TradingView's continuous-contract '!'"""
+    return str(symbol).strip().upper().replace('!', '')
+
+
+@lru_cache(maxsize=1024)
+def parse_root(symbol: str, roots: FrozenSet[str]) -> str:
+    """
+    Root of a futures symbol: NQ1! -> NQ, NQZ5 -> NQ, MNQH25 -> MNQ, ES -> ES
+
+    Args:
+        symbol: Symbol as sent by TradingView, the dashboard or Tradovate
+        roots: Known instrument roots; a month code is only stripped if it leaves a known root
+    """
+    s = clean_symbol(symbol)
+    base = re.sub(r'\d+$', '', s)
+    if base in roots:
+        return base
+    if base != s and len(base) > 1 and base[-1] in MONTH_CODES and base[:-1] in roots:
+        return base[:-1]
+    return base
+
+
+class InstrumentRegistry:
+    """Tick size, tick value, precision and default brackets per instrument root"""
+
+    def __init__(self, config_path: Optional[Path] = None):
+        """
+        Initialize the registry
+
+        Args:
+            config_path: Trading defaults file with a symbol_defaults section
+        """
+        self.config_path = Path(config_path) if config_path else get_project_root() / 'config' / 'trading_defaults.json'
+        self.lock = threading.Lock()
+        self.instruments: Dict[str, Dict[str, Any]] = {}
+        self.roots: FrozenSet[str] = frozenset()
+        self.stamp = None
+        self.reload()
+
+    def reload(self) -> None:
+        """Read symbol_defaults from the config file again"""
+        try:
+            stamp = os.stat(self.config_path).st_mtime_ns
+            with open(self.config_path, 'r') as f:
+                instruments = json.load(f).get('symbol_defaults', {})
+        except Exception as e:
+            print(f"[Instrument Registry] Error loading {self.config_path}: {e}")
+            stamp, instruments = None, {}
+        with self.lock:
+            self.instruments = {root.upper(): dict(data) for root, data in instruments.items()}
+            self.roots = frozenset(self.instruments)
+            self.stamp = stamp
+
+    def reload_if_changed(self) -> bool:
+        """Reload if the config file changed since it was last read"""
+        try:
+            stamp = os.stat(self.config_path).st_mtime_ns
+        except OSError:
+            stamp = None
+        if stamp == self.stamp:
+            return False
+        self.reload()
+        return True
+
+    def root_symbol(self, symbol: str) -> str:
+        return parse_root(symbol, self.roots)
+
+    def trading_symbol(self, symbol: str) -> str:
+        """
+        Symbol to send to Tradovate
+
+        Explicit contracts (NQZ5) are kept; continuous contracts (NQ1!) and roots become the root,
+        which the page resolves to the front quarter.
+        """
+        root = self.root_symbol(symbol)
+        contract = clean_symbol(symbol)
+        if re.fullmatch(re.escape(root) + f'[{MONTH_CODES}]\\d{{1,2}}', contract):
+            return contract
+        return root
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Metadata for the symbol's root, or None for an unknown instrument"""
+        instrument = self.instruments.get(self.root_symbol(symbol))
+        return dict(instrument) if instrument else None
+
+    def tick_size(self, symbol: str, default: float = 0.25) -> float:
+        instrument = self.instruments.get(self.root_symbol(symbol))
+        return float(instrument.get('tick_size', default)) if instrument else default
+
+    def to_js(self) -> str:
+        """Script defining the registry in the page, loaded ahead of autoOrder.user.js"""
+        with self.lock:
+            table = {
+                root: {js_key: data[key] for key, js_key in JS_FIELDS.items() if key in data}
+                for root, data in self.instruments.items()
+            }
+        return (
+            f"window.__tradovateInstruments = {json.dumps(table)};\n"
+            "window.__tradovateRootSymbol = (function() {\n"
+            "    // Same rules as instrument_registry.parse_root\n"
+            "    const cache = new Map();\n"
+            "    return function(symbol) {\n"
+            "        if (cache.has(symbol)) return cache.get(symbol);\n"
+            "        const s = String(symbol).trim().toUpperCase().replace(/!/g, '');\n"
+            "        const base = s.replace(/\\d+$/, '');\n"
+            "        let root = base;\n"
+            "        if (!(base in window.__tradovateInstruments) && base !== s && base.length > 1\n"
+            f"            && '{MONTH_CODES}'.includes(base.slice(-1)) && (base.slice(0, -1) in window.__tradovateInstruments)) {{\n"
+            "            root = base.slice(0, -1);\n"
+            "        }\n"
+            "        cache.set(symbol, root);\n"
+            "        return root;\n"
+            "    };\n"
+            "})();\n"
+        )
+
+
+# Global registry instance
+_instrument_registry = None
+
+def get_instrument_registry() -> InstrumentRegistry:
+    """Get or create the global instrument registry"""
+    global _instrument_registry
+    if _instrument_registry is None:
+        _instrument_registry = InstrumentRegistry()
+    return _instrument_registry
@@ -0,0 +1,115 @@
+"""
+Log Buffer for Chrome log entries
+Bounded in-memory window of recent entries with an optional spill-to-disk tier
+"""
+
+import json
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def trim_entry(entry: Dict[str, Any], max_text: int = 4000) -> Dict[str, Any]:
+    """
+    Compact copy of a log entry for retention
+
+    The raw CDP event is dropped and long text is cut; both are already in the text log.
+
+    Args:
+        entry: Log entry as built by ChromeLogger
+        max_text: Longest text kept
+
+    Returns:
+        New dictionary safe to keep for the whole session
+    """
+    trimmed = {key: value for key, value in entry.items() if key != 'raw'}
+    text = trimmed.get('text')
+    if isinstance(text, str) and len(text) > max_text:
+        trimmed['text'] = text[:max_text] + f'... [{len(text) - max_text} chars truncated]'
+    return trimmed
+
+
+class LogRingBuffer:
+    """Ring buffer of log entries bounded by entry count and approximate bytes"""
+
+    def __init__(self, max_entries: int = 5000, max_bytes: int = 5 * 1024 * 1024,
+                 spill_file: Optional[str] = None):
+        """
+        Initialize the buffer
+
+        Args:
+            max_entries: Entries kept in memory
+            max_bytes: Approximate JSON size of the entries kept in memory
+            spill_file: NDJSON file receiving evicted entries; None discards them
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.spill_file = Path(spill_file) if spill_file else None
+        if self.spill_file:
+            self.spill_file.parent.mkdir(parents=True, exist_ok=True)
+
+        # (entry, size) pairs, oldest first
+        self.entries: deque = deque()
+        self.bytes = 0
+        self.evicted = 0
+        self.spilled = 0
+        self.lock = threading.Lock()
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Store a trimmed copy of the entry, evicting the oldest ones past the limits"""
+        trimmed = trim_entry(entry)
+        line = json.dumps(trimmed, default=str)
+
+        with self.lock:
+            self.entries.append((trimmed, len(line)))
+            self.bytes += len(line)
+
+            evicted = []
+            # Always keep the newest entry, even if it alone exceeds the byte budget
+            while len(self.entries) > 1 and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+                old, size = self.entries.popleft()
+                self.bytes -= size
+                evicted.append(old)
+            self.evicted += len(evicted)
+
+        if evicted and self.spill_file:
+            self._spill(evicted)
+
+    def copy(self) -> List[Dict[str, Any]]:
+        """Shallow copies of the retained entries, oldest first"""
+        with self.lock:
+            return [dict(entry) for entry, _ in self.entries]
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retained entries and bytes, and how many were evicted or spilled"""
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'bytes': self.bytes,
+                'evicted': self.evicted,
+                'spilled': self.spilled,
+                'spill_file': str(self.spill_file) if self.spill_file else None
+            }
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.copy())
+
+    def _spill(self, entries: List[Dict[str, Any]]) -> None:
+        """Append evicted entries to the spill file in one write"""
+        try:
+            payload = ''.join(json.dumps(entry, default=str) + '\n' for entry in entries)
+            with open(self.spill_file, 'a', encoding='utf-8') as f:
+                f.write(payload)
+            with self.lock:
+                self.spilled += len(entries)
+        except Exception as e:
+            print(f"[Log Buffer] Error spilling entries to {self.spill_file}: {e}")
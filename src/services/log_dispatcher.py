@@ -0,0 +1,213 @@
+"""
+Log Dispatcher for ChromeLogger consumers
+Moves callback work off the CDP event thread: one bounded queue and worker thread per consumer
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+
+
+def coalesce_key(item: Any) -> Any:
+    """Items with the same key are repeats; log entries compare by source, level and text"""
+    if isinstance(item, dict):
+        return (item.get('source'), item.get('level'), item.get('text'))
+    return item
+
+
+class CallbackWorker:
+    """Bounded queue and thread delivering items to a single consumer"""
+
+    def __init__(self, callback: Callable[[Any], None], max_queue: int = 1000,
+                 policy: str = DROP_OLDEST, lag_threshold: float = 1.0):
+        """
+        Initialize the worker
+
+        Args:
+            callback: Consumer called with each item
+            max_queue: Items waiting for the consumer before the overflow policy applies
+            policy: DROP_OLDEST or DROP_NEWEST once the queue is full and the item is not a repeat
+            lag_threshold: Seconds between queueing and delivery counted as lagging
+        """
+        self.callback = callback
+        self.name = getattr(callback, '__qualname__', repr(callback))
+        self.max_queue = max_queue
+        self.policy = policy
+        self.lag_threshold = lag_threshold
+
+        # (queued_at, item) pairs
+        self.items: deque = deque()
+        self.condition = threading.Condition()
+        self.running = False
+        self.busy = False
+        self.thread: Optional[threading.Thread] = None
+        self.stats = {'delivered': 0, 'dropped': 0, 'coalesced': 0, 'lagging': 0, 'errors': 0, 'max_lag': 0.0}
+
+    def start(self) -> None:
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self._run, name=f'log-callback-{self.name}', daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Deliver what is queued (up to timeout) and stop the thread"""
+        self.flush(timeout)
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread:
+            self.thread.join(timeout)
+            self.thread = None
+
+    def put(self, item: Any) -> None:
+        """Queue an item without blocking; applies coalescing and the overflow policy when full"""
+        with self.condition:
+            if len(self.items) >= self.max_queue:
+                queued_at, tail = self.items[-1]
+                if coalesce_key(tail) == coalesce_key(item):
+                    if isinstance(tail, dict):
+                        # Copy: the same entry may be queued for other consumers
+                        self.items[-1] = (queued_at, dict(tail, repeat_count=tail.get('repeat_count', 1) + 1))
+                    self.stats['coalesced'] += 1
+                    return
+                self.stats['dropped'] += 1
+                if self.policy == DROP_NEWEST:
+                    return
+                self.items.popleft()
+            self.items.append((time.time(), item))
+            self.condition.notify()
+
+    def flush(self, timeout: float = 1.0) -> bool:
+        """Wait until the queue is empty and the consumer is idle"""
+        deadline = time.time() + timeout
+        with self.condition:
+            while self.items or self.busy:
+                remaining = deadline - time.time()
+                if remaining <= 0 or not self.running:
+                    return not (self.items or self.busy)
+                self.condition.wait(remaining)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.condition:
+            return dict(self.stats, queued=len(self.items))
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                while self.running and not self.items:
+                    self.condition.wait()
+                if not self.items:
+                    return
+                queued_at, item = self.items.popleft()
+                self.busy = True
+
+            lag = time.time() - queued_at
+            try:
+                self.callback(item)
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"Error in callback {self.name}: {e}")
+
+            with self.condition:
+                self.busy = False
+                self.stats['delivered'] += 1
+                self.stats['max_lag'] = max(self.stats['max_lag'], lag)
+                if lag > self.lag_threshold:
+                    self.stats['lagging'] += 1
+                self.condition.notify_all()
+
+
+class CallbackDispatcher:
+    """Fans items out to consumers, each on its own worker so a slow one can't hold up the others"""
+
+    def __init__(self, max_queue: int = 1000, policy: str = DROP_OLDEST, lag_threshold: float = 1.0):
+        """
+        Initialize the dispatcher
+
+        Args:
+            max_queue: Default queue bound per consumer
+            policy: Default overflow policy per consumer
+            lag_threshold: Seconds of queueing delay counted as lagging
+        """
+        self.max_queue = max_queue
+        self.policy = policy
+        self.lag_threshold = lag_threshold
+        self.workers: Dict[int, CallbackWorker] = {}
+        self.running = False
+        self.lock = threading.Lock()
+
+    def start(self) -> None:
+        with self.lock:
+            self.running = True
+            workers = list(self.workers.values())
+        for worker in workers:
+            worker.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        with self.lock:
+            self.running = False
+            workers = list(self.workers.values())
+        for worker in workers:
+            worker.stop(timeout)
+
+    def configure(self, callback: Callable[[Any], None], max_queue: Optional[int] = None,
+                  policy: Optional[str] = None) -> None:
+        """Set a consumer's own queue bound or overflow policy"""
+        worker = self._worker(callback)
+        if max_queue is not None:
+            worker.max_queue = max_queue
+        if policy is not None:
+            worker.policy = policy
+
+    def dispatch(self, callback: Callable[[Any], None], item: Any) -> None:
+        """
+        Deliver an item to a consumer
+
+        While the dispatcher runs the item is queued for the consumer's worker; otherwise
+        the consumer is called inline.
+        """
+        if not self.running:
+            try:
+                callback(item)
+            except Exception as e:
+                print(f"Error in callback: {e}")
+                import traceback
+                traceback.print_exc()
+            return
+        self._worker(callback).put(item)
+
+    def remove(self, callback: Callable[[Any], None]) -> None:
+        with self.lock:
+            worker = self.workers.pop(id(callback), None)
+        if worker:
+            worker.stop(timeout=0.5)
+
+    def flush(self, timeout: float = 1.0) -> bool:
+        """Wait for every consumer to catch up"""
+        with self.lock:
+            workers = list(self.workers.values())
+        return all([worker.flush(timeout) for worker in workers])
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-consumer delivered, dropped, coalesced, lagging and error counters"""
+        with self.lock:
+            workers = list(self.workers.values())
+        return {worker.name: worker.get_stats() for worker in workers}
+
+    def _worker(self, callback: Callable[[Any], None]) -> CallbackWorker:
+        with self.lock:
+            worker = self.workers.get(id(callback))
+            if worker is None:
+                worker = CallbackWorker(callback, self.max_queue, self.policy, self.lag_threshold)
+                self.workers[id(callback)] = worker
+                if self.running:
+                    worker.start()
+            return worker
@@ -0,0 +1,168 @@
+"""
+Log Writer for Chrome log files
+One background thread per process that group-commits queued lines and rotates files by size
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class LogWriter:
+    """Background writer shared by every ChromeLogger in the process"""
+
+    def __init__(self, flush_interval: float = 0.2, flush_bytes: int = 64 * 1024,
+                 max_file_bytes: int = 10 * 1024 * 1024, backup_count: int = 3,
+                 max_queue: int = 100000):
+        """
+        Initialize the writer
+
+        Args:
+            flush_interval: Seconds between group commits
+            flush_bytes: Buffered bytes that trigger an early commit
+            max_file_bytes: Size at which a log file is rotated
+            backup_count: Rotated files kept per log (file.1 ... file.N)
+            max_queue: Lines waiting to be written before new ones are dropped
+        """
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.max_file_bytes = max_file_bytes
+        self.backup_count = backup_count
+
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self.thread: Optional[threading.Thread] = None
+        self.running = False
+        self.lock = threading.Lock()
+        self.stats = {'lines_written': 0, 'commits': 0, 'dropped': 0, 'rotations': 0, 'errors': 0}
+
+    def start(self) -> None:
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+            self.thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+            self.thread.start()
+
+    def write(self, path: str, line: str) -> bool:
+        """
+        Queue a line for a log file without blocking the caller
+
+        Returns:
+            False if the queue is full and the line was dropped
+        """
+        if not self.running:
+            self.start()
+        try:
+            self.queue.put_nowait((path, line))
+            return True
+        except queue.Full:
+            self.stats['dropped'] += 1
+            return False
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Wait until everything queued so far is on disk"""
+        if not self.running:
+            return True
+        done = threading.Event()
+        try:
+            self.queue.put((None, done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Flush pending lines and stop the writer thread"""
+        self.flush(timeout)
+        with self.lock:
+            self.running = False
+            thread, self.thread = self.thread, None
+        if thread:
+            # Wake the thread if it is waiting on an empty queue
+            try:
+                self.queue.put((None, threading.Event()), timeout=timeout)
+            except queue.Full:
+                pass
+            thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats, queued=self.queue.qsize())
+
+    def _run(self) -> None:
+        pending: Dict[str, List[str]] = {}
+        pending_bytes = 0
+        last_commit = time.time()
+
+        while self.running or not self.queue.empty():
+            waiters = []
+            try:
+                path, line = self.queue.get(timeout=self.flush_interval)
+                if path is None:
+                    waiters.append(line)
+                else:
+                    pending.setdefault(path, []).append(line)
+                    pending_bytes += len(line)
+            except queue.Empty:
+                pass
+
+            due = time.time() - last_commit >= self.flush_interval or pending_bytes >= self.flush_bytes
+            if pending and (due or waiters):
+                self._commit(pending)
+                pending, pending_bytes = {}, 0
+                last_commit = time.time()
+
+            for waiter in waiters:
+                waiter.set()
+
+        if pending:
+            self._commit(pending)
+
+    def _commit(self, pending: Dict[str, List[str]]) -> None:
+        """Write each file's buffered lines in one append"""
+        for path, lines in pending.items():
+            payload = ''.join(lines)
+            try:
+                self._rotate_if_needed(path, len(payload.encode('utf-8')))
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write(payload)
+                self.stats['lines_written'] += len(lines)
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"Error writing to log file {path}: {e}")
+        self.stats['commits'] += 1
+
+    def _rotate_if_needed(self, path: str, incoming: int) -> None:
+        """Shift file -> file.1 -> ... -> file.N once the file would exceed max_file_bytes"""
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        if size == 0 or size + incoming <= self.max_file_bytes:
+            return
+
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(path, f"{path}.1")
+        else:
+            Path(path).unlink()
+        self.stats['rotations'] += 1
+
+
+# Global writer instance
+_log_writer = None
+_log_writer_lock = threading.Lock()
+
+def get_log_writer() -> LogWriter:
+    """Get or create the process-wide log writer"""
+    global _log_writer
+    with _log_writer_lock:
+        if _log_writer is None:
+            _log_writer = LogWriter()
+            atexit.register(_log_writer.stop)
+        return _log_writer
@@ -9,38 +9,88 @@ import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from collections import deque
+from collections import deque, OrderedDict
 import threading
 
 from ..utils.core import get_project_root
+from .trade_store import TradeStore
+
+# Column order of a trade row in the compact payload sent over the page binding
+COMPACT_TRADE_FIELDS = ('timestamp', 'price', 'size', 'accumulatedVolume', 'tickDirection', 'isHighlighted')
+
+
+def decode_scraper_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Expand a compact scraper payload into the scraped data dictionary
+    
+    Compact form: {"ts": timestamp, "a": account, "d": 1 for delta messages,
+    "t": [[timestamp, price, size, accumulatedVolume, tickDirection, isHighlighted], ...],
+    "c": contractInfo, "tb": tabs} with "c" and "tb" present only when sent.
+    
+    Args:
+        payload: Decoded JSON from the page binding
+        
+    Returns:
+        Data in the shape accepted by ScraperService.add_scraped_data
+    """
+    data = {
+        'timestamp': payload.get('ts'),
+        'account': payload.get('a'),
+        'delta': bool(payload.get('d')),
+        'trades': [{field: value for field, value in zip(COMPACT_TRADE_FIELDS, row) if value is not None}
+                   for row in payload.get('t', [])]
+    }
+    if 'c' in payload:
+        data['contractInfo'] = payload['c']
+    if 'tb' in payload:
+        data['tabs'] = payload['tb']
+    return data
+
 
 class ScraperService:
     """Service for managing scraped Tradovate market data"""
     
-    def __init__(self, buffer_size: int = 1000, persist_interval: int = 60):
+    def __init__(self, buffer_size: int = 1000, persist_interval: int = 60,
+                 segment_max_bytes: int = 8 * 1024 * 1024, segment_max_age: int = 3600,
+                 dedup_window: int = 20000):
         """
         Initialize the scraper service
         
         Args:
             buffer_size: Maximum number of trades to keep in memory
             persist_interval: Seconds between automatic persistence
+            segment_max_bytes: Size at which the trade store starts a new segment
+            segment_max_age: Seconds after which the trade store starts a new segment
+            dedup_window: Number of recent trade fingerprints remembered for de-duplication
         """
         self.project_root = get_project_root()
         self.data_dir = self.project_root / 'data' / 'scraped_trades'
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.trade_store = TradeStore(self.data_dir, max_segment_bytes=segment_max_bytes,
+                                      max_segment_age=segment_max_age)
         
         # In-memory buffer for real-time data
         self.trade_buffer = deque(maxlen=buffer_size)
+        # Trades captured since the last persist, waiting to be appended to the store
+        self.pending_trades = []
+        
+        # Rolling window of recently seen trade fingerprints; the scraper re-sends
+        # every visible time-and-sales row on each tick
+        self.dedup_window = dedup_window
+        self.seen_trades = OrderedDict()
         self.latest_data = {}
         self.scraper_status = {
             'enabled': False,
             'last_update': None,
             'trades_captured': 0,
+            'duplicates_skipped': 0,
             'accounts': {}
         }
         
         # Thread-safe lock
         self.lock = threading.Lock()
+        # Serializes writers to the trade store; file I/O never holds self.lock
+        self.persist_lock = threading.Lock()
         
         # Persistence settings
         self.persist_interval = persist_interval
@@ -58,29 +108,64 @@ class ScraperService:
             data: Scraped data dictionary
         """
         with self.lock:
-            # Update latest data for account
-            self.latest_data[account] = data
+            # Update latest data for account; delta messages from the page only carry
+            # contract info and tabs when they changed, so keep the previous ones
+            if data.get('delta'):
+                latest = dict(self.latest_data.get(account, {}))
+                latest.update(data)
+            else:
+                latest = data
+            self.latest_data[account] = latest
             
-            # Add trades to buffer
-            if 'trades' in data:
-                for trade in data['trades']:
-                    trade['account'] = account
-                    trade['captured_at'] = data.get('timestamp', datetime.now().isoformat())
-                    self.trade_buffer.append(trade)
+            symbol = latest.get('contractInfo', {}).get('name', 'Unknown')
+            
+            # Add only trades not seen before to the buffer
+            new_trades = 0
+            duplicates = 0
+            for trade in data.get('trades', []):
+                trade['account'] = account
+                trade.setdefault('symbol', symbol)
+                if not self._remember_trade(trade):
+                    duplicates += 1
+                    continue
+                trade['captured_at'] = data.get('timestamp', datetime.now().isoformat())
+                self.trade_buffer.append(trade)
+                self.pending_trades.append(trade)
+                new_trades += 1
             
             # Update status
             self.scraper_status['enabled'] = True
             self.scraper_status['last_update'] = datetime.now().isoformat()
-            self.scraper_status['trades_captured'] += len(data.get('trades', []))
+            self.scraper_status['trades_captured'] += new_trades
+            self.scraper_status['duplicates_skipped'] += duplicates
             self.scraper_status['accounts'][account] = {
                 'last_update': data.get('timestamp'),
-                'symbol': data.get('contractInfo', {}).get('name', 'Unknown'),
-                'trades': len(data.get('trades', []))
+                'symbol': symbol,
+                'trades': new_trades
             }
             
             # Auto-persist if interval exceeded
-            if time.time() - self.last_persist_time > self.persist_interval:
-                self.persist_data()
+            persist_due = time.time() - self.last_persist_time > self.persist_interval
+        
+        # Outside the lock so the write doesn't block other scraper updates
+        if persist_due:
+            self.persist_data()
+    
+    @staticmethod
+    def trade_fingerprint(trade: Dict[str, Any]) -> tuple:
+        """Identity of a print: same account/symbol, time, price, size and running volume"""
+        return (trade.get('account'), trade.get('symbol'), trade.get('timestamp'),
+                trade.get('price'), trade.get('size'), trade.get('accumulatedVolume'))
+    
+    def _remember_trade(self, trade: Dict[str, Any]) -> bool:
+        """Record a trade's fingerprint; False if it is already in the window (caller holds the lock)"""
+        fingerprint = self.trade_fingerprint(trade)
+        if fingerprint in self.seen_trades:
+            return False
+        self.seen_trades[fingerprint] = None
+        if len(self.seen_trades) > self.dedup_window:
+            self.seen_trades.popitem(last=False)
+        return True
     
     def get_latest_data(self, account: Optional[str] = None) -> Dict[str, Any]:
         """Get the latest scraped data"""
@@ -106,59 +191,47 @@ class ScraperService:
             return self.scraper_status.copy()
     
     def persist_data(self) -> None:
-        """Persist current buffer to disk"""
-        with self.lock:
-            if not self.trade_buffer:
-                return
+        """Append trades captured since the last persist to the trade store"""
+        with self.persist_lock:
+            # Take the pending batch; the write happens without holding self.lock
+            with self.lock:
+                new_trades, self.pending_trades = self.pending_trades, []
+                self.last_persist_time = time.time()
             
-            # Create filename with date
-            date_str = datetime.now().strftime('%Y-%m-%d')
-            filename = f"{date_str}_trades.json"
-            filepath = self.data_dir / filename
-            
-            # Load existing data if file exists
-            existing_data = []
-            if filepath.exists():
-                try:
-                    with open(filepath, 'r') as f:
-                        existing_data = json.load(f)
-                except:
-                    existing_data = []
-            
-            # Append new trades
-            new_trades = list(self.trade_buffer)
-            all_trades = existing_data + new_trades
-            
-            # Save to file
-            with open(filepath, 'w') as f:
-                json.dump(all_trades, f, indent=2)
+            if not new_trades:
+                return
             
-            # Clear buffer after persisting
-            self.trade_buffer.clear()
-            self.last_persist_time = time.time()
+            try:
+                self.trade_store.append(new_trades)
+            except Exception as e:
+                # Put the batch back in front of anything captured meanwhile
+                with self.lock:
+                    self.pending_trades = new_trades + self.pending_trades
+                print(f"[Scraper Service] Error persisting trades: {e}")
+                return
             
-            print(f"[Scraper Service] Persisted {len(new_trades)} trades to {filename}")
+            print(f"[Scraper Service] Persisted {len(new_trades)} trades")
     
     def load_today_data(self) -> None:
-        """Load today's data into buffer"""
+        """Load the last hour of today's trades into the buffer"""
         date_str = datetime.now().strftime('%Y-%m-%d')
-        filename = f"{date_str}_trades.json"
-        filepath = self.data_dir / filename
+        recent_cutoff = datetime.now() - timedelta(hours=1)
         
-        if filepath.exists():
-            try:
-                with open(filepath, 'r') as f:
-                    trades = json.load(f)
-                    # Load only recent trades into buffer
-                    recent_cutoff = datetime.now() - timedelta(hours=1)
-                    for trade in trades:
-                        trade_time = datetime.fromisoformat(trade.get('captured_at', ''))
-                        if trade_time > recent_cutoff:
-                            self.trade_buffer.append(trade)
-                    
-                    print(f"[Scraper Service] Loaded {len(self.trade_buffer)} recent trades")
-            except Exception as e:
-                print(f"[Scraper Service] Error loading trades: {e}")
+        try:
+            for trade in self.trade_store.iter_records(date_str, date_str):
+                try:
+                    trade_time = datetime.fromisoformat(trade.get('captured_at', ''))
+                except ValueError:
+                    continue
+                if trade_time > recent_cutoff:
+                    self.trade_buffer.append(trade)
+                    # Prints still visible in the page after a restart are not new
+                    self._remember_trade(trade)
+            
+            if self.trade_buffer:
+                print(f"[Scraper Service] Loaded {len(self.trade_buffer)} recent trades")
+        except Exception as e:
+            print(f"[Scraper Service] Error loading trades: {e}")
     
     def export_data(self, format: str = 'json', start_date: Optional[str] = None, 
                    end_date: Optional[str] = None) -> tuple[bytes, str]:
@@ -182,24 +255,8 @@ class ScraperService:
         if not end_date:
             end_date = datetime.now().strftime('%Y-%m-%d')
         
-        # Collect all trades in date range
-        all_trades = []
-        current_date = datetime.strptime(start_date, '%Y-%m-%d')
-        end = datetime.strptime(end_date, '%Y-%m-%d')
-        
-        while current_date <= end:
-            date_str = current_date.strftime('%Y-%m-%d')
-            filepath = self.data_dir / f"{date_str}_trades.json"
-            
-            if filepath.exists():
-                try:
-                    with open(filepath, 'r') as f:
-                        trades = json.load(f)
-                        all_trades.extend(trades)
-                except:
-                    pass
-            
-            current_date += timedelta(days=1)
+        # Stream trades in date range from the store segments
+        trades = self.trade_store.iter_records(start_date, end_date)
         
         # Format data
         if format == 'csv':
@@ -207,40 +264,31 @@ class ScraperService:
             import io
             
             output = io.StringIO()
-            if all_trades:
-                fieldnames = ['captured_at', 'account', 'timestamp', 'price', 
-                             'size', 'accumulatedVolume', 'tickDirection']
-                writer = csv.DictWriter(output, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for trade in all_trades:
-                    row = {k: trade.get(k, '') for k in fieldnames}
-                    writer.writerow(row)
+            fieldnames = ['captured_at', 'account', 'timestamp', 'price', 
+                         'size', 'accumulatedVolume', 'tickDirection']
+            writer = None
+            for trade in trades:
+                if writer is None:
+                    writer = csv.DictWriter(output, fieldnames=fieldnames)
+                    writer.writeheader()
+                row = {k: trade.get(k, '') for k in fieldnames}
+                writer.writerow(row)
             
             data = output.getvalue().encode('utf-8')
             filename = f"tradovate_trades_{start_date}_to_{end_date}.csv"
         else:
             # JSON format
-            data = json.dumps(all_trades, indent=2).encode('utf-8')
+            data = json.dumps(list(trades), indent=2).encode('utf-8')
             filename = f"tradovate_trades_{start_date}_to_{end_date}.json"
         
         return data, filename
     
     def clear_old_data(self, days_to_keep: int = 7) -> None:
-        """Remove data files older than specified days"""
-        cutoff_date = datetime.now() - timedelta(days=days_to_keep)
+        """Remove data older than specified days"""
+        cutoff_date = (datetime.now() - timedelta(days=days_to_keep)).strftime('%Y-%m-%d')
         
-        for filepath in self.data_dir.glob("*_trades.json"):
-            try:
-                # Extract date from filename
-                date_str = filepath.stem.split('_')[0]
-                file_date = datetime.strptime(date_str, '%Y-%m-%d')
-                
-                if file_date < cutoff_date:
-                    filepath.unlink()
-                    print(f"[Scraper Service] Removed old data file: {filepath.name}")
-            except:
-                pass
+        for name in self.trade_store.remove_before(cutoff_date):
+            print(f"[Scraper Service] Removed old data file: {name}")
 
 
 # Global instance
@@ -0,0 +1,183 @@
+"""
+Script Bundle for Tradovate tabs
+Builds the injected userscripts into one content-hashed, versioned bundle
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from ..utils.core import get_project_root
+from .instrument_registry import get_instrument_registry
+
+
+# Global the bundle's last part sets; injection is skipped while it matches
+VERSION_MARKER = '__tradovateBundleVersion'
+# Global holding the hot-path operations defined by tradovateOps.js
+OPS_GLOBAL = '__tradovateOps'
+# Global set to "<part>: <error>" when a part registered for new documents throws
+ERROR_MARKER = '__tradovateBundleError'
+# Name of the last part, which sets VERSION_MARKER
+MARKER_PART = 'version-marker'
+
+# (file in scripts/tampermonkey, strip the IIFE wrapper so functions become page globals)
+DEFAULT_SCRIPTS = [
+    ('autoOrder.user.js', True),
+    ('getAllAccountTableData.user.js', False),
+    ('autoriskManagement.js', False),
+    ('changeAccount.user.js', False),
+    ('tradovateOps.js', False),
+    ('tradovateScraper.user.js', False),
+]
+
+
+def instruments_source() -> str:
+    registry = get_instrument_registry()
+    registry.reload_if_changed()
+    return registry.to_js()
+
+
+def default_generated() -> List[Tuple[str, Path, Callable[[], str]]]:
+    """Parts built from config, loaded ahead of the scripts: (name, watched file, source builder)"""
+    return [('instruments', get_project_root() / 'config' / 'trading_defaults.json', instruments_source)]
+
+
+def extract_core_functions(code):
+    # This is a simple extraction that removes the IIFE wrapper
+    lines = code.split('\n')
+    core_lines = []
+
+    for line in lines:
+        # Skip the IIFE start and end
+        if '(function ()' in line or line.strip() == '})();':
+            continue
+        else:
+            # Remove any leading indentation that was inside the IIFE
+            if line.startswith('    '):
+                line = line[4:]
+            core_lines.append(line)
+
+    return '\n'.join(core_lines)
+
+
+def on_dom_ready(name: str, source: str) -> str:
+    """
+    Wrap a part for Page.addScriptToEvaluateOnNewDocument
+
+    Scripts registered for new documents run before document.body exists, and the
+    userscripts build their UI at load. The wrapper runs the part as an inline
+    classic script (so its declarations stay page globals, as with Runtime.evaluate)
+    once the DOM is ready. Parts run in registration order; after one throws, the
+    rest, including the version marker, are skipped so the controller sees a stale
+    bundle and injects it again.
+    """
+    return (
+        "(function () {\n"
+        "    var run = function () {\n"
+        f"        if (window.{ERROR_MARKER}) return;\n"
+        "        var failure = null;\n"
+        "        var onError = function (event) { failure = event.error || event.message; };\n"
+        "        window.addEventListener('error', onError);\n"
+        "        var script = document.createElement('script');\n"
+        f"        script.textContent = {json.dumps(source)};\n"
+        "        (document.head || document.documentElement).appendChild(script);\n"
+        "        script.remove();\n"
+        "        window.removeEventListener('error', onError);\n"
+        "        if (failure) {\n"
+        f"            window.{ERROR_MARKER} = {json.dumps(name)} + ': ' + failure;\n"
+        f"            console.error('Script bundle part ' + {json.dumps(name)} + ' failed:', failure);\n"
+        "        }\n"
+        "    };\n"
+        "    if (document.readyState === 'loading') {\n"
+        "        document.addEventListener('DOMContentLoaded', run, { once: true });\n"
+        "    } else {\n"
+        "        run();\n"
+        "    }\n"
+        "})();"
+    )
+
+
+class ScriptBundle:
+    """The userscripts injected into every Tradovate tab, rebuilt only when a file changes"""
+
+    def __init__(self, script_dir: Optional[Path] = None, scripts: Optional[List[Tuple[str, bool]]] = None,
+                 generated: Optional[List[Tuple[str, Path, Callable[[], str]]]] = None):
+        """
+        Initialize the bundle
+
+        Args:
+            script_dir: Directory of the userscripts (defaults to scripts/tampermonkey)
+            scripts: (file name, strip IIFE) pairs in load order
+            generated: (name, watched file, source builder) parts loaded first; defaults to the
+                       instrument registry when the default scripts are used
+        """
+        self.script_dir = Path(script_dir) if script_dir else get_project_root() / 'scripts' / 'tampermonkey'
+        self.scripts = scripts if scripts is not None else DEFAULT_SCRIPTS
+        if generated is None:
+            generated = default_generated() if scripts is None else []
+        self.generated = generated
+        self.lock = threading.Lock()
+        self.mtimes = None
+        self.version = None
+        self.parts: List[Tuple[str, str]] = []
+
+    def get(self) -> Tuple[str, List[Tuple[str, str]]]:
+        """
+        Current version and parts, rebuilding if any script changed on disk
+
+        Returns:
+            (version, [(name, source), ...]); the last part sets the in-page version marker
+        """
+        mtimes = tuple(self._mtime(self.script_dir / name) for name, _ in self.scripts) + \
+            tuple(self._mtime(path) for _, path, _ in self.generated)
+        with self.lock:
+            if mtimes != self.mtimes:
+                self._build()
+                self.mtimes = mtimes
+            return self.version, list(self.parts)
+
+    def check_expression(self, version: str) -> str:
+        """Expression that is true when the page already runs this bundle version"""
+        return f"window.{VERSION_MARKER} === {json.dumps(version)}"
+
+    def _build(self) -> None:
+        """Read every script and hash the result (caller holds the lock)"""
+        parts = [(name, build()) for name, _, build in self.generated]
+        for name, strip_wrapper in self.scripts:
+            path = self.script_dir / name
+            if not path.exists():
+                print(f"[Script Bundle] Skipping missing script {path}")
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                source = f.read()
+            parts.append((name, extract_core_functions(source) if strip_wrapper else source))
+
+        digest = hashlib.sha256()
+        for name, source in parts:
+            digest.update(name.encode('utf-8'))
+            digest.update(source.encode('utf-8'))
+        self.version = digest.hexdigest()[:16]
+
+        parts.append((MARKER_PART, f"window.{VERSION_MARKER} = {json.dumps(self.version)};"))
+        self.parts = parts
+        print(f"[Script Bundle] Built version {self.version} from {len(parts) - 1} parts")
+
+    def _mtime(self, path: Path) -> Optional[float]:
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+
+# Global bundle instance
+_script_bundle = None
+
+def get_script_bundle() -> ScriptBundle:
+    """Get or create the global script bundle"""
+    global _script_bundle
+    if _script_bundle is None:
+        _script_bundle = ScriptBundle()
+    return _script_bundle
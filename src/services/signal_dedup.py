@@ -0,0 +1,211 @@
+"""
+Signal De-duplication for the webhook
+Recognizes TradingView alert retries and answers them from the first delivery's outcome
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+# Payload fields that carry a client-provided idempotency key, first present wins
+CLIENT_ID_FIELDS = ('idempotency_key', 'signal_id', 'alert_id', 'id')
+# Payload fields hashed when no client key is given
+CONTENT_FIELDS = ('strategy', 'symbol', 'action', 'orderQty', 'tradeType')
+# Payload fields holding the bar time ({{time}} in the alert message)
+BAR_TIME_FIELDS = ('time', 'bar_time', 'barTime')
+
+
+class SignalDeduplicator:
+    """
+    TTL-bounded LRU of signal keys seen recently, optionally persisted to a journal
+
+    A key is the client's idempotency key if the alert sends one, otherwise a hash of
+    strategy/symbol/action/qty/trade type and the bar time. Without a bar time two
+    genuine alerts look identical, so content-only keys expire after content_ttl.
+    """
+
+    def __init__(self, ttl: float = 600.0, content_ttl: float = 30.0, max_entries: int = 10000,
+                 journal_path: Optional[Path] = None):
+        """
+        Initialize the de-duplicator
+
+        Args:
+            ttl: Seconds a client key or a hash including the bar time is remembered
+            content_ttl: Seconds a hash without a bar time is remembered
+            max_entries: Keys kept in memory before the least recently seen are dropped
+            journal_path: JSON lines file keeping keys across restarts (None keeps them in memory only)
+        """
+        self.ttl = ttl
+        self.content_ttl = content_ttl
+        self.max_entries = max_entries
+        self.journal_path = Path(journal_path) if journal_path else None
+
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.signal_keys: Dict[str, str] = {}
+        self.stats = {'accepted': 0, 'duplicates': 0, 'released': 0, 'expired': 0}
+
+        if self.journal_path:
+            self._load_journal()
+
+    def key_for(self, data: Dict[str, Any], client_key: Optional[str] = None) -> Tuple[str, float]:
+        """
+        Idempotency key of a signal and how long it is remembered
+
+        Args:
+            data: Webhook payload
+            client_key: Key from an Idempotency-Key header, preferred over the payload
+
+        Returns:
+            (key, ttl in seconds)
+        """
+        if not client_key:
+            client_key = next((str(data[f]) for f in CLIENT_ID_FIELDS if data.get(f) not in (None, '')), None)
+        if client_key:
+            return f"id:{client_key}", self.ttl
+
+        bar_time = next((data[f] for f in BAR_TIME_FIELDS if data.get(f) not in (None, '')), None)
+        content = [str(data.get(f, '')).strip().upper() for f in CONTENT_FIELDS] + [str(bar_time or '')]
+        digest = hashlib.sha256('|'.join(content).encode('utf-8')).hexdigest()[:24]
+        return f"sha:{digest}", self.ttl if bar_time is not None else self.content_ttl
+
+    def claim(self, key: str, ttl: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Reserve a key for a new signal
+
+        Returns:
+            None if the key is new (the caller executes the signal), otherwise the
+            stored entry of the first delivery
+        """
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry['expires'] > now:
+                entry['duplicates'] += 1
+                self.entries.move_to_end(key)
+                self.stats['duplicates'] += 1
+                return dict(entry)
+
+            entry = {
+                'key': key,
+                'signal_id': None,
+                'status': 'pending',
+                'result': None,
+                'first_seen': now,
+                'expires': now + (self.ttl if ttl is None else ttl),
+                'duplicates': 0
+            }
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            self.stats['accepted'] += 1
+            self._evict(now)
+            self._journal(entry)
+            return None
+
+    def attach(self, key: str, signal_id: str) -> None:
+        """Link a claimed key to the queued signal executing it"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return
+            entry['signal_id'] = signal_id
+            entry['status'] = 'queued'
+            self.signal_keys[signal_id] = key
+            self._journal(entry)
+
+    def complete(self, key: str, result: Any, status: str = 'completed') -> None:
+        """Store the outcome that later duplicates of this key are answered with"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return
+            entry['status'] = status
+            entry['result'] = result
+            self._journal(entry)
+
+    def complete_signal(self, signal_id: str, result: Any, status: str = 'completed') -> None:
+        """complete() by the ID of the queued signal"""
+        with self.lock:
+            key = self.signal_keys.pop(signal_id, None)
+        if key:
+            self.complete(key, result, status)
+
+    def release(self, key: str) -> None:
+        """Forget a claimed key whose signal was never executed, so a retry goes through"""
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is None:
+                return
+            if entry['signal_id']:
+                self.signal_keys.pop(entry['signal_id'], None)
+            self.stats['released'] += 1
+            self._journal({'key': key, 'released': True})
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return dict(self.stats, entries=len(self.entries), journal=str(self.journal_path) if self.journal_path else None)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired keys and the least recently seen beyond max_entries (caller holds the lock)"""
+        for key in [k for k, e in self.entries.items() if e['expires'] <= now]:
+            self._drop(key)
+            self.stats['expired'] += 1
+        while len(self.entries) > self.max_entries:
+            self._drop(next(iter(self.entries)))
+
+    def _drop(self, key: str) -> None:
+        entry = self.entries.pop(key)
+        if entry['signal_id']:
+            self.signal_keys.pop(entry['signal_id'], None)
+
+    def _journal(self, entry: Dict[str, Any]) -> None:
+        """Append the entry's current state to the journal (caller holds the lock)"""
+        if not self.journal_path:
+            return
+        try:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, default=str, separators=(',', ':')) + '\n')
+        except Exception as e:
+            print(f"[Signal Dedup] Error writing journal {self.journal_path}: {e}")
+
+    def _load_journal(self) -> None:
+        """Restore unexpired keys and compact the journal down to them"""
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        now = time.time()
+        entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn final line after a crash
+                    key = entry.get('key')
+                    entries.pop(key, None)
+                    if not entry.get('released') and entry.get('expires', 0) > now:
+                        entries[key] = entry
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[Signal Dedup] Error reading journal {self.journal_path}: {e}")
+
+        # A signal that was still queued or running when the process died has an unknown outcome
+        for entry in entries.values():
+            if entry['status'] in ('pending', 'queued'):
+                entry['status'] = 'interrupted'
+        self.entries = OrderedDict(list(entries.items())[-self.max_entries:])
+
+        tmp_path = self.journal_path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for entry in self.entries.values():
+                    f.write(json.dumps(entry, default=str, separators=(',', ':')) + '\n')
+            os.replace(tmp_path, self.journal_path)
+        except Exception as e:
+            print(f"[Signal Dedup] Error compacting journal {self.journal_path}: {e}")
@@ -0,0 +1,295 @@
+"""
+Signal Journal for the webhook
+Append-only record of every accepted signal and of its progress on each account, fsynced in groups
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+# Per-account execution states, in pipeline order
+ACCOUNT_STATES = ('received', 'switched', 'submitted', 'confirmed', 'failed')
+# An order may have reached Tradovate once an account is past these states
+PRE_ORDER_STATES = ('received', 'switched')
+
+
+class SignalJournal:
+    """
+    Durable log of signals and their per-account states
+
+    record() only appends to an in-memory buffer; a writer thread writes everything
+    buffered since its last pass and fsyncs once for the whole group, so intake never
+    waits on the disk. Call flush() where a caller must know its events are durable.
+    """
+
+    def __init__(self, path: Path, commit_interval: float = 0.05, history_size: int = 5000):
+        """
+        Initialize the journal, replaying the existing file into memory
+
+        Args:
+            path: JSON lines journal file
+            commit_interval: Longest time an event waits in the buffer before it is written and fsynced
+            history_size: Number of signals kept in memory for queries
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.commit_interval = commit_interval
+        self.history_size = history_size
+
+        self.lock = threading.Lock()
+        self.wakeup = threading.Condition(self.lock)  # writer waits for events
+        self.commits = threading.Condition(self.lock)  # flush() waits for the writer
+        self.buffer: List[str] = []
+        self.written = 0  # events appended to buffer so far
+        self.committed = 0  # events fsynced so far
+        self.signals: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.stats = {'events': 0, 'commits': 0, 'write_errors': 0, 'last_commit_ms': None}
+
+        self._load()
+        self._running = True
+        self._writer = threading.Thread(target=self._write_loop, name="signal-journal", daemon=True)
+        self._writer.start()
+
+    def received(self, signal_id: str, signal: Dict[str, Any], source: str = 'webhook') -> None:
+        """Record a signal accepted for execution"""
+        self.record({'event': 'received', 'id': signal_id, 'signal': signal, 'source': source})
+
+    def account_state(self, signal_id: str, account_index: int, state: str,
+                      account: Optional[str] = None, detail: Any = None) -> None:
+        """
+        Record a signal's progress on one account
+
+        Args:
+            signal_id: Signal the account is executing
+            account_index: Connection index of the tab
+            state: One of ACCOUNT_STATES
+            account: Account name the tab switched to
+            detail: Order result or error message
+        """
+        if state not in ACCOUNT_STATES:
+            raise ValueError(f"Unknown account state: {state}")
+        self.record({'event': 'account', 'id': signal_id, 'account_index': account_index,
+                     'state': state, 'account': account, 'detail': detail})
+
+    def finished(self, signal_id: str, status: str, result: Any = None) -> None:
+        """Record a signal whose execution ended (completed, failed or interrupted)"""
+        self.record({'event': 'finished', 'id': signal_id, 'status': status, 'result': result})
+
+    def record(self, event: Dict[str, Any]) -> None:
+        """Apply an event to the in-memory view and queue it for the next group commit"""
+        event = dict(event, ts=datetime.now().isoformat())
+        line = json.dumps(event, default=str, separators=(',', ':')) + '\n'
+        with self.lock:
+            self._apply(event)
+            self.buffer.append(line)
+            self.written += 1
+            self.stats['events'] += 1
+            self.wakeup.notify()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every event recorded so far is on disk"""
+        deadline = time.monotonic() + timeout
+        with self.lock:
+            target = self.written
+            self.wakeup.notify()
+            while self.committed < target:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.commits.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        """Write what is buffered and stop the writer thread"""
+        self.flush()
+        with self.lock:
+            self._running = False
+            self.wakeup.notify_all()
+        self._writer.join(timeout=5)
+
+    def get(self, signal_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            signal = self.signals.get(signal_id)
+            return self._copy(signal) if signal else None
+
+    def query(self, limit: int = 50, status: Optional[str] = None, strategy: Optional[str] = None,
+              symbol: Optional[str] = None, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Signals matching the filters, newest first
+
+        Args:
+            limit: Maximum number of signals returned
+            status: Signal status (running, completed, failed, interrupted)
+            strategy: Strategy name from the payload
+            symbol: Symbol from the payload, as sent
+            since: ISO timestamp; only signals received at or after it
+        """
+        with self.lock:
+            matches = []
+            for signal in reversed(self.signals.values()):
+                payload = signal['signal'] or {}
+                if status and signal['status'] != status:
+                    continue
+                if strategy and payload.get('strategy', 'DEFAULT') != strategy:
+                    continue
+                if symbol and str(payload.get('symbol', '')).upper() != symbol.upper():
+                    continue
+                if since and signal['received_at'] < since:
+                    continue
+                matches.append(self._copy(signal))
+                if len(matches) >= limit:
+                    break
+            return matches
+
+    def incomplete(self) -> List[Dict[str, Any]]:
+        """Signals received but never finished, oldest first; after a restart these were cut short"""
+        with self.lock:
+            return [self._copy(s) for s in self.signals.values() if s['status'] == 'running']
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return dict(self.stats, buffered=len(self.buffer), signals=len(self.signals),
+                        running=sum(1 for s in self.signals.values() if s['status'] == 'running'),
+                        path=str(self.path))
+
+    def _apply(self, event: Dict[str, Any]) -> None:
+        """Fold one event into self.signals (caller holds the lock)"""
+        signal_id = event['id']
+        signal = self.signals.get(signal_id)
+        if event['event'] == 'received':
+            signal = {
+                'id': signal_id,
+                'signal': event.get('signal'),
+                'source': event.get('source'),
+                'status': 'running',
+                'received_at': event['ts'],
+                'finished_at': None,
+                'result': None,
+                'accounts': {}
+            }
+            self.signals[signal_id] = signal
+            self.signals.move_to_end(signal_id)
+            while len(self.signals) > self.history_size:
+                self.signals.popitem(last=False)
+        elif signal is None:
+            return  # older than the history kept in memory
+        elif event['event'] == 'account':
+            account = signal['accounts'].setdefault(str(event['account_index']), {'account': None})
+            account['state'] = event['state']
+            account['account'] = event.get('account') or account['account']
+            account['detail'] = event.get('detail')
+            account['updated_at'] = event['ts']
+        elif event['event'] == 'finished':
+            signal['status'] = event['status']
+            signal['result'] = event.get('result')
+            signal['finished_at'] = event['ts']
+
+    def _load(self) -> None:
+        """Rebuild the in-memory view from the journal file, dropping signals beyond history_size from it"""
+        received = 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue  # torn final line after a crash
+                    received += event.get('event') == 'received'
+                    self._apply(event)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"[Signal Journal] Error reading {self.path}: {e}")
+            return
+        if received > len(self.signals):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite the journal as the events of the signals kept in memory (before the writer starts)"""
+        tmp_path = self.path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for signal in self.signals.values():
+                    events = [{'event': 'received', 'id': signal['id'], 'signal': signal['signal'],
+                               'source': signal['source'], 'ts': signal['received_at']}]
+                    events += [{'event': 'account', 'id': signal['id'], 'account_index': int(index),
+                                'state': a['state'], 'account': a['account'], 'detail': a['detail'],
+                                'ts': a['updated_at']} for index, a in signal['accounts'].items()]
+                    if signal['finished_at']:
+                        events.append({'event': 'finished', 'id': signal['id'], 'status': signal['status'],
+                                       'result': signal['result'], 'ts': signal['finished_at']})
+                    f.writelines(json.dumps(e, default=str, separators=(',', ':')) + '\n' for e in events)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"[Signal Journal] Error compacting {self.path}: {e}")
+
+    def _write_loop(self) -> None:
+        """Group commit: one write and one fsync for everything buffered since the last pass"""
+        f = None
+        try:
+            while True:
+                with self.lock:
+                    while not self.buffer and self._running:
+                        self.wakeup.wait(self.commit_interval)
+                    if not self.buffer and not self._running:
+                        return
+                    lines, self.buffer = self.buffer, []
+                    batch_end = self.written
+
+                started = time.monotonic()
+                size = None
+                try:
+                    f = f or open(self.path, 'ab')
+                    size = f.tell()
+                    f.write(''.join(lines).encode('utf-8'))
+                    f.flush()
+                    os.fsync(f.fileno())
+                except Exception as e:
+                    print(f"[Signal Journal] Error writing {self.path}: {e}")
+                    self._discard_partial_write(f, size)
+                    f = None
+                    # Keep the lines for the next pass; committed stays put, so flush() keeps waiting
+                    with self.lock:
+                        self.buffer[:0] = lines
+                        self.stats['write_errors'] += 1
+                        if not self._running:
+                            return
+                    time.sleep(self.commit_interval)
+                    continue
+
+                with self.lock:
+                    self.committed = batch_end
+                    self.stats['commits'] += 1
+                    self.stats['last_commit_ms'] = round((time.monotonic() - started) * 1000, 3)
+                    self.commits.notify_all()
+
+                # Let events arriving meanwhile gather into the next group
+                time.sleep(self.commit_interval)
+        finally:
+            if f:
+                f.close()
+
+    def _discard_partial_write(self, f, size: Optional[int]) -> None:
+        """Cut the file back to its size before a failed write, so the retry doesn't journal lines twice"""
+        if f:
+            try:
+                f.close()
+            except Exception:
+                pass  # closing flushes the same data that just failed
+        if size is not None:
+            try:
+                os.truncate(self.path, size)
+            except Exception as e:
+                print(f"[Signal Journal] Error truncating {self.path}: {e}")
+
+    @staticmethod
+    def _copy(signal: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(signal, accounts={k: dict(v) for k, v in signal['accounts'].items()})
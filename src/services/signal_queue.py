@@ -0,0 +1,248 @@
+"""
+Signal Queue for asynchronous webhook intake
+Accepts validated trading signals, executes them on a worker pool and tracks their outcome
+"""
+
+import heapq
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from .tab_lock import PRIORITY_EXIT, PRIORITY_NORMAL
+
+
+class QueueFullError(Exception):
+    """Raised when a signal is submitted while the queue is at capacity"""
+
+
+class SignalQueue:
+    """
+    Bounded, priority-aware queue of trading signals drained by worker threads
+
+    Close signals form their own lane: they are taken before any queued Open, have
+    their own max_size so a burst of entries cannot get an exit rejected, and can be
+    given express workers that take nothing else, so an exit never waits for a
+    worker busy with an Open.
+    """
+
+    # Lower value runs first; exits must never wait behind a burst of entries
+    PRIORITY_CLOSE = PRIORITY_EXIT
+    PRIORITY_OPEN = PRIORITY_NORMAL
+
+    def __init__(self, handler: Callable[[Dict[str, Any]], Dict[str, Any]],
+                 max_size: int = 100, workers: int = 4, history_size: int = 1000,
+                 on_finish: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 pass_signal_id: bool = False, express_workers: int = 0):
+        """
+        Initialize the signal queue
+
+        Args:
+            handler: Callable executing one signal and returning its result
+            max_size: Maximum number of signals of one priority waiting to be executed
+            workers: Number of worker threads draining the queue
+            history_size: Number of finished signals kept for status lookups
+            on_finish: Called with the finished signal's record from the worker thread
+            pass_signal_id: Call handler(data, signal_id) so it can report progress under the signal's ID
+            express_workers: Additional worker threads that only execute Close signals
+        """
+        self.handler = handler
+        self.on_finish = on_finish
+        self.pass_signal_id = pass_signal_id
+        self.max_size = max_size
+        self.workers = workers
+        self.express_workers = express_workers
+        self.history_size = history_size
+
+        # Heap of (priority, sequence, signal_id); sequence keeps each lane first in, first out
+        self.pending: List[tuple] = []
+        self.records: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.available = threading.Condition(self.lock)
+        self._sequence = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._running = False
+
+        self.stats = {
+            'submitted': 0,
+            'rejected': 0,
+            'completed': 0,
+            'failed': 0
+        }
+
+    def start(self) -> None:
+        """Start the worker threads"""
+        with self.lock:
+            if self._running:
+                return
+            self._running = True
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"signal-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            for i in range(self.express_workers):
+                thread = threading.Thread(target=self._worker, args=(self.PRIORITY_CLOSE,),
+                                          name=f"signal-express-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the worker threads; signals still queued stay queued"""
+        with self.lock:
+            self._running = False
+            threads, self._threads = self._threads, []
+            self.available.notify_all()
+        for thread in threads:
+            thread.join(timeout=timeout)
+
+    @classmethod
+    def priority_for(cls, data: Dict[str, Any]) -> int:
+        """Close signals jump ahead of Open signals"""
+        return cls.PRIORITY_CLOSE if data.get("tradeType") == "Close" else cls.PRIORITY_OPEN
+
+    def submit(self, data: Dict[str, Any], priority: Optional[int] = None,
+               signal_id: Optional[str] = None) -> str:
+        """
+        Queue a signal for execution
+
+        Args:
+            data: Validated webhook payload
+            priority: Explicit priority (defaults to priority_for(data))
+            signal_id: ID to use instead of a generated one, for callers that must know it before the signal runs
+
+        Returns:
+            The signal ID to poll for the outcome
+
+        Raises:
+            QueueFullError: If max_size signals of this priority are already waiting
+        """
+        if priority is None:
+            priority = self.priority_for(data)
+
+        signal_id = signal_id or self.new_id()
+        record = {
+            'id': signal_id,
+            'status': 'queued',
+            'priority': priority,
+            'signal': data,
+            'received_at': datetime.now().isoformat(),
+            'started_at': None,
+            'finished_at': None,
+            'queue_wait': None,
+            'duration': None,
+            'result': None,
+            'error': None,
+            '_enqueued': time.monotonic()
+        }
+
+        with self.lock:
+            if sum(1 for p, _, _ in self.pending if p == priority) >= self.max_size:
+                self.stats['rejected'] += 1
+                raise QueueFullError(f"Signal queue is full ({self.max_size} signals waiting)")
+            heapq.heappush(self.pending, (priority, next(self._sequence), signal_id))
+            self.available.notify_all()
+            self.records[signal_id] = record
+            self.stats['submitted'] += 1
+            self._trim_history()
+
+        return signal_id
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex[:12]
+
+    def get(self, signal_id: str) -> Optional[Dict[str, Any]]:
+        """Get the current state of a signal, or None if unknown"""
+        with self.lock:
+            record = self.records.get(signal_id)
+            return self._public(record) if record else None
+
+    def list_signals(self, limit: int = 50, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get the most recent signals, newest first"""
+        with self.lock:
+            records = [r for r in reversed(self.records.values())
+                       if status is None or r['status'] == status]
+            return [self._public(r) for r in records[:limit]]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth and lifetime counters"""
+        with self.lock:
+            stats = self.stats.copy()
+            stats['queued'] = len(self.pending)
+            stats['queued_close'] = sum(1 for p, _, _ in self.pending if p == self.PRIORITY_CLOSE)
+            stats['running'] = sum(1 for r in self.records.values() if r['status'] == 'running')
+            stats['workers'] = len(self._threads)
+            stats['express_workers'] = self.express_workers if self._running else 0
+            stats['max_size'] = self.max_size
+            return stats
+
+    def _worker(self, only_priority: Optional[int] = None) -> None:
+        """
+        Drain the queue until stopped
+
+        Args:
+            only_priority: Take only signals of this priority (express workers)
+        """
+        while True:
+            with self.lock:
+                while self._running and not self._takeable(only_priority):
+                    self.available.wait(0.5)
+                if not self._running:
+                    return
+                _, _, signal_id = heapq.heappop(self.pending)
+                record = self.records.get(signal_id)
+                if record is None:
+                    continue
+                record['status'] = 'running'
+                record['started_at'] = datetime.now().isoformat()
+                record['queue_wait'] = round(time.monotonic() - record['_enqueued'], 3)
+                started = time.monotonic()
+
+            try:
+                if self.pass_signal_id:
+                    result = self.handler(record['signal'], signal_id)
+                else:
+                    result = self.handler(record['signal'])
+                status = 'failed' if isinstance(result, dict) and result.get('status') == 'error' else 'completed'
+                error = result.get('message') if status == 'failed' else None
+            except Exception as e:
+                result, status, error = None, 'failed', str(e)
+                print(f"[Signal Queue] Signal {signal_id} failed: {e}")
+
+            with self.lock:
+                record['status'] = status
+                record['result'] = result
+                record['error'] = error
+                record['finished_at'] = datetime.now().isoformat()
+                record['duration'] = round(time.monotonic() - started, 3)
+                self.stats[status] += 1
+                finished = self._public(record)
+
+            if self.on_finish:
+                try:
+                    self.on_finish(finished)
+                except Exception as e:
+                    print(f"[Signal Queue] on_finish failed for {signal_id}: {e}")
+
+    def _takeable(self, only_priority: Optional[int]) -> bool:
+        """Whether a worker restricted to only_priority has a signal to take (caller holds the lock)"""
+        if not self.pending:
+            return False
+        return only_priority is None or self.pending[0][0] == only_priority
+
+    def _trim_history(self) -> None:
+        """Drop the oldest finished signals beyond history_size (caller holds the lock)"""
+        excess = len(self.records) - self.history_size
+        if excess <= 0:
+            return
+        for signal_id in [sid for sid, r in self.records.items()
+                          if r['status'] in ('completed', 'failed')][:excess]:
+            del self.records[signal_id]
+
+    @staticmethod
+    def _public(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a record without internal bookkeeping fields"""
+        return {k: v for k, v in record.items() if not k.startswith('_')}
@@ -0,0 +1,183 @@
+"""
+Strategy Router for the webhook
+Keeps strategy mappings and the account switcher script in memory and indexes which tab holds each account
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..utils.core import get_project_root
+
+
+class StrategyRouter:
+    """
+    Routing table from strategy name to (tab index, account name)
+
+    Files are re-read only when their mtime or size changes. Which tab holds which
+    account is learned from the account dropdowns seen while switching; strategies
+    whose accounts are all located go to those tabs only, the rest to every tab.
+    """
+
+    def __init__(self, mappings_file: Optional[Path] = None, switcher_paths: Optional[List[Path]] = None):
+        """
+        Initialize the router
+
+        Args:
+            mappings_file: strategy_mappings.json (defaults to config/strategy_mappings.json)
+            switcher_paths: Candidate locations of changeAccount.user.js, first existing wins
+        """
+        project_root = get_project_root()
+        self.mappings_file = Path(mappings_file) if mappings_file else project_root / 'config' / 'strategy_mappings.json'
+        self.switcher_paths = [Path(p) for p in switcher_paths] if switcher_paths else [
+            project_root / 'src' / 'tampermonkey' / 'changeAccount.user.js',
+            project_root / 'scripts' / 'tampermonkey' / 'changeAccount.user.js'
+        ]
+
+        self.lock = threading.Lock()
+        self.mappings_stamp = None
+        self.strategies: Dict[str, List[str]] = {}
+        self.switcher_stamp = None
+        self.switcher_script: Optional[str] = None
+
+        # account name -> tab indices it was seen on, and the index built from it
+        self.account_tabs: Dict[str, Set[int]] = {}
+        self.index: Dict[str, List[Tuple[int, str]]] = {}
+        self.stats = {'lookups': 0, 'mapping_reloads': 0, 'switcher_reloads': 0}
+
+    def get_accounts(self, strategy: str) -> List[str]:
+        """Account names mapped to a strategy, falling back to DEFAULT; empty if neither is mapped"""
+        with self.lock:
+            self._refresh_mappings()
+            return list(self._accounts_for(strategy))
+
+    def route(self, strategy: str, tab_count: int) -> Tuple[List[int], List[str]]:
+        """
+        Tabs to run a strategy's signal on and the accounts to switch to there
+
+        Returns:
+            (tab indices, account names); every tab and no names if the strategy is unmapped
+        """
+        all_tabs = list(range(tab_count))
+        with self.lock:
+            self.stats['lookups'] += 1
+            self._refresh_mappings()
+            accounts = self._accounts_for(strategy)
+            if not accounts:
+                return all_tabs, []
+            routes = self.index.get(strategy if self.strategies.get(strategy) else 'DEFAULT', [])
+            located = {account for _, account in routes}
+            if set(accounts) - located:
+                return all_tabs, list(accounts)
+            tabs = sorted({tab for tab, _ in routes if tab < tab_count})
+            return (tabs or all_tabs), list(accounts)
+
+    def order_for_tab(self, tab_index: int, account_names: List[str]) -> List[str]:
+        """Accounts seen on this tab first, then ones not located yet; accounts seen only elsewhere are left out"""
+        with self.lock:
+            here = [name for name in account_names if tab_index in self.account_tabs.get(name, ())]
+            unknown = [name for name in account_names if name not in self.account_tabs]
+        return here + unknown
+
+    def learn(self, tab_index: int, accounts: List[str], complete: bool = False) -> None:
+        """
+        Record accounts available on a tab
+
+        Args:
+            tab_index: Connection index
+            accounts: Account names seen in that tab's account dropdown
+            complete: The list is the tab's whole dropdown, so accounts missing from it are not on this tab
+        """
+        with self.lock:
+            if complete:
+                for tabs in self.account_tabs.values():
+                    tabs.discard(tab_index)
+            changed = False
+            for account in accounts:
+                tabs = self.account_tabs.setdefault(account, set())
+                if tab_index not in tabs:
+                    tabs.add(tab_index)
+                    changed = True
+            if changed or complete:
+                self.account_tabs = {name: tabs for name, tabs in self.account_tabs.items() if tabs}
+                self._build_index()
+
+    def reset_locations(self) -> None:
+        """Forget which tab holds which account; call when connections are rebuilt"""
+        with self.lock:
+            self.account_tabs = {}
+            self.index = {}
+
+    def get_switcher_script(self) -> Optional[str]:
+        """changeAccount.user.js from memory, re-read only when the file changes"""
+        with self.lock:
+            for path in self.switcher_paths:
+                stamp = self._stamp(path)
+                if stamp is None:
+                    continue
+                if (path, stamp) != self.switcher_stamp:
+                    with open(path, 'r') as file:
+                        self.switcher_script = file.read()
+                    self.switcher_stamp = (path, stamp)
+                    self.stats['switcher_reloads'] += 1
+                return self.switcher_script
+            self.switcher_stamp = None
+            self.switcher_script = None
+            return None
+
+    def get_status(self) -> Dict[str, Any]:
+        with self.lock:
+            return dict(
+                self.stats,
+                strategies=len(self.strategies),
+                located_accounts={name: sorted(tabs) for name, tabs in self.account_tabs.items()},
+                index={strategy: routes for strategy, routes in self.index.items()}
+            )
+
+    def _accounts_for(self, strategy: str) -> List[str]:
+        return self.strategies.get(strategy) or self.strategies.get('DEFAULT') or []
+
+    def _refresh_mappings(self) -> None:
+        """Reload the mappings if the file changed (caller holds the lock)"""
+        stamp = self._stamp(self.mappings_file)
+        if stamp == self.mappings_stamp:
+            return
+        self.mappings_stamp = stamp
+        strategies = {}
+        if stamp is not None:
+            try:
+                with open(self.mappings_file, 'r') as file:
+                    strategies = json.load(file).get('strategy_mappings', {})
+            except Exception as e:
+                print(f"[Strategy Router] Error loading {self.mappings_file}: {e}")
+        self.strategies = strategies
+        self.stats['mapping_reloads'] += 1
+        self._build_index()
+
+    def _build_index(self) -> None:
+        """strategy -> [(tab index, account name)] for every located account (caller holds the lock)"""
+        self.index = {
+            strategy: [(tab, account) for account in accounts for tab in sorted(self.account_tabs.get(account, ()))]
+            for strategy, accounts in self.strategies.items()
+        }
+
+    @staticmethod
+    def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+
+# Global router instance
+_strategy_router = None
+
+def get_strategy_router() -> StrategyRouter:
+    """Get or create the global strategy router"""
+    global _strategy_router
+    if _strategy_router is None:
+        _strategy_router = StrategyRouter()
+    return _strategy_router
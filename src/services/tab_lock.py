@@ -0,0 +1,115 @@
+"""
+Tab Lock for Tradovate connections
+Reentrant lock serializing commands on one tab, granted to waiting exits before waiting entries
+"""
+
+import heapq
+import itertools
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+# Lower value is granted first
+PRIORITY_EXIT = 0
+PRIORITY_NORMAL = 1
+
+
+class TabLock:
+    """
+    Drop-in replacement for the connection's RLock with priority lanes
+
+    The holder is never interrupted, so a multi-step flow (switch -> symbol -> order)
+    still runs as a unit. When the lock is released it goes to the waiter with the
+    lowest priority value, first come first served within a priority; an exit that
+    arrives behind queued entries runs right after the flow in progress.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._owner: Optional[int] = None
+        self._count = 0
+        # Heap of [priority, sequence, thread ident]
+        self._waiters: List[list] = []
+        self._sequence = itertools.count()
+        self.stats = {'acquired': 0, 'contended': 0, 'preempted': 0}
+
+    def acquire(self, blocking: bool = True, timeout: float = -1, priority: int = PRIORITY_NORMAL) -> bool:
+        """
+        Acquire the lock; reentrant for the thread holding it
+
+        Args:
+            blocking: Wait for the lock instead of failing at once
+            timeout: Seconds to wait; -1 waits forever
+            priority: PRIORITY_EXIT is granted ahead of waiting PRIORITY_NORMAL callers
+
+        Returns:
+            bool: True if the lock was acquired
+        """
+        me = threading.get_ident()
+        with self._cond:
+            if self._owner == me:
+                self._count += 1
+                return True
+            if self._owner is None and not self._waiters:
+                self._take(me)
+                return True
+            if not blocking:
+                return False
+
+            entry = [priority, next(self._sequence), me]
+            heapq.heappush(self._waiters, entry)
+            self.stats['contended'] += 1
+            granted = self._cond.wait_for(
+                lambda: self._owner is None and self._waiters[0] is entry,
+                None if timeout < 0 else timeout)
+            if not granted:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+                return False
+
+            heapq.heappop(self._waiters)
+            if any(waiter[1] < entry[1] for waiter in self._waiters):
+                self.stats['preempted'] += 1
+            self._take(me)
+            return True
+
+    def release(self) -> None:
+        with self._cond:
+            if self._owner != threading.get_ident():
+                raise RuntimeError("cannot release un-acquired lock")
+            self._count -= 1
+            if self._count == 0:
+                self._owner = None
+                self._cond.notify_all()
+
+    @contextmanager
+    def prioritized(self, priority: Optional[int]) -> Iterator[None]:
+        """with lock.prioritized(PRIORITY_EXIT): ...; None means PRIORITY_NORMAL"""
+        self.acquire(priority=PRIORITY_NORMAL if priority is None else priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return dict(
+                self.stats,
+                held=self._owner is not None,
+                waiting_exits=sum(1 for w in self._waiters if w[0] == PRIORITY_EXIT),
+                waiting=len(self._waiters)
+            )
+
+    def _take(self, me: int) -> None:
+        """Become the holder (caller holds the condition)"""
+        self._owner = me
+        self._count = 1
+        self.stats['acquired'] += 1
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
@@ -0,0 +1,209 @@
+"""
+Trade Store for scraped Tradovate trades
+Append-only NDJSON segments with size/time rotation and a small JSON manifest
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+class TradeStore:
+    """Append-only segmented storage for trade records"""
+
+    MANIFEST_NAME = 'manifest.json'
+
+    def __init__(self, data_dir: Path, max_segment_bytes: int = 8 * 1024 * 1024,
+                 max_segment_age: int = 3600):
+        """
+        Initialize the trade store
+
+        Args:
+            data_dir: Directory holding the segments and the manifest
+            max_segment_bytes: Segment size that triggers rotation
+            max_segment_age: Seconds after which the open segment is rotated
+        """
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.data_dir / self.MANIFEST_NAME
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+
+        self.lock = threading.Lock()
+        self.segments: List[Dict[str, Any]] = []
+        self._load_manifest()
+
+    def append(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Append records to the open segment
+
+        Cost is proportional to the records written; existing segments are never rewritten.
+
+        Returns:
+            Number of records written
+        """
+        lines = [json.dumps(record, separators=(',', ':')) + '\n' for record in records]
+        if not lines:
+            return 0
+
+        payload = ''.join(lines).encode('utf-8')
+        with self.lock:
+            segment = self._writable_segment(len(payload))
+            with open(self.data_dir / segment['file'], 'ab') as f:
+                f.write(payload)
+            segment['records'] += len(lines)
+            segment['bytes'] += len(payload)
+            segment['updated'] = time.time()
+            self._save_manifest()
+        return len(lines)
+
+    def iter_records(self, start_date: Optional[str] = None,
+                     end_date: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream records segment by segment, oldest first
+
+        Args:
+            start_date: First day to include (YYYY-MM-DD), defaults to everything
+            end_date: Last day to include (YYYY-MM-DD), defaults to everything
+        """
+        for path in self.segment_paths(start_date, end_date):
+            if path.suffix == '.json':
+                # Day file written before the segment store existed
+                try:
+                    with open(path, 'r') as f:
+                        yield from json.load(f)
+                except (OSError, ValueError):
+                    continue
+                continue
+
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            yield json.loads(line)
+                        except ValueError:
+                            # Torn final line after a crash
+                            continue
+            except OSError:
+                continue
+
+    def segment_paths(self, start_date: Optional[str] = None,
+                      end_date: Optional[str] = None) -> List[Path]:
+        """Paths of the segments (and legacy day files) within the date range, oldest first"""
+        with self.lock:
+            entries = [(s['date'], 1, s['seq'], self.data_dir / s['file']) for s in self.segments]
+
+        for path in self.data_dir.glob('*_trades.json'):
+            entries.append((path.stem.split('_')[0], 0, 0, path))
+
+        return [path for date, _, _, path in sorted(entries)
+                if (start_date is None or date >= start_date) and (end_date is None or date <= end_date)]
+
+    def remove_before(self, cutoff_date: str) -> List[str]:
+        """Delete segments and legacy day files from days before cutoff_date (YYYY-MM-DD)"""
+        removed = []
+        with self.lock:
+            keep = []
+            for segment in self.segments:
+                if segment['date'] < cutoff_date:
+                    try:
+                        (self.data_dir / segment['file']).unlink()
+                    except FileNotFoundError:
+                        pass
+                    removed.append(segment['file'])
+                else:
+                    keep.append(segment)
+            self.segments = keep
+            self._save_manifest()
+
+        for path in self.data_dir.glob('*_trades.json'):
+            if path.stem.split('_')[0] < cutoff_date:
+                path.unlink()
+                removed.append(path.name)
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Segment count, record count and bytes on disk"""
+        with self.lock:
+            return {
+                'segments': len(self.segments),
+                'records': sum(s['records'] for s in self.segments),
+                'bytes': sum(s['bytes'] for s in self.segments),
+                'open_segment': self.segments[-1]['file'] if self.segments and not self.segments[-1]['closed'] else None
+            }
+
+    def _writable_segment(self, incoming_bytes: int) -> Dict[str, Any]:
+        """The open segment, rotating on day change, size or age (caller holds the lock)"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        current = self.segments[-1] if self.segments else None
+
+        if current and not current['closed']:
+            too_big = current['bytes'] > 0 and current['bytes'] + incoming_bytes > self.max_segment_bytes
+            too_old = time.time() - current['created'] > self.max_segment_age
+            if current['date'] == today and not too_big and not too_old:
+                return current
+            current['closed'] = True
+
+        seq = max((s['seq'] for s in self.segments if s['date'] == today), default=0) + 1
+        segment = {
+            'file': f"{today}_trades_{seq:04d}.ndjson",
+            'date': today,
+            'seq': seq,
+            'created': time.time(),
+            'updated': time.time(),
+            'records': 0,
+            'bytes': 0,
+            'closed': False
+        }
+        self.segments.append(segment)
+        return segment
+
+    def _load_manifest(self) -> None:
+        """Load the manifest, or rebuild it from the segment files on disk"""
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'r') as f:
+                    self.segments = json.load(f).get('segments', [])
+            except (OSError, ValueError) as e:
+                print(f"[Trade Store] Manifest unreadable, rebuilding: {e}")
+                self.segments = []
+
+        known = {s['file'] for s in self.segments}
+        for path in sorted(self.data_dir.glob('*_trades_*.ndjson')):
+            if path.name in known:
+                continue
+            date, _, seq = path.stem.split('_')
+            with open(path, 'rb') as f:
+                records = sum(1 for line in f if line.strip())
+            self.segments.append({
+                'file': path.name,
+                'date': date,
+                'seq': int(seq),
+                'created': path.stat().st_mtime,
+                'updated': path.stat().st_mtime,
+                'records': records,
+                'bytes': path.stat().st_size,
+                'closed': True
+            })
+
+        # Sizes may lag behind the files after a crash between write and manifest save
+        for segment in self.segments:
+            path = self.data_dir / segment['file']
+            if path.exists():
+                segment['bytes'] = path.stat().st_size
+
+        self.segments = [s for s in self.segments if (self.data_dir / s['file']).exists()]
+        self.segments.sort(key=lambda s: (s['date'], s['seq']))
+
+    def _save_manifest(self) -> None:
+        """Atomically replace the manifest (caller holds the lock)"""
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': 1, 'segments': self.segments}, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
@@ -0,0 +1,112 @@
+"""
+Tests for the dashboard account snapshots in src/services/account_snapshot_service.py
+"""
+
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+# Add project root to path
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src import app
+from src.services.account_snapshot_service import AccountSnapshotService
+
+
+def make_connection(index, rows):
+    conn = MagicMock()
+    conn.account_name = f"Account {index+1}"
+    conn.port = 9223 + index
+    conn.lock = threading.RLock()
+    conn.tab.Runtime.evaluate.return_value = {"result": {"value": json.dumps(rows)}}
+    return conn
+
+
+def make_controller(*connections):
+    with patch.object(app.TradovateController, "initialize_connections"):
+        controller = app.TradovateController()
+    controller.connections = list(connections)
+    return controller
+
+
+class TestAccountSnapshotService:
+    """Tests for AccountSnapshotService"""
+
+    def test_refresh_collects_rows_in_connection_order(self):
+        controller = make_controller(
+            make_connection(0, [{"Account ▲": "DEMO1", "Total P&L": 10}]),
+            make_connection(1, [{"Account": "DEMO2", "User": "2"}])
+        )
+        service = AccountSnapshotService(controller)
+
+        service.refresh()
+        rows = service.get_rows()
+
+        assert [row["Account"] for row in rows] == ["DEMO1", "DEMO2"]
+        assert rows[0]["account_index"] == 0
+        assert "Account ▲" not in rows[0]
+        assert rows[1]["Phase"] == "2"
+        assert service.version == 1
+
+    def test_function_is_only_injected_when_missing(self):
+        conn = make_connection(0, [])
+        controller = make_controller(conn)
+        service = AccountSnapshotService(controller)
+
+        service.refresh()
+        service.refresh()
+
+        expressions = [c[1]["expression"] for c in conn.tab.Runtime.evaluate.call_args_list]
+        assert expressions == [AccountSnapshotService.FETCH_EXPRESSION] * 2
+
+    def test_failed_account_keeps_last_good_rows(self):
+        conn = make_connection(0, [{"Account": "DEMO1", "Total P&L": 10}])
+        controller = make_controller(conn)
+        service = AccountSnapshotService(controller)
+        service.refresh()
+
+        conn.tab.Runtime.evaluate.side_effect = Exception("Tab crashed")
+        version = service.refresh()
+
+        assert version == 1
+        assert service.get_rows()[0]["Account"] == "DEMO1"
+        status = service.get_status()
+        assert status["accounts"][0]["error"] == "Tab crashed"
+        assert status["accounts"][0]["age"] is not None
+
+    def test_unchanged_rows_keep_version(self):
+        controller = make_controller(make_connection(0, [{"Account": "DEMO1"}]))
+        service = AccountSnapshotService(controller)
+
+        assert service.refresh() == 1
+        assert service.refresh() == 1
+
+    def test_get_rows_does_not_touch_tabs_after_first_sweep(self):
+        conn = make_connection(0, [{"Account": "DEMO1"}])
+        controller = make_controller(conn)
+        service = AccountSnapshotService(controller)
+        service.refresh()
+        calls = conn.tab.Runtime.evaluate.call_count
+
+        for _ in range(10):
+            service.get_rows()
+
+        assert conn.tab.Runtime.evaluate.call_count == calls
+
+    def test_background_poller(self):
+        conn = make_connection(0, [{"Account": "DEMO1"}])
+        controller = make_controller(conn)
+        service = AccountSnapshotService(controller, refresh_interval=0.05)
+
+        service.start()
+        try:
+            deadline = time.monotonic() + 2
+            while conn.tab.Runtime.evaluate.call_count < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert conn.tab.Runtime.evaluate.call_count >= 3
+            assert service.get_status()["running"] is True
+        finally:
+            service.stop()
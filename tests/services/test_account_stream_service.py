@@ -0,0 +1,100 @@
+"""
+Tests for the dashboard push channel in src/services/account_stream_service.py
+"""
+
+import json
+
+# Add project root to path
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.services.account_stream_service import AccountStreamService
+
+
+def parse_event(text):
+    lines = text.strip().split("\n")
+    return lines[0][len("event: "):], json.loads(lines[1][len("data: "):])
+
+
+class TestAccountStreamService:
+    """Tests for AccountStreamService"""
+
+    def test_first_rows_are_added(self):
+        service = AccountStreamService()
+        subscription = service.subscribe()
+
+        service.update_account(0, [{"Account": "DEMO1", "Total P&L": 10}])
+
+        event, data = subscription.get_nowait()
+        assert event == "delta"
+        assert data["added"] == [{"Account": "DEMO1", "Total P&L": 10}]
+        assert data["updated"] == [] and data["removed"] == []
+
+    def test_only_changed_cells_are_sent(self):
+        service = AccountStreamService()
+        service.update_account(0, [
+            {"Account": "DEMO1", "Total P&L": 10, "Phase": "1"},
+            {"Account": "DEMO2", "Total P&L": 5, "Phase": "1"}
+        ])
+        subscription = service.subscribe()
+
+        service.update_account(0, [
+            {"Account": "DEMO1", "Total P&L": 12, "Phase": "1"},
+            {"Account": "DEMO2", "Total P&L": 5, "Phase": "1"}
+        ])
+
+        _, data = subscription.get_nowait()
+        assert data["updated"] == [{"account": "DEMO1", "changes": {"Total P&L": 12}}]
+        assert data["added"] == []
+
+    def test_unchanged_rows_publish_nothing(self):
+        service = AccountStreamService()
+        rows = [{"Account": "DEMO1", "Total P&L": 10}]
+        service.update_account(0, rows)
+        subscription = service.subscribe()
+
+        service.update_account(0, [dict(r) for r in rows])
+
+        assert subscription.empty()
+
+    def test_removed_rows(self):
+        service = AccountStreamService()
+        service.update_account(0, [{"Account": "DEMO1"}, {"Account": "DEMO2"}])
+        subscription = service.subscribe()
+
+        service.update_account(0, [{"Account": "DEMO2"}])
+
+        _, data = subscription.get_nowait()
+        assert data["removed"] == ["DEMO1"]
+
+    def test_slow_subscriber_is_told_to_resync(self):
+        service = AccountStreamService(max_queue=2)
+        subscription = service.subscribe()
+
+        for pnl in range(5):
+            service.update_account(0, [{"Account": "DEMO1", "Total P&L": pnl}])
+
+        events = []
+        while not subscription.empty():
+            events.append(subscription.get_nowait()[0])
+        assert "resync" in events
+        assert len(events) <= 2
+
+    def test_stream_starts_with_snapshot_and_unsubscribes(self):
+        service = AccountStreamService(heartbeat_interval=0.01)
+        subscription = service.subscribe()
+        stream = service.stream(subscription, [{"Account": "DEMO1"}])
+
+        event, data = parse_event(next(stream))
+        assert event == "snapshot"
+        assert data == [{"Account": "DEMO1"}]
+
+        service.update_account(0, [{"Account": "DEMO1", "Phase": "2"}])
+        event, data = parse_event(next(stream))
+        assert event == "delta"
+
+        assert next(stream) == ": keep-alive\n\n"
+
+        stream.close()
+        assert service.subscriber_count() == 0
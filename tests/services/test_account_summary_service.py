@@ -0,0 +1,89 @@
+"""
+Tests for the dashboard summary totals in src/services/account_summary_service.py
+"""
+
+import json
+import os
+import pytest
+
+# Add project root to path
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.services.account_summary_service import AccountSummaryService, parse_amount
+
+
+@pytest.fixture
+def strategy_file(tmp_path):
+    path = tmp_path / "strategy_mappings.json"
+    path.write_text(json.dumps({"strategy_mappings": {"Scalper": ["DEMO1", "DEMO2"], "Swing": ["DEMO2"]}}))
+    return path
+
+
+class TestParseAmount:
+    """Tests for parse_amount()"""
+
+    def test_currency_strings_and_numbers(self):
+        assert parse_amount("$1,234.50") == 1234.5
+        assert parse_amount("-$20") == -20.0
+        assert parse_amount(15) == 15.0
+        assert parse_amount("n/a") == 0.0
+        assert parse_amount(None) == 0.0
+
+
+class TestAccountSummaryService:
+    """Tests for AccountSummaryService"""
+
+    def test_totals_and_breakdowns(self, strategy_file):
+        service = AccountSummaryService(str(strategy_file))
+
+        service.update_account(0, [
+            {"Account": "DEMO1", "Total P&L": 100, "Available Margin": "$1,000", "Phase": "1"},
+            {"Account": "DEMO2", "Total P&L": -40, "Available Margin": 500, "Phase": "2"}
+        ])
+        service.update_account(1, [{"Account": "DEMO3", "Dollar Total P L": "$10", "Phase": "1"}])
+        summary = service.get_summary()
+
+        assert summary["total_pnl"] == 70
+        assert summary["total_margin"] == 1500
+        assert summary["account_count"] == 3
+        assert summary["by_strategy"]["Scalper"] == {"total_pnl": 60, "total_margin": 1500, "account_count": 2}
+        assert summary["by_strategy"]["Swing"]["total_pnl"] == -40
+        assert summary["by_strategy"]["Unassigned"]["account_count"] == 1
+        assert summary["by_phase"]["1"]["total_pnl"] == 110
+
+    def test_update_replaces_only_that_account(self, strategy_file):
+        service = AccountSummaryService(str(strategy_file))
+        service.update_account(0, [{"Account": "DEMO1", "Total P&L": 100, "Phase": "1"}])
+        service.update_account(1, [{"Account": "DEMO2", "Total P&L": 50, "Phase": "2"}])
+
+        service.update_account(0, [{"Account": "DEMO1", "Total P&L": 25, "Phase": "3"}])
+        summary = service.get_summary()
+
+        assert summary["total_pnl"] == 75
+        assert summary["account_count"] == 2
+        assert "1" not in summary["by_phase"]
+        assert summary["by_phase"]["3"]["total_pnl"] == 25
+
+    def test_remove_account(self, strategy_file):
+        service = AccountSummaryService(str(strategy_file))
+        service.update_account(0, [{"Account": "DEMO1", "Total P&L": 100}])
+
+        service.remove_account(0)
+        summary = service.get_summary()
+
+        assert summary["total_pnl"] == 0
+        assert summary["account_count"] == 0
+        assert summary["by_strategy"] == {}
+
+    def test_mapping_change_regroups_rows(self, strategy_file):
+        service = AccountSummaryService(str(strategy_file))
+        service.update_account(0, [{"Account": "DEMO3", "Total P&L": 10}])
+        assert "Unassigned" in service.get_summary()["by_strategy"]
+
+        strategy_file.write_text(json.dumps({"strategy_mappings": {"Swing": ["DEMO3"]}}))
+        os.utime(strategy_file, (1, 1))
+        summary = service.get_summary()
+
+        assert summary["by_strategy"] == {"Swing": {"total_pnl": 10, "total_margin": 0, "account_count": 1}}
@@ -0,0 +1,88 @@
+"""
+Tests for background DOM snapshots in src/services/dom_snapshot_store.py
+"""
+
+import threading
+import time
+
+# Add project root to path
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.services.dom_snapshot_store import DomSnapshotStore, DomSnapshotScheduler
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestDomSnapshotStore:
+    """Tests for DomSnapshotStore"""
+
+    def test_save_compresses_and_round_trips(self, tmp_path):
+        store = DomSnapshotStore(tmp_path)
+        snapshot = {"documents": [{"nodes": ["div"] * 1000}]}
+
+        ref = store.save(snapshot)
+
+        assert Path(ref["path"]).name == f"{ref['id']}.json.gz"
+        assert ref["bytes"] < ref["raw_bytes"]
+        assert store.load(ref["id"]) == snapshot
+
+    def test_identical_content_is_stored_once(self, tmp_path):
+        store = DomSnapshotStore(tmp_path)
+
+        first = store.save({"documents": [1]})
+        second = store.save({"documents": [1]})
+
+        assert first["id"] == second["id"]
+        assert second["deduplicated"] is True
+        assert len(list(tmp_path.glob("*.json.gz"))) == 1
+
+
+class TestDomSnapshotScheduler:
+    """Tests for DomSnapshotScheduler"""
+
+    def test_capture_runs_off_the_calling_thread(self, tmp_path):
+        threads = []
+        capture = lambda: threads.append(threading.current_thread()) or {"documents": []}
+        scheduler = DomSnapshotScheduler(capture, DomSnapshotStore(tmp_path), min_interval=0)
+
+        ref = scheduler.request("Console ERROR: boom")
+
+        assert wait_for(lambda: ref["status"] == "captured")
+        assert threads and threading.current_thread() not in threads
+        assert ref["trigger_event"] == "Console ERROR: boom"
+        assert Path(ref["path"]).exists()
+        scheduler.stop()
+
+    def test_burst_is_coalesced_and_rate_limited(self, tmp_path):
+        calls = []
+        capture = lambda: calls.append(time.time()) or {"documents": [len(calls)]}
+        scheduler = DomSnapshotScheduler(capture, DomSnapshotStore(tmp_path), min_interval=0.3)
+
+        first = scheduler.request("error 0")
+        assert wait_for(lambda: first["status"] == "captured")
+        burst = [scheduler.request(f"error {i}") for i in range(1, 20)]
+
+        assert wait_for(lambda: all(ref["status"] == "captured" for ref in burst))
+        assert len(calls) == 2
+        assert calls[1] - calls[0] >= 0.3
+        assert {ref["id"] for ref in burst} == {burst[0]["id"]}
+        assert scheduler.get_stats()["coalesced"] == 18
+        scheduler.stop()
+
+    def test_failed_capture_and_stop(self, tmp_path):
+        scheduler = DomSnapshotScheduler(lambda: None, DomSnapshotStore(tmp_path), min_interval=0)
+        failed = scheduler.request("error")
+        assert wait_for(lambda: failed["status"] == "failed")
+
+        scheduler.min_interval = 60
+        pending = scheduler.request("later")
+        scheduler.stop()
+
+        assert pending["status"] == "cancelled"
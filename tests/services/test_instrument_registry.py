@@ -0,0 +1,70 @@
+"""
+Tests for the instrument registry in src/services/instrument_registry.py
+"""
+
+import json
+
+# Add project root to path
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pytest
+
+from src.services.instrument_registry import InstrumentRegistry, parse_root
+
+
+@pytest.fixture
+def registry(tmp_path):
+    config = tmp_path / "trading_defaults.json"
+    config.write_text(json.dumps({"symbol_defaults": {
+        "NQ": {"tick_size": 0.25, "tick_value": 5.0, "default_sl": 15, "default_tp": 53, "precision": 2},
+        "MNQ": {"tick_size": 0.25, "tick_value": 0.5, "default_sl": 15, "default_tp": 53, "precision": 2},
+        "GC": {"tick_size": 0.1, "tick_value": 10.0, "default_sl": 15, "default_tp": 30, "precision": 1},
+    }}))
+    return InstrumentRegistry(config)
+
+
+class TestInstrumentRegistry:
+    """Tests for InstrumentRegistry"""
+
+    @pytest.mark.parametrize("symbol,root", [
+        ("NQ1!", "NQ"), ("nq", "NQ"), ("NQZ5", "NQ"), ("NQZ25", "NQ"), ("MNQ", "MNQ"),
+        ("MNQH6", "MNQ"), ("GCZ5", "GC"), ("XYZ1", "XYZ"),
+    ])
+    def test_root_symbol(self, registry, symbol, root):
+        assert registry.root_symbol(symbol) == root
+
+    @pytest.mark.parametrize("symbol,trading", [
+        ("NQ1!", "NQ"), ("NQ", "NQ"), ("NQZ5", "NQZ5"), ("mnqh6", "MNQH6"), ("BTCUSD", "BTCUSD"),
+    ])
+    def test_trading_symbol_keeps_explicit_contracts(self, registry, symbol, trading):
+        assert registry.trading_symbol(symbol) == trading
+
+    def test_metadata_lookup(self, registry):
+        assert registry.tick_size("GCZ5") == 0.1
+        assert registry.tick_size("XYZ1") == 0.25
+        assert registry.get("MNQ1!")["tick_value"] == 0.5
+        assert registry.get("XYZ") is None
+
+    def test_root_parsing_is_memoized(self, registry):
+        parse_root.cache_clear()
+        registry.root_symbol("NQ1!")
+        registry.root_symbol("NQ1!")
+        assert parse_root.cache_info().hits == 1
+
+    def test_to_js_uses_autoorder_field_names(self, registry):
+        source = registry.to_js()
+        table = json.loads(source.split("window.__tradovateInstruments = ", 1)[1].split(";\n", 1)[0])
+        assert table["NQ"] == {"tickSize": 0.25, "tickValue": 5.0, "defaultSL": 15, "defaultTP": 53, "precision": 2}
+        assert "window.__tradovateRootSymbol" in source
+
+    def test_reload_if_changed(self, registry):
+        assert registry.reload_if_changed() is False
+
+        registry.config_path.write_text(json.dumps({"symbol_defaults": {"ES": {"tick_size": 0.25}}}))
+        registry.stamp = None
+
+        assert registry.reload_if_changed() is True
+        assert registry.root_symbol("ESH6") == "ES"
+        assert registry.get("NQ") is None
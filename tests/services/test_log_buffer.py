@@ -0,0 +1,70 @@
+"""
+Tests for the bounded Chrome log window in src/services/log_buffer.py
+"""
+
+import json
+
+# Add project root to path
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.services.log_buffer import LogRingBuffer, trim_entry
+
+
+def entry(i, text="message"):
+    return {"source": "console", "level": "LOG", "text": f"{text} {i}", "raw": {"args": [{"value": "x" * 500}]}}
+
+
+class TestTrimEntry:
+    """Tests for trim_entry()"""
+
+    def test_drops_raw_and_truncates_text(self):
+        trimmed = trim_entry({"level": "LOG", "text": "a" * 50, "raw": {"big": True}}, max_text=10)
+
+        assert "raw" not in trimmed
+        assert trimmed["text"].startswith("a" * 10 + "...")
+        assert trimmed["level"] == "LOG"
+
+
+class TestLogRingBuffer:
+    """Tests for LogRingBuffer"""
+
+    def test_bounded_by_entry_count(self):
+        buffer = LogRingBuffer(max_entries=3)
+
+        for i in range(5):
+            buffer.append(entry(i))
+
+        assert [e["text"] for e in buffer.copy()] == ["message 2", "message 3", "message 4"]
+        assert buffer.get_stats()["evicted"] == 2
+
+    def test_bounded_by_bytes(self):
+        buffer = LogRingBuffer(max_entries=1000, max_bytes=300)
+
+        for i in range(20):
+            buffer.append(entry(i))
+
+        stats = buffer.get_stats()
+        assert stats["bytes"] <= 300
+        assert 0 < stats["entries"] < 20
+        assert buffer.copy()[-1]["text"] == "message 19"
+
+    def test_evicted_entries_spill_to_disk(self, tmp_path):
+        spill = tmp_path / "logs" / "spill.ndjson"
+        buffer = LogRingBuffer(max_entries=2, spill_file=str(spill))
+
+        for i in range(5):
+            buffer.append(entry(i))
+
+        spilled = [json.loads(line)["text"] for line in spill.read_text().splitlines()]
+        assert spilled == ["message 0", "message 1", "message 2"]
+        assert buffer.get_stats()["spilled"] == 3
+
+    def test_copy_does_not_expose_stored_entries(self):
+        buffer = LogRingBuffer()
+        buffer.append({"text": "a", "dom_snapshot": {"nodes": []}})
+
+        buffer.copy()[0].pop("dom_snapshot")
+
+        assert "dom_snapshot" in buffer.copy()[0]
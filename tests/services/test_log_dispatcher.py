@@ -0,0 +1,102 @@
+"""
+Tests for the off-thread callback dispatch in src/services/log_dispatcher.py
+"""
+
+import threading
+import time
+
+# Add project root to path
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.services.log_dispatcher import CallbackDispatcher, DROP_NEWEST
+
+
+def entry(text):
+    return {"source": "console", "level": "LOG", "text": text}
+
+
+class TestCallbackDispatcher:
+    """Tests for CallbackDispatcher"""
+
+    def test_inline_when_not_started(self):
+        dispatcher = CallbackDispatcher()
+        received = []
+
+        dispatcher.dispatch(received.append, entry("a"))
+
+        assert received == [entry("a")]
+
+    def test_delivers_in_order_on_worker_thread(self):
+        dispatcher = CallbackDispatcher()
+        threads = []
+        received = []
+        consumer = lambda item: (threads.append(threading.current_thread()), received.append(item["text"]))
+        dispatcher.start()
+
+        for i in range(10):
+            dispatcher.dispatch(consumer, entry(str(i)))
+        assert dispatcher.flush()
+
+        assert received == [str(i) for i in range(10)]
+        assert threading.current_thread() not in threads
+        assert list(dispatcher.get_stats().values())[0]["delivered"] == 10
+        dispatcher.stop()
+
+    def overflow(self, **kwargs):
+        dispatcher = CallbackDispatcher(max_queue=3, **kwargs)
+        release = threading.Event()
+        received = []
+
+        def consumer(item):
+            release.wait(2)
+            received.append(item["text"])
+
+        dispatcher.start()
+        dispatcher.dispatch(consumer, entry("busy"))
+        # Wait for the worker to pick up the first item so the queue is empty
+        worker = dispatcher.workers[id(consumer)]
+        deadline = time.time() + 2
+        while not worker.busy and time.time() < deadline:
+            time.sleep(0.001)
+        return dispatcher, consumer, release, received
+
+    def test_drop_oldest_when_full(self):
+        dispatcher, consumer, release, received = self.overflow()
+
+        for text in ["a", "b", "c", "d", "e"]:
+            dispatcher.dispatch(consumer, entry(text))
+        release.set()
+        dispatcher.flush()
+
+        assert received == ["busy", "c", "d", "e"]
+        assert list(dispatcher.get_stats().values())[0]["dropped"] == 2
+        dispatcher.stop()
+
+    def test_drop_newest_policy(self):
+        dispatcher, consumer, release, received = self.overflow(policy=DROP_NEWEST)
+
+        for text in ["a", "b", "c", "d"]:
+            dispatcher.dispatch(consumer, entry(text))
+        release.set()
+        dispatcher.flush()
+
+        assert received == ["busy", "a", "b", "c"]
+        dispatcher.stop()
+
+    def test_repeats_coalesce_when_full(self):
+        dispatcher, consumer, release, received = self.overflow()
+        repeated = []
+        dispatcher.workers[id(consumer)].callback = repeated.append
+
+        for text in ["a", "b", "c", "c", "c"]:
+            dispatcher.dispatch(consumer, entry(text))
+        release.set()
+        dispatcher.flush()
+
+        assert [item["text"] for item in repeated] == ["a", "b", "c"]
+        assert repeated[-1]["repeat_count"] == 3
+        stats = list(dispatcher.get_stats().values())[0]
+        assert stats["coalesced"] == 2 and stats["dropped"] == 0
+        dispatcher.stop()
@@ -0,0 +1,70 @@
+"""
+Tests for the background log writer in src/services/log_writer.py
+"""
+
+import threading
+
+# Add project root to path
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.services.log_writer import LogWriter
+
+
+class TestLogWriter:
+    """Tests for LogWriter"""
+
+    def test_lines_reach_disk_after_flush(self, tmp_path):
+        writer = LogWriter(flush_interval=10)
+        path = str(tmp_path / "a.log")
+
+        for i in range(3):
+            writer.write(path, f"line {i}\n")
+        assert writer.flush()
+
+        assert Path(path).read_text() == "line 0\nline 1\nline 2\n"
+        writer.stop()
+
+    def test_group_commit(self, tmp_path):
+        writer = LogWriter(flush_interval=10)
+        path = str(tmp_path / "a.log")
+
+        for i in range(50):
+            writer.write(path, f"line {i}\n")
+        writer.flush()
+
+        stats = writer.get_stats()
+        assert stats["lines_written"] == 50
+        assert stats["commits"] < 50
+        writer.stop()
+
+    def test_size_rotation(self, tmp_path):
+        writer = LogWriter(flush_interval=10, max_file_bytes=20, backup_count=2)
+        path = str(tmp_path / "a.log")
+
+        for i in range(4):
+            writer.write(path, f"line {i:010d}\n")
+            writer.flush()
+
+        assert Path(path).exists()
+        assert Path(path + ".1").exists()
+        assert Path(path + ".2").exists()
+        assert not Path(path + ".3").exists()
+        assert writer.get_stats()["rotations"] == 3
+        writer.stop()
+
+    def test_stop_flushes_and_write_does_not_block(self, tmp_path):
+        writer = LogWriter(flush_interval=10, max_queue=1)
+        path = str(tmp_path / "a.log")
+        release = threading.Event()
+        writer._commit = lambda pending, original=writer._commit: (release.wait(2), original(pending))
+
+        # The caller never waits on the disk, even with the writer stuck
+        for i in range(20):
+            writer.write(path, f"line {i}\n")
+        assert writer.get_stats()["dropped"] > 0
+
+        release.set()
+        writer.stop()
+        assert Path(path).read_text().startswith("line 0\n")
@@ -0,0 +1,91 @@
+"""
+Tests for the versioned userscript bundle in src/services/script_bundle.py
+"""
+
+import os
+import re
+
+# Add project root to path
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.services.script_bundle import (
+    ScriptBundle, VERSION_MARKER, ERROR_MARKER, DEFAULT_SCRIPTS, extract_core_functions, on_dom_ready
+)
+
+
+def write_scripts(directory):
+    (directory / 'a.user.js').write_text("(function () {\n    'use strict';\n    function a() {}\n})();\n")
+    (directory / 'b.js').write_text("function b() {}\n")
+
+
+class TestScriptBundle:
+    """Tests for ScriptBundle"""
+
+    def test_parts_follow_load_order_and_end_with_marker(self, tmp_path):
+        write_scripts(tmp_path)
+        bundle = ScriptBundle(tmp_path, [('a.user.js', True), ('b.js', False)])
+
+        version, parts = bundle.get()
+
+        assert [name for name, _ in parts] == ['a.user.js', 'b.js', 'version-marker']
+        assert '(function ()' not in parts[0][1]
+        assert 'function a() {}' in parts[0][1]
+        assert parts[1][1] == "function b() {}\n"
+        assert parts[-1][1] == f'window.{VERSION_MARKER} = "{version}";'
+
+    def test_version_is_stable_until_a_script_changes(self, tmp_path):
+        write_scripts(tmp_path)
+        bundle = ScriptBundle(tmp_path, [('a.user.js', True), ('b.js', False)])
+
+        version, _ = bundle.get()
+        assert bundle.get()[0] == version
+        assert ScriptBundle(tmp_path, [('a.user.js', True), ('b.js', False)]).get()[0] == version
+
+        path = tmp_path / 'b.js'
+        path.write_text("function b() { return 1; }\n")
+        stat = path.stat()
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+        new_version, parts = bundle.get()
+        assert new_version != version
+        assert parts[1][1] == "function b() { return 1; }\n"
+
+    def test_missing_script_is_skipped(self, tmp_path):
+        write_scripts(tmp_path)
+        bundle = ScriptBundle(tmp_path, [('missing.js', False), ('b.js', False)])
+
+        _, parts = bundle.get()
+
+        assert [name for name, _ in parts] == ['b.js', 'version-marker']
+
+    def test_check_expression_compares_marker(self, tmp_path):
+        bundle = ScriptBundle(tmp_path, [])
+        assert bundle.check_expression('abc') == f'window.{VERSION_MARKER} === "abc"'
+
+    def test_default_scripts_exist(self):
+        bundle = ScriptBundle()
+        _, parts = bundle.get()
+        assert [name for name, _ in parts] == ['instruments'] + [name for name, _ in DEFAULT_SCRIPTS] + ['version-marker']
+        assert parts[0][1].startswith('window.__tradovateInstruments = ')
+
+    def test_default_parts_can_be_evaluated_again(self):
+        # Top-level const/let/class cannot be redeclared when a new version is injected into the same page
+        _, parts = ScriptBundle().get()
+        for name, source in parts:
+            declarations = re.findall(r'^(?:const|let|class)\s+\S+', source, re.MULTILINE)
+            assert declarations == [], f"{name} declares {declarations} at top level"
+
+    def test_on_dom_ready_defers_part_and_records_failure(self):
+        source = on_dom_ready('a.js', 'function a() { return "</script>"; }')
+
+        assert "document.readyState === 'loading'" in source
+        assert "DOMContentLoaded" in source
+        assert '"function a() { return \\"</script>\\"; }"' in source
+        assert f"if (window.{ERROR_MARKER}) return;" in source
+        assert f'window.{ERROR_MARKER} = "a.js"' in source
+
+    def test_extract_core_functions_strips_wrapper(self):
+        code = "(function () {\n    function x() {}\n})();"
+        assert extract_core_functions(code) == "function x() {}"
@@ -0,0 +1,92 @@
+"""
+Tests for webhook signal de-duplication in src/services/signal_dedup.py
+"""
+
+import json
+import time
+
+# Add project root to path
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.services.signal_dedup import SignalDeduplicator
+
+
+SIGNAL = {"symbol": "NQ1!", "action": "Buy", "orderQty": 1, "strategy": "Scalp", "time": "2026-10-16T14:30:00Z"}
+
+
+class TestSignalDeduplicator:
+    """Tests for SignalDeduplicator"""
+
+    def test_retry_is_answered_from_first_delivery(self):
+        dedup = SignalDeduplicator()
+        key, ttl = dedup.key_for(SIGNAL)
+
+        assert dedup.claim(key, ttl) is None
+        dedup.attach(key, "abc123")
+        dedup.complete_signal("abc123", {"status": "executed"})
+
+        duplicate = dedup.claim(*dedup.key_for(dict(SIGNAL)))
+        assert duplicate['signal_id'] == "abc123"
+        assert duplicate['status'] == 'completed'
+        assert duplicate['result'] == {"status": "executed"}
+        assert dedup.get_stats()['duplicates'] == 1
+
+    def test_keys(self):
+        dedup = SignalDeduplicator(ttl=600, content_ttl=30)
+
+        # Client IDs win over the content, from the header first
+        assert dedup.key_for(dict(SIGNAL, alert_id="a1")) == ("id:a1", 600)
+        assert dedup.key_for(dict(SIGNAL, alert_id="a1"), "h1") == ("id:h1", 600)
+
+        # A new bar or a different quantity is a different signal
+        key, ttl = dedup.key_for(SIGNAL)
+        assert key.startswith("sha:") and ttl == 600
+        assert dedup.key_for(dict(SIGNAL, time="2026-10-16T14:31:00Z"))[0] != key
+        assert dedup.key_for(dict(SIGNAL, orderQty=2))[0] != key
+
+        # Without a bar time the key is only remembered briefly
+        untimed = {k: v for k, v in SIGNAL.items() if k != "time"}
+        assert dedup.key_for(untimed)[1] == 30
+
+    def test_expired_and_released_keys_execute_again(self):
+        dedup = SignalDeduplicator()
+
+        assert dedup.claim("sha:a", 0.05) is None
+        time.sleep(0.1)
+        assert dedup.claim("sha:a", 0.05) is None
+
+        assert dedup.claim("sha:b") is None
+        dedup.release("sha:b")
+        assert dedup.claim("sha:b") is None
+
+    def test_least_recently_seen_keys_are_evicted(self):
+        dedup = SignalDeduplicator(max_entries=2)
+
+        for key in ("a", "b", "c"):
+            dedup.claim(key)
+
+        assert list(dedup.entries) == ["b", "c"]
+
+    def test_journal_survives_restart(self, tmp_path):
+        journal = tmp_path / "dedup.jsonl"
+        dedup = SignalDeduplicator(journal_path=journal)
+        dedup.claim("id:done")
+        dedup.attach("id:done", "s1")
+        dedup.complete_signal("s1", {"status": "executed"})
+        dedup.claim("id:running")
+        dedup.attach("id:running", "s2")
+        dedup.claim("id:gone")
+        dedup.release("id:gone")
+        with open(journal, "a") as f:
+            f.write('{"key": "torn')
+
+        restored = SignalDeduplicator(journal_path=journal)
+
+        assert restored.claim("id:done")['result'] == {"status": "executed"}
+        assert restored.claim("id:running")['status'] == 'interrupted'
+        assert restored.claim("id:gone") is None
+        # Compacted to one line per live key, plus the claim just made
+        assert len(journal.read_text().splitlines()) == 3
+        assert all(json.loads(line) for line in journal.read_text().splitlines())
@@ -0,0 +1,136 @@
+"""
+Tests for the webhook signal journal in src/services/signal_journal.py
+"""
+
+import json
+import time
+import pytest
+
+# Add project root to path
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.services.signal_journal import SignalJournal
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return tmp_path / "signal_journal.jsonl"
+
+
+class TestSignalJournal:
+    """Tests for SignalJournal"""
+
+    def test_records_account_states(self, journal_path):
+        journal = SignalJournal(journal_path)
+        try:
+            journal.received("s1", {"symbol": "NQ", "strategy": "Scalp"})
+            journal.account_state("s1", 0, "switched", "Demo1")
+            journal.account_state("s1", 0, "submitted")
+            journal.account_state("s1", 0, "confirmed", detail={"result": "ok"})
+            journal.finished("s1", "completed", {"status": "executed"})
+
+            signal = journal.get("s1")
+            assert signal["status"] == "completed"
+            assert signal["accounts"]["0"]["state"] == "confirmed"
+            assert signal["accounts"]["0"]["account"] == "Demo1"
+            assert signal["accounts"]["0"]["detail"] == {"result": "ok"}
+
+            with pytest.raises(ValueError):
+                journal.account_state("s1", 0, "exploded")
+        finally:
+            journal.close()
+
+    def test_record_does_not_wait_for_disk_and_groups_fsyncs(self, journal_path):
+        journal = SignalJournal(journal_path, commit_interval=0.05)
+        try:
+            start = time.monotonic()
+            for i in range(200):
+                journal.received(f"s{i}", {"symbol": "NQ"})
+            assert time.monotonic() - start < 0.5
+
+            assert journal.flush()
+            stats = journal.get_stats()
+            assert stats["buffered"] == 0
+            assert stats["commits"] < 200
+            assert len(journal_path.read_text().splitlines()) == 200
+        finally:
+            journal.close()
+
+    def test_failed_write_is_retried_not_reported_durable(self, journal_path, monkeypatch):
+        journal = SignalJournal(journal_path, commit_interval=0.01)
+        try:
+            monkeypatch.setattr("src.services.signal_journal.os.fsync",
+                                lambda fd: (_ for _ in ()).throw(OSError("disk full")))
+            journal.received("s1", {"symbol": "NQ"})
+            assert not journal.flush(timeout=0.2)
+            assert journal.get_stats()["write_errors"] > 0
+
+            monkeypatch.undo()
+            assert journal.flush()
+            lines = journal_path.read_text().splitlines()
+            assert [json.loads(line)["id"] for line in lines] == ["s1"]
+        finally:
+            journal.close()
+
+    def test_lone_event_is_written_without_flush(self, journal_path):
+        journal = SignalJournal(journal_path, commit_interval=0.01)
+        try:
+            journal.received("s1", {"symbol": "NQ"})
+            deadline = time.monotonic() + 2
+            while not journal_path.exists() or not journal_path.read_text():
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+        finally:
+            journal.close()
+
+    def test_restart_restores_state_and_finds_incomplete_signals(self, journal_path):
+        journal = SignalJournal(journal_path)
+        journal.received("done", {"symbol": "NQ"})
+        journal.finished("done", "completed")
+        journal.received("cut", {"symbol": "ES"})
+        journal.account_state("cut", 1, "submitted", "Demo2")
+        journal.close()
+        with open(journal_path, "a") as f:
+            f.write('{"event": "account", "id": "cut"')
+
+        restored = SignalJournal(journal_path)
+        try:
+            assert restored.get("done")["status"] == "completed"
+            incomplete = restored.incomplete()
+            assert [s["id"] for s in incomplete] == ["cut"]
+            assert incomplete[0]["accounts"]["1"]["state"] == "submitted"
+        finally:
+            restored.close()
+
+    def test_query_filters(self, journal_path):
+        journal = SignalJournal(journal_path)
+        try:
+            journal.received("a", {"symbol": "NQ", "strategy": "Scalp"})
+            journal.received("b", {"symbol": "ES"})
+            journal.received("c", {"symbol": "nq", "strategy": "Scalp"})
+            journal.finished("c", "failed")
+
+            assert [s["id"] for s in journal.query()] == ["c", "b", "a"]
+            assert [s["id"] for s in journal.query(limit=1)] == ["c"]
+            assert [s["id"] for s in journal.query(symbol="NQ")] == ["c", "a"]
+            assert [s["id"] for s in journal.query(strategy="DEFAULT")] == ["b"]
+            assert [s["id"] for s in journal.query(status="running", strategy="Scalp")] == ["a"]
+        finally:
+            journal.close()
+
+    def test_history_beyond_limit_is_compacted_away(self, journal_path):
+        journal = SignalJournal(journal_path, history_size=2)
+        for signal_id in ("a", "b", "c"):
+            journal.received(signal_id, {"symbol": "NQ"})
+            journal.finished(signal_id, "completed")
+        journal.close()
+
+        restored = SignalJournal(journal_path, history_size=2)
+        try:
+            assert [s["id"] for s in restored.query()] == ["c", "b"]
+            events = [json.loads(line) for line in journal_path.read_text().splitlines()]
+            assert {e["id"] for e in events} == {"b", "c"}
+        finally:
+            restored.close()
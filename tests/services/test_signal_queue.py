@@ -0,0 +1,141 @@
+"""
+Tests for the webhook signal queue in src/services/signal_queue.py
+"""
+
+import threading
+import time
+import pytest
+
+# Add project root to path
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.services.signal_queue import SignalQueue, QueueFullError
+
+
+def wait_for_status(signal_queue, signal_id, status, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        record = signal_queue.get(signal_id)
+        if record and record['status'] == status:
+            return record
+        time.sleep(0.01)
+    raise AssertionError(f"Signal {signal_id} never reached {status}: {signal_queue.get(signal_id)}")
+
+
+class TestSignalQueue:
+    """Tests for SignalQueue"""
+
+    def test_submit_returns_immediately_and_completes(self):
+        release = threading.Event()
+
+        def handler(data):
+            release.wait(2)
+            return {"status": "executed", "symbol": data["symbol"]}
+
+        signal_queue = SignalQueue(handler, workers=1)
+        signal_queue.start()
+        try:
+            start = time.monotonic()
+            signal_id = signal_queue.submit({"symbol": "NQ"})
+            assert time.monotonic() - start < 0.1
+            assert signal_queue.get(signal_id)['status'] in ('queued', 'running')
+
+            release.set()
+            record = wait_for_status(signal_queue, signal_id, 'completed')
+            assert record['result'] == {"status": "executed", "symbol": "NQ"}
+            assert record['duration'] is not None
+            assert '_enqueued' not in record
+        finally:
+            signal_queue.stop()
+
+    def test_close_signals_run_before_queued_opens(self):
+        order = []
+        signal_queue = SignalQueue(lambda data: order.append(data["tradeType"]) or {"status": "ok"}, workers=1)
+
+        # Queue before starting so the worker sees all of them at once
+        signal_queue.submit({"symbol": "NQ", "tradeType": "Open"})
+        signal_queue.submit({"symbol": "NQ", "tradeType": "Open"})
+        close_id = signal_queue.submit({"symbol": "NQ", "tradeType": "Close"})
+
+        signal_queue.start()
+        try:
+            wait_for_status(signal_queue, close_id, 'completed')
+            deadline = time.monotonic() + 2
+            while len(order) < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert order == ["Close", "Open", "Open"]
+        finally:
+            signal_queue.stop()
+
+    def test_queue_full(self):
+        signal_queue = SignalQueue(lambda data: {}, max_size=2, workers=1)
+        signal_queue.submit({"symbol": "NQ"})
+        signal_queue.submit({"symbol": "ES"})
+
+        with pytest.raises(QueueFullError):
+            signal_queue.submit({"symbol": "YM"})
+        assert signal_queue.get_stats()['rejected'] == 1
+
+    def test_handler_errors_are_recorded(self):
+        def handler(data):
+            raise RuntimeError("Tab crashed")
+
+        signal_queue = SignalQueue(handler, workers=1)
+        signal_queue.start()
+        try:
+            signal_id = signal_queue.submit({"symbol": "NQ"})
+            record = wait_for_status(signal_queue, signal_id, 'failed')
+            assert record['error'] == "Tab crashed"
+            assert signal_queue.get_stats()['failed'] == 1
+        finally:
+            signal_queue.stop()
+
+    def test_unknown_signal(self):
+        signal_queue = SignalQueue(lambda data: {})
+        assert signal_queue.get("missing") is None
+
+    def test_on_finish_receives_outcome(self):
+        finished = []
+        signal_queue = SignalQueue(lambda data: {"status": "executed"}, workers=1, on_finish=finished.append)
+        signal_queue.start()
+        try:
+            signal_id = signal_queue.submit({"symbol": "NQ"}, signal_id="known-id")
+            wait_for_status(signal_queue, signal_id, 'completed')
+            deadline = time.monotonic() + 1
+            while not finished and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            assert signal_id == "known-id"
+            assert finished[0]['id'] == "known-id"
+            assert finished[0]['result'] == {"status": "executed"}
+        finally:
+            signal_queue.stop()
+
+    def test_express_worker_runs_close_while_workers_are_busy(self):
+        release = threading.Event()
+
+        def handler(data):
+            if data["tradeType"] == "Open":
+                release.wait(2)
+            return {"status": "ok"}
+
+        signal_queue = SignalQueue(handler, max_size=1, workers=1, express_workers=1)
+        signal_queue.start()
+        try:
+            open_id = signal_queue.submit({"symbol": "NQ", "tradeType": "Open"})
+            wait_for_status(signal_queue, open_id, 'running')
+
+            # The Open lane is full, the Close lane is not
+            signal_queue.submit({"symbol": "NQ", "tradeType": "Open"})
+            with pytest.raises(QueueFullError):
+                signal_queue.submit({"symbol": "NQ", "tradeType": "Open"})
+            close_id = signal_queue.submit({"symbol": "NQ", "tradeType": "Close"})
+
+            # The only regular worker is busy; the express worker takes the Close
+            wait_for_status(signal_queue, close_id, 'completed')
+            assert signal_queue.get(open_id)['status'] == 'running'
+        finally:
+            release.set()
+            signal_queue.stop()
@@ -0,0 +1,95 @@
+"""
+Tests for the cached strategy routing table in src/services/strategy_router.py
+"""
+
+import json
+import os
+
+# Add project root to path
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.services.strategy_router import StrategyRouter
+
+
+def write_mappings(path, mappings):
+    path.write_text(json.dumps({"strategy_mappings": mappings}))
+    # Make sure the change is visible even within the filesystem's mtime resolution
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestStrategyRouter:
+    """Tests for StrategyRouter"""
+
+    def make_router(self, tmp_path, mappings):
+        mappings_file = tmp_path / "strategy_mappings.json"
+        write_mappings(mappings_file, mappings)
+        switcher = tmp_path / "changeAccount.user.js"
+        switcher.write_text("function changeAccount() {}")
+        return StrategyRouter(mappings_file, [tmp_path / "missing.js", switcher]), mappings_file
+
+    def test_unlocated_accounts_go_to_every_tab(self, tmp_path):
+        router, _ = self.make_router(tmp_path, {"Push": ["A1"], "DEFAULT": ["D1"]})
+
+        assert router.route("Push", 3) == ([0, 1, 2], ["A1"])
+        assert router.route("Unknown", 3) == ([0, 1, 2], ["D1"])
+
+    def test_unmapped_strategy_without_default(self, tmp_path):
+        router, _ = self.make_router(tmp_path, {"Push": ["A1"]})
+
+        assert router.route("Other", 2) == ([0, 1], [])
+
+    def test_located_accounts_route_to_their_tabs(self, tmp_path):
+        router, _ = self.make_router(tmp_path, {"Push": ["A1", "A2"], "Rebound": ["B1"]})
+
+        router.learn(1, ["A1", "B1"], complete=True)
+        assert router.route("Push", 3) == ([0, 1, 2], ["A1", "A2"])
+
+        router.learn(2, ["A2"])
+        assert router.route("Push", 3) == ([1, 2], ["A1", "A2"])
+        assert router.route("Rebound", 3) == ([1], ["B1"])
+
+    def test_complete_dropdown_replaces_tab_accounts(self, tmp_path):
+        router, _ = self.make_router(tmp_path, {"Push": ["A1"]})
+
+        router.learn(0, ["A1"])
+        router.learn(0, ["A2"], complete=True)
+
+        assert router.route("Push", 2) == ([0, 1], ["A1"])
+        assert router.order_for_tab(0, ["A1", "A2"]) == ["A2", "A1"]
+
+    def test_order_for_tab_skips_accounts_seen_elsewhere(self, tmp_path):
+        router, _ = self.make_router(tmp_path, {})
+
+        router.learn(0, ["A1"])
+        router.learn(1, ["A2"])
+
+        assert router.order_for_tab(1, ["A1", "A2", "A3"]) == ["A2", "A3"]
+
+    def test_mappings_reload_only_after_file_changes(self, tmp_path):
+        router, mappings_file = self.make_router(tmp_path, {"Push": ["A1"]})
+
+        router.route("Push", 1)
+        router.route("Push", 1)
+        assert router.get_status()["mapping_reloads"] == 1
+
+        write_mappings(mappings_file, {"Push": ["A9"]})
+        assert router.route("Push", 1) == ([0], ["A9"])
+        assert router.get_status()["mapping_reloads"] == 2
+
+    def test_switcher_script_is_cached(self, tmp_path):
+        router, _ = self.make_router(tmp_path, {})
+
+        assert router.get_switcher_script() == "function changeAccount() {}"
+        assert router.get_switcher_script() == "function changeAccount() {}"
+        assert router.get_status()["switcher_reloads"] == 1
+
+    def test_reset_locations(self, tmp_path):
+        router, _ = self.make_router(tmp_path, {"Push": ["A1"]})
+        router.learn(1, ["A1"])
+
+        router.reset_locations()
+
+        assert router.route("Push", 2) == ([0, 1], ["A1"])
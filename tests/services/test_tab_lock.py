@@ -0,0 +1,82 @@
+"""
+Tests for the priority-aware tab lock in src/services/tab_lock.py
+"""
+
+import threading
+import time
+import pytest
+
+# Add project root to path
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.services.tab_lock import TabLock, PRIORITY_EXIT, PRIORITY_NORMAL
+
+
+def start_waiter(lock, name, order, priority=PRIORITY_NORMAL):
+    def run():
+        with lock.prioritized(priority):
+            order.append(name)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def wait_for_waiters(lock, count, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while lock.get_stats()['waiting'] < count:
+        assert time.monotonic() < deadline, "waiters never queued"
+        time.sleep(0.005)
+
+
+class TestTabLock:
+    """Tests for TabLock"""
+
+    def test_reentrant(self):
+        lock = TabLock()
+        with lock:
+            with lock.prioritized(PRIORITY_EXIT):
+                assert lock.get_stats()['held']
+            assert lock.get_stats()['held']
+        assert not lock.get_stats()['held']
+
+    def test_exit_goes_ahead_of_waiting_entries(self):
+        lock = TabLock()
+        order = []
+        lock.acquire()
+
+        threads = [start_waiter(lock, "open-1", order)]
+        wait_for_waiters(lock, 1)
+        threads.append(start_waiter(lock, "open-2", order))
+        wait_for_waiters(lock, 2)
+        threads.append(start_waiter(lock, "close", order, PRIORITY_EXIT))
+        wait_for_waiters(lock, 3)
+        assert lock.get_stats()['waiting_exits'] == 1
+
+        lock.release()
+        for thread in threads:
+            thread.join(timeout=2)
+
+        # The holder finished its flow; then the exit, then entries in arrival order
+        assert order == ["close", "open-1", "open-2"]
+        assert lock.get_stats()['preempted'] == 1
+
+    def test_non_blocking_and_timeout(self):
+        lock = TabLock()
+        holder = threading.Thread(target=lambda: (lock.acquire(), time.sleep(0.3), lock.release()))
+        holder.start()
+        time.sleep(0.05)
+
+        assert lock.acquire(blocking=False) is False
+        assert lock.acquire(timeout=0.05) is False
+        assert lock.get_stats()['waiting'] == 0
+
+        holder.join()
+        assert lock.acquire(blocking=False) is True
+        lock.release()
+
+    def test_release_by_other_thread_fails(self):
+        lock = TabLock()
+        with pytest.raises(RuntimeError):
+            lock.release()
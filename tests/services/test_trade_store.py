@@ -0,0 +1,201 @@
+"""
+Tests for the segmented trade store in src/services/trade_store.py
+and its use by src/services/scraper_service.py
+"""
+
+import json
+from datetime import datetime
+from unittest import mock
+
+# Add project root to path
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.services.trade_store import TradeStore
+from src.services import scraper_service
+
+
+def trades(start, count):
+    return [{"price": 100 + i, "size": 1, "captured_at": datetime.now().isoformat()}
+            for i in range(start, start + count)]
+
+
+class TestTradeStore:
+    """Tests for TradeStore"""
+
+    def test_append_and_stream(self, tmp_path):
+        store = TradeStore(tmp_path)
+
+        store.append(trades(0, 3))
+        store.append(trades(3, 2))
+
+        assert [t["price"] for t in store.iter_records()] == [100, 101, 102, 103, 104]
+        stats = store.get_stats()
+        assert stats["segments"] == 1
+        assert stats["records"] == 5
+
+    def test_append_only_touches_open_segment(self, tmp_path):
+        store = TradeStore(tmp_path)
+        store.append(trades(0, 2))
+        segment = tmp_path / store.segments[0]["file"]
+        first_bytes = segment.read_bytes()
+
+        store.append(trades(2, 1))
+
+        # Existing content is untouched; the new record is appended after it
+        assert segment.read_bytes().startswith(first_bytes)
+
+    def test_rotation_by_size(self, tmp_path):
+        store = TradeStore(tmp_path, max_segment_bytes=200)
+
+        for i in range(10):
+            store.append(trades(i, 1))
+
+        assert store.get_stats()["segments"] > 1
+        assert [t["price"] for t in store.iter_records()] == list(range(100, 110))
+
+    def test_rotation_by_age(self, tmp_path):
+        store = TradeStore(tmp_path, max_segment_age=60)
+        store.append(trades(0, 1))
+        store.segments[-1]["created"] -= 120
+
+        store.append(trades(1, 1))
+
+        assert store.get_stats()["segments"] == 2
+        assert store.segments[0]["closed"] is True
+
+    def test_manifest_survives_restart(self, tmp_path):
+        store = TradeStore(tmp_path)
+        store.append(trades(0, 2))
+
+        reopened = TradeStore(tmp_path)
+        reopened.append(trades(2, 1))
+
+        assert reopened.get_stats()["records"] == 3
+        assert len(list(reopened.iter_records())) == 3
+
+    def test_rebuilds_missing_manifest_and_skips_torn_line(self, tmp_path):
+        store = TradeStore(tmp_path)
+        store.append(trades(0, 2))
+        segment = tmp_path / store.segments[0]["file"]
+        with open(segment, "a") as f:
+            f.write('{"price": 1')
+        (tmp_path / TradeStore.MANIFEST_NAME).unlink()
+
+        reopened = TradeStore(tmp_path)
+
+        assert reopened.get_stats()["segments"] == 1
+        assert [t["price"] for t in reopened.iter_records()] == [100, 101]
+
+    def test_reads_legacy_day_files(self, tmp_path):
+        (tmp_path / "2024-01-02_trades.json").write_text(json.dumps([{"price": 1}]))
+        store = TradeStore(tmp_path)
+        store.append(trades(0, 1))
+
+        assert [t["price"] for t in store.iter_records()] == [1, 100]
+        assert [t["price"] for t in store.iter_records("2024-01-01", "2024-01-03")] == [1]
+
+    def test_remove_before(self, tmp_path):
+        (tmp_path / "2024-01-02_trades.json").write_text(json.dumps([{"price": 1}]))
+        store = TradeStore(tmp_path)
+        store.append(trades(0, 1))
+
+        removed = store.remove_before("2025-01-01")
+
+        assert removed == ["2024-01-02_trades.json"]
+        assert [t["price"] for t in store.iter_records()] == [100]
+
+
+class TestScraperServicePersistence:
+    """Tests for ScraperService persisting through the trade store"""
+
+    def make_service(self, tmp_path):
+        with mock.patch.object(scraper_service, "get_project_root", return_value=tmp_path):
+            return scraper_service.ScraperService(persist_interval=3600)
+
+    def test_persist_appends_only_new_trades(self, tmp_path):
+        service = self.make_service(tmp_path)
+        service.add_scraped_data("Account 1", {"trades": trades(0, 2)})
+        service.persist_data()
+        service.add_scraped_data("Account 1", {"trades": trades(2, 1)})
+        service.persist_data()
+
+        stored = list(service.trade_store.iter_records())
+        assert [t["price"] for t in stored] == [100, 101, 102]
+        # The in-memory view keeps recent trades after persisting
+        assert len(service.get_recent_trades()) == 3
+
+    def test_auto_persist_from_add_scraped_data(self, tmp_path):
+        service = self.make_service(tmp_path)
+        service.persist_interval = 0
+        service.last_persist_time = 0
+
+        service.add_scraped_data("Account 1", {"trades": trades(0, 1)})
+
+        assert service.trade_store.get_stats()["records"] == 1
+
+    def test_export_streams_store(self, tmp_path):
+        service = self.make_service(tmp_path)
+        service.add_scraped_data("Account 1", {"trades": trades(0, 2)})
+
+        data, filename = service.export_data(format="csv")
+
+        lines = data.decode("utf-8").strip().splitlines()
+        assert lines[0].startswith("captured_at,account")
+        assert len(lines) == 3
+        assert filename.endswith(".csv")
+
+
+class TestScraperServiceDedup:
+    """Tests for de-duplicating re-sent time-and-sales rows"""
+
+    def make_service(self, tmp_path, **kwargs):
+        with mock.patch.object(scraper_service, "get_project_root", return_value=tmp_path):
+            return scraper_service.ScraperService(persist_interval=3600, **kwargs)
+
+    def prints(self, *volumes):
+        return [{"timestamp": "10:00:0%d" % v, "price": 100.25, "size": 1, "accumulatedVolume": v}
+                for v in volumes]
+
+    def test_resent_rows_are_skipped(self, tmp_path):
+        service = self.make_service(tmp_path)
+        contract = {"name": "NQZ5"}
+
+        service.add_scraped_data("Account 1", {"contractInfo": contract, "trades": self.prints(1, 2)})
+        service.add_scraped_data("Account 1", {"contractInfo": contract, "trades": self.prints(1, 2, 3)})
+        service.persist_data()
+
+        assert [t["accumulatedVolume"] for t in service.trade_store.iter_records()] == [1, 2, 3]
+        status = service.get_status()
+        assert status["trades_captured"] == 3
+        assert status["duplicates_skipped"] == 2
+
+    def test_same_print_on_other_account_or_symbol_is_kept(self, tmp_path):
+        service = self.make_service(tmp_path)
+
+        service.add_scraped_data("Account 1", {"contractInfo": {"name": "NQZ5"}, "trades": self.prints(1)})
+        service.add_scraped_data("Account 2", {"contractInfo": {"name": "NQZ5"}, "trades": self.prints(1)})
+        service.add_scraped_data("Account 1", {"contractInfo": {"name": "ESZ5"}, "trades": self.prints(1)})
+
+        assert service.get_status()["trades_captured"] == 3
+
+    def test_window_is_bounded(self, tmp_path):
+        service = self.make_service(tmp_path, dedup_window=2)
+
+        service.add_scraped_data("Account 1", {"trades": self.prints(1, 2, 3)})
+
+        assert len(service.seen_trades) == 2
+        # The oldest fingerprint fell out of the window
+        service.add_scraped_data("Account 1", {"trades": self.prints(1)})
+        assert service.get_status()["trades_captured"] == 4
+
+    def test_delta_messages_keep_last_contract_info(self, tmp_path):
+        service = self.make_service(tmp_path)
+        service.add_scraped_data("Account 1", {"delta": True, "contractInfo": {"name": "NQZ5"},
+                                               "trades": self.prints(1)})
+
+        service.add_scraped_data("Account 1", {"delta": True, "trades": self.prints(2)})
+
+        assert service.get_latest_data("Account 1")["contractInfo"] == {"name": "NQZ5"}
+        assert [t["symbol"] for t in service.get_recent_trades()] == ["NQZ5", "NQZ5"]
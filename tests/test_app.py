@@ -5,6 +5,8 @@ import os
 import json
 import sys
 import argparse
+import threading
+import time
 
 # Add project root to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -151,7 +153,7 @@ class TestTradovateConnection:
     def test_auto_trade(self, mock_browser, mock_tab):
         # Setup
         expected_result = {"result": "Trade executed"}
-        mock_tab.Runtime.evaluate.return_value = expected_result
+        mock_tab.Runtime.callFunctionOn.return_value = expected_result
         
         with patch("src.app.pychrome.Browser", return_value=mock_browser):
             with patch.object(app.TradovateConnection, "find_tradovate_tab"):
@@ -163,19 +165,20 @@ class TestTradovateConnection:
                 
                 # Assert
                 assert result == expected_result
-                mock_tab.Runtime.evaluate.assert_called_once()
-                # Check that the script contains the expected trade parameters
-                script = mock_tab.Runtime.evaluate.call_args[1]['expression']
-                assert "ES" in script
-                assert "Buy" in script
-                assert "100" in script
-                assert "40" in script
-                assert "0.25" in script
+                mock_tab.Runtime.callFunctionOn.assert_called_once()
+                # The trade parameters travel as JSON arguments, not as source
+                kwargs = mock_tab.Runtime.callFunctionOn.call_args[1]
+                assert kwargs["functionDeclaration"] == app.TradovateConnection.CALL_OP
+                assert kwargs["arguments"] == [
+                    {"value": "autoTrade"},
+                    {"value": {"symbol": "ES", "quantity": 1, "action": "Buy",
+                               "tp_ticks": 100, "sl_ticks": 40, "tick_size": 0.25}}
+                ]
 
     def test_exit_positions(self, mock_browser, mock_tab):
         # Setup
         expected_result = {"result": "Positions closed"}
-        mock_tab.Runtime.evaluate.return_value = expected_result
+        mock_tab.Runtime.callFunctionOn.return_value = expected_result
         
         with patch("src.app.pychrome.Browser", return_value=mock_browser):
             with patch.object(app.TradovateConnection, "find_tradovate_tab"):
@@ -187,16 +190,17 @@ class TestTradovateConnection:
                 
                 # Assert
                 assert result == expected_result
-                mock_tab.Runtime.evaluate.assert_called_once()
-                # Check that the script contains the expected exit parameters
-                script = mock_tab.Runtime.evaluate.call_args[1]['expression']
-                assert "ES" in script
-                assert "cancel-option-Exit-at-Mkt-Cxl" in script
+                mock_tab.Runtime.callFunctionOn.assert_called_once()
+                kwargs = mock_tab.Runtime.callFunctionOn.call_args[1]
+                assert kwargs["arguments"] == [
+                    {"value": "exitPositions"},
+                    {"value": {"symbol": "ES", "option": "cancel-option-Exit-at-Mkt-Cxl"}}
+                ]
 
     def test_update_symbol(self, mock_browser, mock_tab):
         # Setup
         expected_result = {"result": "Symbol updated"}
-        mock_tab.Runtime.evaluate.return_value = expected_result
+        mock_tab.Runtime.callFunctionOn.return_value = expected_result
         
         with patch("src.app.pychrome.Browser", return_value=mock_browser):
             with patch.object(app.TradovateConnection, "find_tradovate_tab"):
@@ -208,10 +212,203 @@ class TestTradovateConnection:
                 
                 # Assert
                 assert result == expected_result
+                mock_tab.Runtime.callFunctionOn.assert_called_once()
+                # Check that the symbol is passed as an argument
+                op_args = mock_tab.Runtime.callFunctionOn.call_args[1]["arguments"][1]["value"]
+                assert op_args["symbol"] == "ES"
+
+    def test_call_op_reuses_resolved_ops_table(self, mock_browser, mock_tab):
+        # Setup
+        mock_tab.Runtime.evaluate.return_value = {"result": {"type": "object", "objectId": "ops-1"}}
+        mock_tab.Runtime.callFunctionOn.return_value = {"result": {"value": "ok"}}
+        
+        with patch("src.app.pychrome.Browser", return_value=mock_browser):
+            with patch.object(app.TradovateConnection, "find_tradovate_tab"):
+                connection = app.TradovateConnection(9222, "Test Account")
+                connection.tab = mock_tab
+                
+                # Execute
+                connection.call_op("setQuantity", {"quantity": 1})
+                connection.call_op("setQuantity", {"quantity": 2})
+                
+                # Assert - one lookup, then only calls
                 mock_tab.Runtime.evaluate.assert_called_once()
-                # Check that the script contains the expected symbol
-                script = mock_tab.Runtime.evaluate.call_args[1]['expression']
-                assert "ES" in script
+                assert mock_tab.Runtime.callFunctionOn.call_count == 2
+                assert mock_tab.Runtime.callFunctionOn.call_args[1]["objectId"] == "ops-1"
+
+    def test_call_op_resolves_again_after_navigation(self, mock_browser, mock_tab):
+        # Setup - the first object id is gone after a reload
+        mock_tab.Runtime.evaluate.side_effect = [
+            {"result": {"type": "object", "objectId": "ops-1"}},
+            {"result": {"type": "object", "objectId": "ops-2"}},
+        ]
+        mock_tab.Runtime.callFunctionOn.side_effect = [
+            app.pychrome.CallMethodException("Could not find object with given id"),
+            {"result": {"value": "ok"}},
+        ]
+        
+        with patch("src.app.pychrome.Browser", return_value=mock_browser):
+            with patch.object(app.TradovateConnection, "find_tradovate_tab"):
+                connection = app.TradovateConnection(9222, "Test Account")
+                connection.tab = mock_tab
+                
+                # Execute
+                result = connection.call_op("setQuantity", {"quantity": 2})
+                
+                # Assert
+                assert result == {"result": {"value": "ok"}}
+                assert mock_tab.Runtime.callFunctionOn.call_args[1]["objectId"] == "ops-2"
+                assert connection.ops_object_id == "ops-2"
+
+    def test_call_op_loads_bundle_when_page_lacks_ops(self, mock_browser, mock_tab):
+        # Setup
+        mock_tab.Runtime.evaluate.side_effect = [
+            {"result": {"type": "undefined"}},
+            {"result": {"type": "object", "objectId": "ops-1"}},
+        ]
+        
+        with patch("src.app.pychrome.Browser", return_value=mock_browser):
+            with patch.object(app.TradovateConnection, "find_tradovate_tab"), \
+                 patch.object(app.TradovateConnection, "ensure_bundle") as ensure_bundle:
+                connection = app.TradovateConnection(9222, "Test Account")
+                connection.tab = mock_tab
+                
+                # Execute
+                connection.call_op("moveToBreakeven", {"symbol": "NQ"})
+                
+                # Assert
+                ensure_bundle.assert_called_once()
+                assert mock_tab.Runtime.callFunctionOn.call_args[1]["objectId"] == "ops-1"
+
+    def test_run_batch_is_one_round_trip(self, mock_browser, mock_tab):
+        # Setup
+        steps = [
+            {"op": "setEntryPrice", "args": {"price": None}, "optional": True},
+            {"op": "autoTrade", "args": {"symbol": "NQ", "quantity": 1}}
+        ]
+        mock_tab.Runtime.callFunctionOn.return_value = {"result": {"type": "object", "value": {
+            "steps": [
+                {"op": "setEntryPrice", "ok": True, "value": {"success": True}, "ms": 0.4},
+                {"op": "autoTrade", "ok": True, "value": "started", "ms": 2.1}
+            ],
+            "total_ms": 2.6
+        }}}
+        
+        with patch("src.app.pychrome.Browser", return_value=mock_browser):
+            with patch.object(app.TradovateConnection, "find_tradovate_tab"):
+                connection = app.TradovateConnection(9222, "Test Account")
+                connection.tab = mock_tab
+                
+                # Execute
+                result = connection.run_batch(steps)
+                
+                # Assert
+                mock_tab.Runtime.callFunctionOn.assert_called_once()
+                kwargs = mock_tab.Runtime.callFunctionOn.call_args[1]
+                assert kwargs["arguments"] == [{"value": "batch"}, {"value": {"steps": steps}}]
+                assert kwargs["awaitPromise"] is True
+                assert kwargs["returnByValue"] is True
+                assert [step["op"] for step in result["steps"]] == ["setEntryPrice", "autoTrade"]
+                assert "round_trip_ms" in result
+                assert "error" not in result
+
+    def test_run_batch_reports_failed_step(self, mock_browser, mock_tab):
+        # Setup
+        mock_tab.Runtime.callFunctionOn.return_value = {"result": {"type": "object", "value": {
+            "steps": [{"op": "exitPositions", "ok": False, "error": "ReferenceError: x", "ms": 0.1}],
+            "total_ms": 0.1
+        }}}
+        
+        with patch("src.app.pychrome.Browser", return_value=mock_browser):
+            with patch.object(app.TradovateConnection, "find_tradovate_tab"):
+                connection = app.TradovateConnection(9222, "Test Account")
+                connection.tab = mock_tab
+                
+                # Execute
+                result = connection.run_batch([{"op": "exitPositions"}, {"op": "riskManagement"}])
+                
+                # Assert
+                assert result["error"] == "exitPositions: ReferenceError: x"
+
+    def test_run_batch_reports_failed_optional_step_as_warning(self, mock_browser, mock_tab):
+        # Setup - the optional entry price step fails, the order still goes through
+        steps = [
+            {"op": "setEntryPrice", "args": {"price": 21000}, "optional": True},
+            {"op": "autoTrade", "args": {"symbol": "NQ", "quantity": 1}}
+        ]
+        mock_tab.Runtime.callFunctionOn.return_value = {"result": {"type": "object", "value": {
+            "steps": [
+                {"op": "setEntryPrice", "ok": False, "error": "Error: no price input", "ms": 0.2},
+                {"op": "autoTrade", "ok": True, "value": "started", "ms": 2.1}
+            ],
+            "total_ms": 2.3
+        }}}
+
+        with patch("src.app.pychrome.Browser", return_value=mock_browser):
+            with patch.object(app.TradovateConnection, "find_tradovate_tab"):
+                connection = app.TradovateConnection(9222, "Test Account")
+                connection.tab = mock_tab
+
+                # Execute
+                result = connection.run_batch(steps)
+
+                # Assert
+                assert "error" not in result
+                assert result["warnings"] == ["setEntryPrice: Error: no price input"]
+
+    def test_wait_for_ready(self, mock_browser, mock_tab):
+        # Setup - the page reports the condition met after 120ms
+        mock_tab.Runtime.evaluate.return_value = {"result": {"value": {"ready": True, "waited": 120}}}
+
+        with patch("src.app.pychrome.Browser", return_value=mock_browser):
+            with patch.object(app.TradovateConnection, "find_tradovate_tab"):
+                connection = app.TradovateConnection(9222, "Test Account")
+                connection.tab = mock_tab
+
+                # Execute
+                result = connection.wait_for_account("Demo 1", timeout=2.0)
+
+                # Assert
+                assert result == {"ready": True, "waited": 0.12}
+                kwargs = mock_tab.Runtime.evaluate.call_args[1]
+                assert kwargs["awaitPromise"] is True
+                assert "MutationObserver" in kwargs["expression"]
+                assert '"Demo 1"' in kwargs["expression"]
+                assert "2000" in kwargs["expression"]
+
+    def test_wait_for_not_ready(self, mock_browser, mock_tab):
+        # Setup - the page gave up at the timeout
+        mock_tab.Runtime.evaluate.return_value = {"result": {"value": {"ready": False, "waited": 1000}}}
+
+        with patch("src.app.pychrome.Browser", return_value=mock_browser):
+            with patch.object(app.TradovateConnection, "find_tradovate_tab"):
+                connection = app.TradovateConnection(9222, "Test Account")
+                connection.tab = mock_tab
+
+                # Execute
+                result = connection.wait_for_functions(["getTableData", "performAccountActions"], timeout=1.0)
+
+                # Assert
+                assert result["ready"] is False
+                assert result["waited"] == 1.0
+                expression = mock_tab.Runtime.evaluate.call_args[1]["expression"]
+                assert "typeof getTableData === 'function' && typeof performAccountActions === 'function'" in expression
+
+    def test_wait_for_error(self, mock_browser, mock_tab):
+        # Setup
+        mock_tab.Runtime.evaluate.side_effect = Exception("Tab closed")
+
+        with patch("src.app.pychrome.Browser", return_value=mock_browser):
+            with patch.object(app.TradovateConnection, "find_tradovate_tab"):
+                connection = app.TradovateConnection(9222, "Test Account")
+                connection.tab = mock_tab
+
+                # Execute
+                result = connection.wait_for_symbol("NQ")
+
+                # Assert
+                assert result["ready"] is False
+                assert result["error"] == "Tab closed"
 
     def test_run_risk_management(self, mock_browser, mock_tab):
         # Setup
@@ -252,6 +449,90 @@ class TestTradovateConnection:
                 mock_tab.Runtime.evaluate.assert_called_once_with(expression="getAllAccountTableData()")
 
 
+TRADOVATE_TARGET = {
+    "id": "ABC",
+    "type": "page",
+    "url": "https://trader.tradovate.com/welcome",
+    "webSocketDebuggerUrl": "ws://127.0.0.1:9222/devtools/page/ABC"
+}
+
+
+class TestDiscovery:
+    def test_probe_port_lists_pages(self):
+        response = MagicMock()
+        response.json.return_value = [TRADOVATE_TARGET, {"type": "service_worker", "url": "https://x"}]
+        
+        with patch("src.app.requests.get", return_value=response) as mock_get:
+            targets = app.probe_port(9222, timeout=0.2)
+        
+        assert targets == [TRADOVATE_TARGET]
+        mock_get.assert_called_once_with("http://127.0.0.1:9222/json/list", timeout=0.2)
+    
+    def test_probe_port_unreachable(self):
+        with patch("src.app.requests.get", side_effect=app.requests.ConnectionError("refused")):
+            assert app.probe_port(9222) is None
+    
+    def test_find_tradovate_target_filters_by_url(self):
+        other = {"url": "https://example.com", "webSocketDebuggerUrl": "ws://x"}
+        attached = {"url": "https://trader.tradovate.com"}  # already has a client, no websocket URL
+        
+        assert app.find_tradovate_target([other, attached, TRADOVATE_TARGET]) == TRADOVATE_TARGET
+        assert app.find_tradovate_target([other]) is None
+        assert app.find_tradovate_target(None) is None
+    
+    def test_connection_attaches_to_given_target_only(self, mock_browser, mock_tab):
+        with patch("src.app.pychrome.Browser", return_value=mock_browser), \
+             patch("src.app.pychrome.Tab", return_value=mock_tab) as MockTab:
+            connection = app.TradovateConnection(9222, "Account 1", target=TRADOVATE_TARGET)
+        
+        assert connection.tab == mock_tab
+        MockTab.assert_called_once_with(**TRADOVATE_TARGET)
+        mock_tab.start.assert_called_once()
+        mock_browser.list_tab.assert_not_called()
+        mock_tab.Runtime.evaluate.assert_not_called()
+    
+    def test_discovery_is_parallel_and_only_attaches_matches(self):
+        # Setup - every probe takes 0.2s; only port 9224 has Tradovate
+        def slow_probe(port, timeout):
+            time.sleep(0.2)
+            return [TRADOVATE_TARGET] if port == 9224 else [{"url": "https://example.com"}]
+        
+        with patch("src.app.probe_port", side_effect=slow_probe), \
+             patch("src.app.TradovateConnection") as MockConnection:
+            MockConnection.return_value.tab = MagicMock()
+            
+            # Execute
+            started = time.monotonic()
+            controller = app.TradovateController(base_port=9223)
+            elapsed = time.monotonic() - started
+        
+        # Assert
+        assert elapsed < 1.0
+        MockConnection.assert_called_once_with(9224, "Account 2", target=TRADOVATE_TARGET)
+        assert len(controller.connections) == 1
+    
+    def test_discovery_deadline(self):
+        release = threading.Event()
+        
+        def probe(port, timeout):
+            if port == 9223:
+                release.wait(3)
+                return [TRADOVATE_TARGET]
+            return None
+        
+        with patch("src.app.probe_port", side_effect=probe), \
+             patch.object(app.TradovateController, "DISCOVERY_DEADLINE", 0.2), \
+             patch("src.app.TradovateConnection") as MockConnection:
+            started = time.monotonic()
+            controller = app.TradovateController(base_port=9223)
+            elapsed = time.monotonic() - started
+            release.set()
+        
+        assert elapsed < 1.0
+        assert controller.connections == []
+        MockConnection.assert_not_called()
+
+
 class TestTradovateController:
     def test_init(self):
         # Setup
@@ -269,7 +550,8 @@ class TestTradovateController:
         mock_connection = MagicMock()
         mock_connection.tab = MagicMock()  # Valid tab
         
-        with patch("src.app.TradovateConnection", return_value=mock_connection):
+        with patch("src.app.probe_port", return_value=[TRADOVATE_TARGET]), \
+             patch("src.app.TradovateConnection", return_value=mock_connection):
             # Execute
             controller = app.TradovateController(base_port=9222)
             
@@ -283,7 +565,8 @@ class TestTradovateController:
         mock_connection = MagicMock()
         mock_connection.tab = None  # No valid tab
         
-        with patch("src.app.TradovateConnection", return_value=mock_connection):
+        with patch("src.app.probe_port", return_value=[TRADOVATE_TARGET]), \
+             patch("src.app.TradovateConnection", return_value=mock_connection):
             # Execute
             controller = app.TradovateController(base_port=9222)
             
@@ -318,6 +601,88 @@ class TestTradovateController:
             mock_conn1.auto_trade.assert_called_once_with("ES", 1, "Buy", 100, 40, 0.25)
             mock_conn2.auto_trade.assert_called_once_with("ES", 1, "Buy", 100, 40, 0.25)
     
+    def test_execute_on_all_runs_accounts_concurrently(self):
+        # Setup - each account takes 0.3s
+        def slow_trade(*args):
+            time.sleep(0.3)
+            return {"status": "success"}
+
+        connections = []
+        for i in range(4):
+            conn = MagicMock()
+            conn.account_name = f"Account {i+1}"
+            conn.port = 9222 + i
+            conn.auto_trade.side_effect = slow_trade
+            connections.append(conn)
+
+        with patch.object(app.TradovateController, "initialize_connections"):
+            controller = app.TradovateController()
+            controller.connections = connections
+
+            # Execute
+            start = time.monotonic()
+            results = controller.execute_on_all("auto_trade", "ES", 1, "Buy", 100, 40, 0.25)
+            elapsed = time.monotonic() - start
+
+            # Assert - bounded by the slowest account, not the sum
+            assert elapsed < 1.0
+            assert [r["account"] for r in results] == ["Account 1", "Account 2", "Account 3", "Account 4"]
+            assert all(r["result"]["status"] == "success" for r in results)
+
+    def test_execute_on_all_partial_failure(self):
+        # Setup - the first account raises, the second succeeds
+        mock_conn1 = MagicMock()
+        mock_conn1.account_name = "Account 1"
+        mock_conn1.port = 9222
+        mock_conn1.exit_positions.side_effect = Exception("Tab crashed")
+
+        mock_conn2 = MagicMock()
+        mock_conn2.account_name = "Account 2"
+        mock_conn2.port = 9223
+        mock_conn2.exit_positions.return_value = {"status": "success"}
+
+        with patch.object(app.TradovateController, "initialize_connections"):
+            controller = app.TradovateController()
+            controller.connections = [mock_conn1, mock_conn2]
+
+            # Execute
+            results = controller.execute_on_all("exit_positions", "ES")
+
+            # Assert
+            assert results[0]["account"] == "Account 1"
+            assert results[0]["result"] == {"error": "Tab crashed"}
+            assert results[1]["result"]["status"] == "success"
+
+    def test_execute_on_all_deadline(self):
+        # Setup - one account never answers within the deadline
+        release = threading.Event()
+
+        mock_conn1 = MagicMock()
+        mock_conn1.account_name = "Account 1"
+        mock_conn1.port = 9222
+        mock_conn1.update_symbol.side_effect = lambda *args: release.wait(5)
+
+        mock_conn2 = MagicMock()
+        mock_conn2.account_name = "Account 2"
+        mock_conn2.port = 9223
+        mock_conn2.update_symbol.return_value = {"status": "success"}
+
+        with patch.object(app.TradovateController, "initialize_connections"):
+            controller = app.TradovateController()
+            controller.connections = [mock_conn1, mock_conn2]
+
+            # Execute
+            start = time.monotonic()
+            results = controller.execute_on_all("update_symbol", "ES", _timeout=0.2)
+            elapsed = time.monotonic() - start
+            release.set()
+
+            # Assert
+            assert elapsed < 1.0
+            assert "Timed out" in results[0]["result"]["error"]
+            assert results[1]["result"]["status"] == "success"
+            mock_conn1.update_symbol.assert_called_once_with("ES")
+
     def test_execute_on_one(self):
         # Setup
         mock_conn1 = MagicMock()
@@ -351,6 +716,103 @@ class TestTradovateController:
             assert "Invalid connection index: 5" in result["error"]
 
 
+class TestConnectionHealth:
+    def make_connection(self, mock_browser, tab):
+        with patch("src.app.pychrome.Browser", return_value=mock_browser):
+            with patch.object(app.TradovateConnection, "find_tradovate_tab"):
+                conn = app.TradovateConnection(9223, "Account 1")
+        conn.tab = tab
+        return conn
+
+    def test_failed_probes_degrade_then_need_repair(self, mock_browser):
+        tab = MagicMock()
+        tab.Runtime.evaluate.side_effect = Exception("socket closed")
+        conn = self.make_connection(mock_browser, tab)
+
+        assert conn.check_health() == "degraded"
+        assert conn.is_available()
+        assert not conn.needs_repair()
+        conn.check_health()
+        assert conn.needs_repair()
+
+        tab.Runtime.evaluate.side_effect = None
+        tab.Runtime.evaluate.return_value = {"result": {"value": 2}}
+        assert conn.check_health() == "healthy"
+        assert conn.health_failures == 0
+
+    def test_busy_connection_is_not_probed(self, mock_browser):
+        tab = MagicMock()
+        conn = self.make_connection(mock_browser, tab)
+        holder = threading.Thread(target=lambda: (conn.lock.acquire(), time.sleep(0.3), conn.lock.release()))
+        holder.start()
+        time.sleep(0.05)
+
+        assert conn.check_health() == "healthy"
+        tab.Runtime.evaluate.assert_not_called()
+        holder.join()
+
+    def test_reconnect_success_and_dead_after_repeated_failures(self, mock_browser):
+        conn = self.make_connection(mock_browser, MagicMock())
+        new_tab = MagicMock()
+
+        def attach():
+            conn.tab = new_tab
+
+        with patch("src.app.pychrome.Browser", return_value=mock_browser), \
+             patch.object(conn, "inject_tampermonkey"):
+            with patch.object(conn, "discover_tab", side_effect=attach):
+                assert conn.reconnect() is True
+            assert conn.tab is new_tab
+            assert conn.health == "healthy"
+
+            with patch.object(conn, "discover_tab"):
+                for _ in range(conn.MAX_REPAIR_ATTEMPTS):
+                    assert conn.reconnect() is False
+            assert conn.health == "dead"
+            assert not conn.is_available()
+
+    def test_controller_repairs_only_broken_connection(self):
+        healthy = MagicMock()
+        healthy.needs_repair.return_value = False
+        healthy.health = "healthy"
+        broken = MagicMock()
+        broken.needs_repair.return_value = True
+        broken.health = "degraded"
+
+        with patch.object(app.TradovateController, "initialize_connections"):
+            controller = app.TradovateController()
+            controller.connections = [healthy, broken]
+
+            controller.check_health()
+
+            healthy.check_health.assert_called_once()
+            broken.check_health.assert_called_once()
+            broken.reconnect.assert_called_once()
+            healthy.reconnect.assert_not_called()
+            assert controller.connections == [healthy, broken]
+
+    def test_fan_out_skips_connection_under_repair(self):
+        reconnecting = MagicMock()
+        reconnecting.account_name = "Account 1"
+        reconnecting.port = 9223
+        reconnecting.health = "reconnecting"
+        healthy = MagicMock()
+        healthy.account_name = "Account 2"
+        healthy.port = 9224
+        healthy.health = "healthy"
+        healthy.exit_positions.return_value = {"status": "success"}
+
+        with patch.object(app.TradovateController, "initialize_connections"):
+            controller = app.TradovateController()
+            controller.connections = [reconnecting, healthy]
+
+            results = controller.execute_on_all("exit_positions", "NQ")
+
+            assert results[0]["result"] == {"error": "Connection reconnecting"}
+            assert results[1]["result"]["status"] == "success"
+            reconnecting.exit_positions.assert_not_called()
+
+
 class TestMainFunction:
     def test_main_list_command(self):
         # Setup
@@ -515,4 +977,90 @@ class TestMainFunction:
 
 
 if __name__ == "__main__":
-    pytest.main(["-v", "test_app.py"])
\ No newline at end of file
+    pytest.main(["-v", "test_app.py"])
+
+class TestScriptBundleInjection:
+    """Tests for loading the versioned script bundle into a tab"""
+
+    PARTS = [('a.js', 'function a() {}'), ('version-marker', 'window.__tradovateBundleVersion = "v1";')]
+
+    def make_connection(self, mock_browser, mock_tab):
+        with patch("src.app.pychrome.Browser", return_value=mock_browser):
+            with patch.object(app.TradovateConnection, "find_tradovate_tab"):
+                connection = app.TradovateConnection(9222, "Test Account")
+        connection.tab = mock_tab
+        return connection
+
+    def make_bundle(self, version="v1"):
+        bundle = MagicMock()
+        bundle.get.return_value = (version, list(self.PARTS))
+        bundle.check_expression.side_effect = lambda v: f'window.__tradovateBundleVersion === "{v}"'
+        return bundle
+
+    def test_current_bundle_is_a_single_check(self, mock_browser, mock_tab):
+        connection = self.make_connection(mock_browser, mock_tab)
+        mock_tab.mock_evaluate_result(True)
+
+        with patch("src.app.get_script_bundle", return_value=self.make_bundle()):
+            assert connection.ensure_bundle() == 'current'
+            assert connection.inject_tampermonkey() is True
+
+        assert mock_tab.Runtime.evaluate.call_count == 2
+        mock_tab.Page.addScriptToEvaluateOnNewDocument.assert_not_called()
+
+    def test_stale_bundle_is_evaluated_and_registered_once(self, mock_browser, mock_tab):
+        connection = self.make_connection(mock_browser, mock_tab)
+        mock_tab.mock_evaluate_result(None)
+        mock_tab.Page.addScriptToEvaluateOnNewDocument.return_value = {"identifier": "1"}
+
+        with patch("src.app.get_script_bundle", return_value=self.make_bundle()):
+            assert connection.ensure_bundle() == 'loaded'
+            assert connection.ensure_bundle() == 'loaded'
+
+        expressions = [c.kwargs["expression"] for c in mock_tab.Runtime.evaluate.call_args_list]
+        assert expressions[1:3] == [source for _, source in self.PARTS]
+        assert mock_tab.Page.addScriptToEvaluateOnNewDocument.call_count == len(self.PARTS)
+        # Registered parts wait for the DOM; they run before document.body exists otherwise
+        registered = [c.kwargs["source"] for c in mock_tab.Page.addScriptToEvaluateOnNewDocument.call_args_list]
+        assert all("DOMContentLoaded" in source for source in registered)
+        assert connection.bundle_version == "v1"
+
+    def test_failing_part_leaves_marker_unset(self, mock_browser, mock_tab):
+        connection = self.make_connection(mock_browser, mock_tab)
+        parts = [('a.js', 'function a() {}'), ('b.js', 'throw new Error("boom")')] + self.PARTS[1:]
+        bundle = self.make_bundle()
+        bundle.get.return_value = ("v1", parts)
+
+        def evaluate(expression, **kwargs):
+            if expression.startswith("throw"):
+                return {"result": {}, "exceptionDetails": {"text": "Uncaught",
+                                                           "exception": {"description": "Error: boom"}}}
+            return {"result": {"value": None}}
+        mock_tab.Runtime.evaluate.side_effect = evaluate
+
+        with patch("src.app.get_script_bundle", return_value=bundle):
+            assert connection.ensure_bundle() == 'error'
+            assert connection.inject_tampermonkey() is False
+
+        # The marker part never ran, nothing was registered, and the failure is visible in the health
+        expressions = [c.kwargs["expression"] for c in mock_tab.Runtime.evaluate.call_args_list]
+        assert parts[-1][1] not in expressions
+        mock_tab.Page.addScriptToEvaluateOnNewDocument.assert_not_called()
+        assert connection.bundle_error == "b.js: Error: boom"
+        assert connection.get_health()["bundle_error"] == "b.js: Error: boom"
+        mock_tab.Runtime.evaluate.side_effect = None
+        mock_tab.mock_evaluate_result(2)
+        assert connection.check_health() == "degraded"
+
+    def test_new_version_replaces_registered_scripts(self, mock_browser, mock_tab):
+        connection = self.make_connection(mock_browser, mock_tab)
+        mock_tab.mock_evaluate_result(None)
+        mock_tab.Page.addScriptToEvaluateOnNewDocument.return_value = {"identifier": "1"}
+
+        with patch("src.app.get_script_bundle", return_value=self.make_bundle("v1")):
+            connection.ensure_bundle()
+        with patch("src.app.get_script_bundle", return_value=self.make_bundle("v2")):
+            connection.ensure_bundle()
+
+        assert mock_tab.Page.removeScriptToEvaluateOnNewDocument.call_count == len(self.PARTS)
+        assert connection.bundle_version == "v2"
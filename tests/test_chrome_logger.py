@@ -2,6 +2,7 @@
 import pytest
 from unittest.mock import patch, MagicMock, mock_open, call
 import os
+import json
 import time
 import datetime
 import threading
@@ -52,25 +53,26 @@ class TestChromeLogger:
                 # Assert stop
                 assert logger.is_running is False
 
-    @patch("builtins.open", new_callable=mock_open)
-    def test_write_to_file(self, mock_file, mock_tab):
+    def test_write_to_file(self, mock_tab):
         # Setup
         logger = chrome_logger.ChromeLogger(mock_tab, log_file="test.log")
         entry = {
             "level": "INFO",
             "text": "Test message"
         }
+        writer = MagicMock()
         
         # Execute
-        logger._write_to_file(entry)
+        with patch.object(chrome_logger, "get_log_writer", return_value=writer):
+            logger._write_to_file(entry)
         
-        # Assert
-        mock_file.assert_called_once_with("test.log", "a", encoding="utf-8")
-        mock_file().write.assert_called_once()
+        # Assert - the line is queued for the background writer, not written inline
+        writer.write.assert_called_once()
+        path, line = writer.write.call_args[0]
+        assert path == logger.log_file
         # Check that the log entry contains the level and text
-        write_arg = mock_file().write.call_args[0][0]
-        assert "INFO" in write_arg
-        assert "Test message" in write_arg
+        assert "INFO" in line
+        assert "Test message" in line
 
     def test_callbacks(self, mock_tab):
         # Setup
@@ -198,6 +200,109 @@ class TestChromeLogger:
             assert entry["level"] == "WARNING"  # Uppercase
             assert entry["text"] == "Console warning message"
 
+    def test_binding_called_feeds_scraper_service(self, mock_tab):
+        # Setup
+        logger = chrome_logger.ChromeLogger(mock_tab, log_file=None, account_name="Account 1")
+        callback = MagicMock()
+        logger.add_callback(callback)
+        service = MagicMock()
+        payload = {"ts": "2025-01-01T00:00:00Z", "d": 1, "c": {"name": "NQZ5"},
+                   "t": [["10:00:01", 21000.25, 2, 15, None, False]]}
+        
+        with patch.object(chrome_logger, "get_scraper_service", return_value=service), \
+             patch.object(logger, "_write_to_file") as mock_write:
+            # Execute
+            logger._on_binding_called(name=logger.SCRAPER_BINDING, payload=json.dumps(payload))
+            logger._on_binding_called(name="someOtherBinding", payload="{}")
+            
+            # Assert - decoded data reaches the service and nothing is logged
+            service.add_scraped_data.assert_called_once()
+            account, data = service.add_scraped_data.call_args[0]
+            assert account == "Account 1"
+            assert data["delta"] is True
+            assert data["contractInfo"] == {"name": "NQZ5"}
+            assert data["trades"] == [{"timestamp": "10:00:01", "price": 21000.25, "size": 2,
+                                       "accumulatedVolume": 15, "isHighlighted": False}]
+            mock_write.assert_not_called()
+            callback.assert_not_called()
+            assert len(logger.combined_log_entries) == 0
+
+    def test_console_scraper_data_bypasses_log(self, mock_tab):
+        # Setup
+        logger = chrome_logger.ChromeLogger(mock_tab, log_file=None, account_name="Account 1")
+        callback = MagicMock()
+        logger.add_callback(callback)
+        service = MagicMock()
+        
+        with patch.object(chrome_logger, "get_scraper_service", return_value=service), \
+             patch.object(logger, "_write_to_file") as mock_write:
+            # Execute
+            logger._on_console_api(type="log", args=[{"value": '[SCRAPER_DATA] {"trades": []}'}])
+            
+            # Assert
+            service.add_scraped_data.assert_called_once_with("Account 1", {"trades": []})
+            mock_write.assert_not_called()
+            callback.assert_not_called()
+
+    def test_slow_callback_does_not_block_event_handling(self, mock_tab):
+        # Setup
+        logger = chrome_logger.ChromeLogger(mock_tab, log_file=None)
+        release = threading.Event()
+        slow = MagicMock(side_effect=lambda entry: release.wait(2))
+        fast = MagicMock()
+        logger.add_callback(slow)
+        logger.add_callback(fast)
+        logger.dispatcher.start()
+        
+        # Execute - handlers return while the slow consumer is still busy
+        started = time.time()
+        for i in range(5):
+            logger._on_log_entry(entry={"level": "INFO", "text": f"message {i}"})
+        elapsed = time.time() - started
+        
+        # Assert
+        assert elapsed < 0.5
+        assert logger.dispatcher.workers[id(fast)].flush(1.0)
+        assert fast.call_count == 5
+        release.set()
+        assert logger.flush_callbacks()
+        assert slow.call_count == 5
+        logger.dispatcher.stop()
+
+    def test_error_entry_references_background_snapshot(self, mock_tab, tmp_path):
+        # Setup
+        logger = chrome_logger.ChromeLogger(mock_tab, log_file=str(tmp_path / "chrome.log"), snapshot_interval=0)
+        captured = threading.Event()
+        mock_tab.DOMSnapshot = MagicMock()
+        mock_tab.DOMSnapshot.captureSnapshot.side_effect = lambda **kwargs: captured.wait(2) and {"documents": []}
+        logger.enable_dom_snapshots()
+        
+        with patch.object(logger, "_write_to_file"):
+            # Execute - the handler returns before the capture completes
+            logger._on_console_api(type="error", args=[{"value": "Order failed"}])
+            
+            # Assert
+            ref = logger.combined_log_entries.copy()[0]["dom_snapshot"]
+            assert ref["status"] == "pending"
+            captured.set()
+            deadline = time.time() + 2
+            while ref["status"] == "pending" and time.time() < deadline:
+                time.sleep(0.01)
+            assert ref["status"] == "captured"
+            assert logger.load_dom_snapshot(ref["id"]) == {"documents": []}
+        logger.snapshot_scheduler.stop()
+
+    def test_start_adds_scraper_binding(self):
+        tab = MagicMock()
+        logger = chrome_logger.ChromeLogger(tab)
+        
+        with patch("threading.Thread"):
+            assert logger.start() is True
+        
+        tab.Runtime.addBinding.assert_called_once_with(name=logger.SCRAPER_BINDING)
+        assert tab.Runtime.bindingCalled == logger._on_binding_called
+        logger.stop()
+
     @patch("time.sleep", side_effect=InterruptedError)  # Force exit from the loop
     def test_process_logs(self, mock_sleep, mock_tab):
         # Setup
@@ -255,6 +360,7 @@ class TestChromeLogger:
             logger.start()
         
         # Now trigger various events
+        # (callbacks run on dispatcher workers while the logger is started)
         
         # 1. Log entry
         logger._on_log_entry(entry={
@@ -276,6 +382,7 @@ class TestChromeLogger:
         )
         
         # Assert
+        assert logger.flush_callbacks()
         assert callback.call_count == 3
         
         # Check individual calls
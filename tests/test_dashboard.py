@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+import pytest
+from unittest.mock import patch
+import os
+import sys
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import app
+with patch.object(app.TradovateController, "initialize_connections"):
+    from src import dashboard
+
+
+def wrapped(batch):
+    """execute_on_one() result for a run_batch() call"""
+    return {"account": "Account 1", "port": 9223, "result": batch}
+
+
+@pytest.fixture
+def client():
+    return dashboard.app.test_client()
+
+
+class TestBatchResults:
+    def test_exit_reports_risk_management_even_if_exit_fails(self, client):
+        batch = {
+            "steps": [
+                {"op": "exitPositions", "ok": False, "error": "No position"},
+                {"op": "riskManagement", "ok": True, "value": {"status": "success"}}
+            ],
+            "warnings": ["exitPositions: No position"]
+        }
+
+        with patch.object(dashboard.controller, "execute_on_one", return_value=wrapped(batch)) as execute:
+            response = client.post("/api/exit", json={"symbol": "NQ", "account": 0})
+
+        steps = execute.call_args.args[2]
+        assert steps[0]["op"] == "exitPositions" and steps[0]["optional"] is True
+        assert response.get_json()["risk_management"] == {"status": "success"}
+
+    def test_failed_entry_price_does_not_fail_the_account(self, client):
+        batch = {
+            "steps": [
+                {"op": "setEntryPrice", "ok": False, "error": "Error: no price input"},
+                {"op": "autoTrade", "ok": True, "value": "started"}
+            ],
+            "warnings": ["setEntryPrice: Error: no price input"]
+        }
+
+        with patch.object(dashboard.controller, "execute_on_all", return_value=[wrapped(batch)]), \
+             patch.object(dashboard.controller, "connections", [object()]):
+            response = client.post("/api/trade", json={"symbol": "NQ", "quantity": 1, "account": "all"})
+
+        assert response.get_json()["accounts_affected"] == 1
+
+    def test_scale_order_error_is_reported(self, client):
+        batch = {"steps": [{"op": "autoTradeScale", "ok": False, "error": "Bad order"}],
+                 "error": "autoTradeScale: Bad order"}
+
+        with patch.object(dashboard.controller, "execute_on_one", return_value=wrapped(batch)), \
+             patch.object(dashboard, "calculate_scale_orders", return_value=[{"quantity": 5}, {"quantity": 5}]):
+            response = client.post("/api/trade", json={
+                "symbol": "NQ", "quantity": 10, "account": 0,
+                "scale_in_enabled": True, "scale_in_levels": 2
+            })
+
+        assert response.status_code == 500
+        assert response.get_json()["message"] == "Scale order failed: autoTradeScale: Bad order"
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_dashboard.py"])
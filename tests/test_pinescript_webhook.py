@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+import pytest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+import threading
+import time
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import app
+from src import pinescript_webhook
+from src.services.signal_queue import SignalQueue
+from src.services.signal_dedup import SignalDeduplicator
+from src.services.signal_journal import SignalJournal
+from src.services.tab_lock import TabLock
+
+
+def make_connection(index):
+    conn = MagicMock()
+    conn.account_name = f"Account {index+1}"
+    conn.port = 9223 + index
+    conn.lock = TabLock()
+    return conn
+
+
+@pytest.fixture
+def controller():
+    with patch.object(app.TradovateController, "initialize_connections"):
+        controller = app.TradovateController()
+    controller.connections = [make_connection(i) for i in range(4)]
+    with patch.object(pinescript_webhook, "controller", controller):
+        yield controller
+
+
+class TestSignalPipeline:
+    def test_open_signal_runs_accounts_in_parallel(self, controller):
+        # Setup - every step takes a while on each tab
+        def slow_step(*args, **kwargs):
+            time.sleep(0.2)
+            return {"status": "success"}
+
+        with patch.object(pinescript_webhook, "switch_account_for_open", side_effect=lambda c, i, n: n[0]), \
+             patch.object(pinescript_webhook, "update_ui_symbol", side_effect=slow_step), \
+             patch.object(pinescript_webhook, "load_account_switcher_script", return_value=None):
+            for conn in controller.connections:
+                conn.auto_trade.side_effect = slow_step
+
+            # Execute
+            start = time.monotonic()
+            results = pinescript_webhook.execute_signal_on_accounts(
+                [0, 1, 2, 3], "Open", "NQ", ["Demo1"], order_args=(1, "Buy", 100, 40, 0.25)
+            )
+            elapsed = time.monotonic() - start
+
+            # Assert - four accounts take about as long as one
+            assert elapsed < 1.0
+            assert [r["account_index"] for r in results] == [0, 1, 2, 3]
+            assert all(r["account_switch_success"] for r in results)
+            for conn in controller.connections:
+                conn.auto_trade.assert_called_once_with("NQ", 1, "Buy", 100, 40, 0.25)
+
+    def test_steps_stay_ordered_per_tab(self, controller):
+        # Setup - record the order of steps per tab
+        calls = []
+
+        def switch(conn, index, names):
+            calls.append((index, "switch"))
+            return names[0]
+
+        def update(index, symbol):
+            calls.append((index, "symbol"))
+
+        def exit_positions(*args):
+            calls.append((args, "order"))
+            return {"status": "success"}
+
+        with patch.object(pinescript_webhook, "switch_account_for_close", side_effect=switch), \
+             patch.object(pinescript_webhook, "update_ui_symbol", side_effect=update), \
+             patch.object(pinescript_webhook, "load_account_switcher_script", return_value=None):
+            controller.connections[1].exit_positions.side_effect = exit_positions
+
+            # Execute
+            results = pinescript_webhook.execute_signal_on_accounts([1], "Close", "ES", ["Demo1"])
+
+            # Assert
+            assert [step for _, step in calls] == ["switch", "symbol", "order"]
+            assert results[0]["account_id"] == "Demo1"
+
+    def test_close_takes_tab_ahead_of_waiting_open(self, controller):
+        # Setup - tab 0 is busy, an Open is already waiting for it when a Close arrives
+        order = []
+
+        def switch(conn, index, names):
+            return names[0]
+
+        def record(step):
+            return lambda *args: order.append(step) or {"status": "success"}
+
+        with patch.object(pinescript_webhook, "switch_account_for_open", side_effect=switch), \
+             patch.object(pinescript_webhook, "switch_account_for_close", side_effect=switch), \
+             patch.object(pinescript_webhook, "update_ui_symbol"), \
+             patch.object(pinescript_webhook, "load_account_switcher_script", return_value=None):
+            conn = controller.connections[0]
+            conn.auto_trade.side_effect = record("open")
+            conn.exit_positions.side_effect = record("close")
+            conn.lock.acquire()
+
+            # Execute
+            opened = threading.Thread(target=pinescript_webhook.execute_signal_on_accounts,
+                                      args=([0], "Open", "NQ", ["Demo1"]), kwargs={"order_args": (1, "Buy", 100, 40, 0.25)})
+            opened.start()
+            deadline = time.monotonic() + 2
+            while conn.lock.get_stats()["waiting"] < 1 and time.monotonic() < deadline:
+                time.sleep(0.005)
+            closed = threading.Thread(target=pinescript_webhook.execute_signal_on_accounts,
+                                      args=([0], "Close", "NQ", ["Demo1"]))
+            closed.start()
+            while conn.lock.get_stats()["waiting_exits"] < 1 and time.monotonic() < deadline:
+                time.sleep(0.005)
+            conn.lock.release()
+            opened.join(timeout=2)
+            closed.join(timeout=2)
+
+            # Assert
+            assert order == ["close", "open"]
+
+    def test_failed_switch_does_not_block_others(self, controller):
+        # Setup - tab 0 cannot find the account, the others can
+        def switch(conn, index, names):
+            return None if index == 0 else names[0]
+
+        with patch.object(pinescript_webhook, "switch_account_for_open", side_effect=switch), \
+             patch.object(pinescript_webhook, "update_ui_symbol"), \
+             patch.object(pinescript_webhook, "load_account_switcher_script", return_value=None):
+            # Execute
+            results = pinescript_webhook.execute_signal_on_accounts(
+                [0, 1, 9], "Open", "NQ", ["Demo1"], order_args=(1, "Buy", 100, 40, 0.25)
+            )
+
+            # Assert
+            assert results[0]["error"] == "Failed to switch to any account"
+            assert results[1]["account_switch_success"] is True
+            assert "Invalid connection index" in results[2]["error"]
+            assert results[2]["account_index"] == 9
+            controller.connections[0].auto_trade.assert_not_called()
+
+
+class TestStrategyRouting:
+    def test_no_controller_falls_back_without_raising(self):
+        with patch.object(pinescript_webhook, "controller", None):
+            indices, _ = pinescript_webhook.get_target_accounts_for_strategy("Scalp")
+
+        assert indices == []
+
+    def test_router_error_falls_back_to_every_tab(self, controller):
+        router = MagicMock()
+        router.route.side_effect = RuntimeError("bad mappings")
+
+        with patch.object(pinescript_webhook, "get_strategy_router", return_value=router):
+            assert pinescript_webhook.get_target_accounts_for_strategy("Scalp") == ([0, 1, 2, 3], [])
+
+
+class TestSignalJournaling:
+    @pytest.fixture
+    def journal(self, tmp_path):
+        journal = SignalJournal(tmp_path / "signal_journal.jsonl")
+        with patch.object(pinescript_webhook, "signal_journal", journal):
+            yield journal
+        journal.close()
+
+    def test_account_states_are_journaled(self, controller, journal):
+        # Setup - tab 0 cannot find the account, tab 1 fills, tab 2's order errors and tab 3's page throws
+        def switch(conn, index, names):
+            return None if index == 0 else names[0]
+
+        journal.received("sig1", {"symbol": "NQ"})
+        with patch.object(pinescript_webhook, "switch_account_for_open", side_effect=switch), \
+             patch.object(pinescript_webhook, "update_ui_symbol"), \
+             patch.object(pinescript_webhook, "load_account_switcher_script", return_value=None):
+            controller.connections[1].auto_trade.return_value = {"result": {"value": "ok"}}
+            controller.connections[2].auto_trade.return_value = {"error": "No tab available"}
+            controller.connections[3].auto_trade.return_value = {
+                "result": {"type": "object"}, "exceptionDetails": {"text": "Uncaught"}}
+
+            # Execute
+            pinescript_webhook.execute_signal_on_accounts(
+                [0, 1, 2, 3], "Open", "NQ", ["Demo1"], order_args=(1, "Buy", 100, 40, 0.25), signal_id="sig1"
+            )
+
+        # Assert
+        accounts = journal.get("sig1")["accounts"]
+        assert accounts["0"]["state"] == "failed"
+        assert accounts["1"]["state"] == "confirmed"
+        assert accounts["1"]["account"] == "Demo1"
+        assert accounts["2"]["state"] == "failed"
+        assert accounts["2"]["detail"] == {"error": "No tab available"}
+        assert accounts["3"]["state"] == "failed"
+
+    def test_restart_replays_or_flags_interrupted_signals(self, journal):
+        # Setup - one signal never got past switching, the other had sent its order
+        journal.received("safe", {"symbol": "NQ"})
+        journal.account_state("safe", 0, "switched", "Demo1")
+        journal.received("sent", {"symbol": "ES"})
+        journal.account_state("sent", 0, "submitted", "Demo1")
+        signal_queue = SignalQueue(lambda data: {"status": "executed"})
+
+        # Execute
+        pinescript_webhook.recover_signals(signal_queue)
+
+        # Assert
+        assert signal_queue.get("safe")["status"] == "queued"
+        assert signal_queue.get("sent") is None
+        sent = journal.get("sent")
+        assert sent["status"] == "interrupted"
+        assert sent["result"]["accounts"] == {"0": "submitted"}
+
+
+class TestWebhookIntake:
+    @pytest.fixture
+    def signal_queue(self, tmp_path):
+        signal_queue = SignalQueue(lambda data: {"status": "executed", "symbol": data["symbol"]}, max_size=1, workers=1)
+        journal = SignalJournal(tmp_path / "signal_journal.jsonl")
+        with patch.object(pinescript_webhook, "signal_queue", signal_queue), \
+             patch.object(pinescript_webhook, "signal_dedup", SignalDeduplicator()), \
+             patch.object(pinescript_webhook, "signal_journal", journal), \
+             patch.object(pinescript_webhook, "ASYNC_INTAKE", True):
+            yield signal_queue
+        signal_queue.stop()
+        journal.close()
+
+    def test_webhook_accepts_and_queues(self, signal_queue):
+        client = pinescript_webhook.app.test_client()
+
+        # Execute
+        response = client.post("/webhook", json={"symbol": "NQ1!", "action": "Buy"})
+
+        # Assert
+        assert response.status_code == 202
+        body = response.get_json()
+        assert body["status"] == "accepted"
+        assert body["status_url"] == f"/signals/{body['signal_id']}"
+
+        status = client.get(body["status_url"])
+        assert status.status_code == 200
+        assert status.get_json()["signal"]["symbol"] == "NQ1!"
+
+    def test_webhook_rejects_when_full(self, signal_queue):
+        client = pinescript_webhook.app.test_client()
+
+        # Execute - capacity is one and the workers are not running
+        assert client.post("/webhook", json={"symbol": "NQ"}).status_code == 202
+        response = client.post("/webhook", json={"symbol": "ES"})
+
+        # Assert
+        assert response.status_code == 503
+
+    def test_webhook_answers_retries_from_first_delivery(self, signal_queue):
+        client = pinescript_webhook.app.test_client()
+        signal = {"symbol": "NQ", "action": "Buy", "time": "2026-10-16T14:30:00Z"}
+
+        # Execute - TradingView resends the same alert
+        first = client.post("/webhook", json=signal)
+        retry = client.post("/webhook", json=signal)
+
+        # Assert
+        assert first.status_code == 202
+        assert retry.status_code == 200
+        body = retry.get_json()
+        assert body["status"] == "duplicate"
+        assert body["signal_id"] == first.get_json()["signal_id"]
+        assert signal_queue.get_stats()["submitted"] == 1
+
+    def test_rejected_signal_can_be_retried(self, signal_queue):
+        client = pinescript_webhook.app.test_client()
+
+        assert client.post("/webhook", json={"symbol": "NQ"}).status_code == 202
+        assert client.post("/webhook", json={"symbol": "ES"}).status_code == 503
+
+        # Execute - the rejected signal was never executed, so its retry is not a duplicate
+        response = client.post("/webhook", json={"symbol": "ES"})
+
+        assert response.status_code == 503
+
+    def test_signals_are_journaled_and_queryable(self, signal_queue):
+        client = pinescript_webhook.app.test_client()
+
+        # Execute
+        first = client.post("/webhook", json={"symbol": "NQ", "strategy": "Scalp"}).get_json()
+        client.post("/webhook", json={"symbol": "ES", "strategy": "Swing"})
+
+        # Assert
+        response = client.get("/signals?strategy=Scalp")
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body["count"] == 1
+        assert body["signals"][0]["id"] == first["signal_id"]
+        assert client.get("/signals?status=rejected").get_json()["count"] == 1
+        assert client.get("/signals?limit=x").status_code == 400
+
+    def test_webhook_rejects_invalid_signal(self, signal_queue):
+        client = pinescript_webhook.app.test_client()
+
+        response = client.post("/webhook", json={"action": "Buy"})
+
+        assert response.status_code == 400
+        assert signal_queue.get_stats()["submitted"] == 0
+
+    def test_unknown_signal_id(self, signal_queue):
+        client = pinescript_webhook.app.test_client()
+
+        assert client.get("/signals/doesnotexist").status_code == 404
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_pinescript_webhook.py"])